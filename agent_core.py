@@ -9,8 +9,11 @@ import json
 import traceback
 from google import genai
 from google.genai import types
-from skills import TOOL_DECLARATIONS, executar_skill
-from memory import salvar_mensagem, obter_resumo_contexto
+from skills import TOOL_DECLARATIONS, executar_skill, recursos_skill, skills_conflitam, timeout_skill
+from skill_executor import ExecutorSkills
+from python_workers import pool_python
+from system_metrics import amostrador_sistema
+from memory import salvar_mensagem, obter_resumo_contexto, memoria_relevante
 
 
 class AgentCore:
@@ -39,6 +42,11 @@ class AgentCore:
 
         # Tools
         self._tool_declarations = TOOL_DECLARATIONS
+        self.executor = ExecutorSkills(executar_skill, ao_progresso=self.on_skill_log)
+        self._tarefas_tools = set()
+        self._ids_cancelados = set()
+        pool_python()   # interpretadores para escrever_e_executar_codigo já aquecendo
+        amostrador_sistema()   # métricas e tendência já disponíveis na primeira consulta
 
         # System instruction base
         self._system_base = (
@@ -67,12 +75,14 @@ class AgentCore:
             "5. Execute ações DE VERDADE, não apenas descreva\n"
             "6. Para ações destrutivas, confirme com o usuário primeiro\n"
             "7. Use historico_conversa quando o usuário pedir para continuar algo anterior\n"
+            "   Mensagens de texto podem vir com um bloco 'MEMÓRIA RELEVANTE' — use-o; para mais, chame buscar_memoria\n"
             "8. Seja proativo: se algo falhar, busque soluções online e tente novamente\n"
             "\n\n🎯 REGRAS DE INTERAÇÃO COM APLICATIVOS (CRÍTICO!):\n"
             "9. NUNCA adivinhe coordenadas de clique! SEMPRE use localizar_texto ou detectar_texto_tela primeiro\n"
             "10. Para clicar em botões/campos: use clicar_em_texto('nome do botão') - é automático!\n"
             "11. Para enviar mensagens em apps: (1) localizar_texto para achar campo, (2) clicar, (3) digitar\n"
             "12. Para gráficos/trading: use localizar_elemento com imagem da ferramenta como template\n"
+            "    Para olhar só o gráfico/painel, passe roi='tradingview_grafico' ou 'mt5_ordens' (veja listar_rois)\n"
             "13. Se não encontrar elemento, use detectar_texto_tela para ver TUDO na tela e ajustar busca\n"
             "14. Sempre confirme se encontrou o elemento ANTES de clicar (verificar 'encontrado': true)\n"
         )
@@ -181,6 +191,11 @@ class AgentCore:
             finally:
                 self._session_alive = False
                 self.session = None
+                # Respostas de skills não têm mais para onde ir
+                self.executor.cancelar()
+                for tarefa in list(self._tarefas_tools):
+                    tarefa.cancel()
+                self._ids_cancelados.clear()
                 self.on_status("⚫ Sessão encerrada")
 
     async def _send_audio_loop(self):
@@ -202,9 +217,10 @@ class AgentCore:
         """Envia frames da tela para o Gemini."""
         while self.running and self._session_alive:
             try:
-                frame_b64 = await asyncio.wait_for(self.screen_input_queue.get(), timeout=2.0)
+                frame = await asyncio.wait_for(self.screen_input_queue.get(), timeout=2.0)
                 if self.session and self._session_alive:
-                    raw_bytes = base64.b64decode(frame_b64)
+                    # Frames chegam como bytes JPEG; base64 só de produtores antigos
+                    raw_bytes = base64.b64decode(frame) if isinstance(frame, str) else bytes(frame)
                     await self.session.send_realtime_input(
                         media=types.Blob(data=raw_bytes, mime_type="image/jpeg")
                     )
@@ -238,14 +254,24 @@ class AgentCore:
                                     self.on_text(part.text)
                                     salvar_mensagem("agent", part.text)
 
-                        # Function calls
+                        # Function calls (em task: o loop segue recebendo interrupções)
                         if response.tool_call:
-                            await self._handle_tool_calls(response.tool_call)
+                            tarefa = asyncio.create_task(self._handle_tool_calls(response.tool_call))
+                            self._tarefas_tools.add(tarefa)
+                            tarefa.add_done_callback(self._tarefas_tools.discard)
+
+                        # Gemini desistiu de function calls pendentes
+                        cancelamento = getattr(response, "tool_call_cancellation", None)
+                        if cancelamento and cancelamento.ids:
+                            self._ids_cancelados.update(cancelamento.ids)
+                            self.executor.cancelar(set(cancelamento.ids))
 
                         # Interrupção
                         if response.server_content and response.server_content.interrupted:
                             while not self.audio_output_queue.empty():
                                 self.audio_output_queue.get_nowait()
+                            if self.executor.cancelar():
+                                self.on_skill_log("⛔ Skills em andamento canceladas (interrupção)")
                     except Exception as inner_e:
                         print(f"[AgentCore] Erro processando: {inner_e}")
 
@@ -256,23 +282,28 @@ class AgentCore:
                     return
 
     async def _handle_tool_calls(self, tool_call):
-        """Executa function calls do Gemini."""
-        function_responses = []
-        for fc in tool_call.function_calls:
-            nome = fc.name
-            params = dict(fc.args) if fc.args else {}
-
-            self.on_skill_log(f"🔧 {nome}({json.dumps(params, ensure_ascii=False)[:200]})")
-
-            try:
-                resultado = await asyncio.to_thread(executar_skill, nome, params)
-                self.on_skill_log(f"✅ {resultado[:300]}")
-            except Exception as e:
-                resultado = json.dumps({"sucesso": False, "mensagem": str(e)})
-                self.on_skill_log(f"❌ Erro: {e}")
+        """
+        Executa function calls do Gemini.
+        Chamadas independentes rodam em paralelo; as que disputam um recurso
+        (mouse/teclado, o mesmo arquivo...) esperam as anteriores, na ordem pedida.
+        As respostas voltam na ordem original.
+        """
+        chamadas = list(tool_call.function_calls)
+        recursos = [recursos_skill(fc.name, dict(fc.args) if fc.args else {}) for fc in chamadas]
+        tarefas = []
+        for i, fc in enumerate(chamadas):
+            dependencias = [tarefas[j] for j in range(i) if skills_conflitam(recursos[j], recursos[i])]
+            tarefas.append(asyncio.create_task(self._executar_chamada(fc, dependencias)))
+        resultados = await asyncio.gather(*tarefas)
 
+        function_responses = []
+        for fc, resultado in zip(chamadas, resultados):
+            # Chamadas que o Gemini cancelou não recebem resposta
+            if getattr(fc, "id", None) in self._ids_cancelados:
+                self._ids_cancelados.discard(fc.id)
+                continue
             # Incluir o ID do function call (obrigatório na API)
-            fr_kwargs = {"name": nome, "response": {"result": resultado}}
+            fr_kwargs = {"name": fc.name, "response": {"result": resultado}}
             if hasattr(fc, "id") and fc.id:
                 fr_kwargs["id"] = fc.id
             function_responses.append(types.FunctionResponse(**fr_kwargs))
@@ -286,14 +317,37 @@ class AgentCore:
                 print(f"[AgentCore] Erro tool response: {e}")
                 self._session_alive = False
 
+    async def _executar_chamada(self, fc, dependencias) -> str:
+        """Espera as chamadas conflitantes anteriores e executa a skill no pool do seu tipo."""
+        nome = fc.name
+        params = dict(fc.args) if fc.args else {}
+        if dependencias:
+            await asyncio.gather(*dependencias, return_exceptions=True)
+
+        self.on_skill_log(f"🔧 {nome}({json.dumps(params, ensure_ascii=False)[:200]})")
+        try:
+            resultado = await self.executor.executar(
+                nome, params, timeout=timeout_skill(nome), chave=getattr(fc, "id", None)
+            )
+            self.on_skill_log(f"✅ {resultado[:300]}")
+        except Exception as e:
+            resultado = json.dumps({"sucesso": False, "mensagem": str(e)})
+            self.on_skill_log(f"❌ Erro: {e}")
+        return resultado
+
     async def send_text(self, text: str):
         """Envia texto ao Gemini."""
         if self.session and self._session_alive:
             try:
+                # Notas/aprendizados relevantes vão junto do turno, não no system instruction
+                contexto = await asyncio.to_thread(memoria_relevante, text)
+                parts = [types.Part(text=text)]
+                if contexto:
+                    parts.insert(0, types.Part(text=contexto))
                 await self.session.send_client_content(
                     turns=types.Content(
                         role="user",
-                        parts=[types.Part(text=text)]
+                        parts=parts
                     )
                 )
                 salvar_mensagem("user", text)
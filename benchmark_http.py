@@ -0,0 +1,110 @@
+"""
+Benchmark HTTP — Busca + extração de texto: requests.get/html.parser vs sessão compartilhada + cache.
+Sobe um servidor HTTP local (páginas geradas, com ETag e resposta 304) e mede
+páginas por segundo dos dois caminhos lendo as mesmas URLs várias vezes.
+
+Uso: python benchmark_http.py [paginas] [voltas]
+"""
+
+import sys
+import os
+import time
+import hashlib
+import tempfile
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# Adicionar caminho do projeto
+sys.path.insert(0, os.path.dirname(__file__))
+
+import http_client
+
+
+class PaginasHandler(BaseHTTPRequestHandler):
+    """Páginas HTML geradas pelo caminho, com ETag (If-None-Match igual -> 304)."""
+
+    protocol_version = "HTTP/1.1"   # keep-alive
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        blocos = "".join(
+            f"<div class='item'><h2>Item {i}</h2><p>Conteúdo {i} de {self.path}</p></div>"
+            for i in range(2000)
+        )
+        corpo = (
+            f"<html><head><title>Página {self.path}</title><script>var x = 1;</script></head>"
+            f"<body><nav>menu</nav>{blocos}<footer>rodapé</footer></body></html>"
+        ).encode("utf-8")
+        etag = '"%s"' % hashlib.md5(corpo).hexdigest()
+
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+
+def iniciar_servidor():
+    servidor = ThreadingHTTPServer(("127.0.0.1", 0), PaginasHandler)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor
+
+
+def caminho_antigo(url: str) -> str:
+    """Como as skills faziam: requests.get sem sessão + html.parser a cada visita."""
+    import requests
+    from bs4 import BeautifulSoup
+
+    resp = requests.get(url, timeout=15)
+    soup = BeautifulSoup(resp.text, "html.parser")
+    for tag in soup(["script", "style", "nav", "footer", "header"]):
+        tag.decompose()
+    return soup.get_text(separator="\n", strip=True)
+
+
+def caminho_novo(url: str) -> str:
+    resp = http_client.obter(url, timeout=15)
+    return http_client.extrair_texto(resp.content, resp.encoding)["conteudo"]
+
+
+def medir(nome: str, funcao, urls) -> float:
+    inicio = time.perf_counter()
+    for url in urls:
+        funcao(url)
+    duracao = time.perf_counter() - inicio
+    taxa = len(urls) / duracao
+    print(f"{nome:<32} {len(urls)} páginas em {duracao:.2f}s  ->  {taxa:.1f} páginas/s")
+    return taxa
+
+
+if __name__ == "__main__":
+    paginas = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    voltas = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    servidor = iniciar_servidor()
+    base = f"http://127.0.0.1:{servidor.server_port}"
+    urls = [f"{base}/pagina/{i}" for i in range(paginas)] * voltas
+
+    # Cache num diretório temporário para não sujar memoria/http_cache
+    http_client._cache = http_client.CacheHTTP(tempfile.mkdtemp(prefix="bench_http_"))
+
+    print("=" * 60)
+    print(f"BENCHMARK HTTP — {paginas} páginas x {voltas} voltas (parser: {http_client.PARSER_HTML})")
+    print("=" * 60)
+
+    antigo = medir("requests.get + html.parser", caminho_antigo, urls)
+    novo = medir("sessão + cache + extração", caminho_novo, urls)
+
+    print(f"\nGanho: {novo / antigo:.1f}x")
+    print(f"Estatísticas: {http_client.estatisticas()}")
+    servidor.shutdown()
@@ -0,0 +1,88 @@
+"""
+Benchmark Python — Latência de escrever_e_executar_codigo: processo novo vs worker aquecido.
+Roda o mesmo trecho (que usa numpy/pandas/requests, como os scripts que o
+agente costuma escrever) N vezes com "python arquivo.py" e N vezes pelo pool
+de workers, e compara o tempo até o resultado.
+
+Uso: python benchmark_python.py [execucoes]
+"""
+
+import sys
+import os
+import time
+import tempfile
+import statistics
+import subprocess
+
+# Adicionar caminho do projeto
+sys.path.insert(0, os.path.dirname(__file__))
+
+from python_workers import PoolPython, PYTHON, PRECARREGAR
+
+TRECHO = '''
+import importlib
+carregados = []
+for nome in ("numpy", "pandas", "requests"):
+    try:
+        importlib.import_module(nome)
+        carregados.append(nome)
+    except ImportError:
+        pass
+import numpy as np
+print("ok", carregados, float(np.arange(1000).sum()))
+'''
+
+
+def escrever_trecho() -> str:
+    fd, caminho = tempfile.mkstemp(prefix="adk_bench_", suffix=".py")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(TRECHO)
+    return caminho
+
+
+def frio(caminho: str) -> str:
+    """Como era: um processo python novo por execução."""
+    proc = subprocess.run([PYTHON, caminho], capture_output=True, text=True)
+    return proc.stdout.strip()
+
+
+def quente(pool: PoolPython, caminho: str) -> str:
+    proc = pool.executar(caminho)
+    saida = proc.stdout.read()   # stdin já foi fechado pelo pool (communicate() não serve)
+    proc.wait()
+    proc.stdout.close()
+    proc.stderr.close()
+    return saida.decode().strip()
+
+
+def medir(nome: str, funcao, execucoes: int, pausa: float = 0.0) -> list:
+    tempos = []
+    for _ in range(execucoes):
+        inicio = time.perf_counter()
+        saida = funcao()
+        tempos.append((time.perf_counter() - inicio) * 1000)
+        time.sleep(pausa)   # intervalo entre chamadas do agente (tempo para repor o worker)
+    print(f"{nome:<22} mediana {statistics.median(tempos):7.1f}ms  "
+          f"min {min(tempos):7.1f}ms  max {max(tempos):7.1f}ms  ->  {saida}")
+    return tempos
+
+
+if __name__ == "__main__":
+    execucoes = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    caminho = escrever_trecho()
+
+    print("=" * 60)
+    print(f"BENCHMARK PYTHON — {execucoes} execuções (pré-carregados: {', '.join(PRECARREGAR)})")
+    print("=" * 60)
+
+    pool = PoolPython()
+    pool.aquecer()
+    time.sleep(3)   # workers terminam os imports
+
+    tempos_frio = medir("processo novo", lambda: frio(caminho), execucoes)
+    tempos_quente = medir("worker aquecido", lambda: quente(pool, caminho), execucoes, pausa=2.0)
+
+    print(f"\nGanho: {statistics.median(tempos_frio) / statistics.median(tempos_quente):.1f}x")
+    print(f"Pool: {pool.estatisticas()}")
+    pool.encerrar()
+    os.remove(caminho)
@@ -0,0 +1,230 @@
+"""
+Chart Reader — Lê candles direto da imagem do gráfico (TradingView).
+Segmenta os pixels de alta/baixa por cor (HSV), varre as colunas com
+NumPy para achar topo/fundo de cada coluna e agrupa colunas vizinhas em
+candles: pavio = extremos do candle, corpo = extremos das colunas da borda.
+Sem API de dados, gera uma série de barras (OHLC em pixels ou em preço, se
+o eixo for calibrado) para os detectores CRT.
+"""
+
+import re
+import cv2
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+
+# Faixas HSV (OpenCV: H 0-180) das cores padrão do TradingView
+# alta #26a69a (verde-azulado), baixa #ef5350 (vermelho)
+HSV_ALTA = [((70, 80, 80), (100, 255, 255)), ((40, 80, 80), (70, 255, 255))]
+HSV_BAIXA = [((0, 80, 80), (12, 255, 255)), ((165, 80, 80), (180, 255, 255))]
+
+COBERTURA_LINHA = 0.3   # fração da largura coberta por uma linha horizontal (linha de último preço)
+ESPESSURA_LINHA = 2     # linhas mais grossas que isso não são linha de preço (podem ser candles)
+ALTURA_MIN = 3          # candles com menos pixels de altura são resto de linha tracejada
+
+_NUMERO_RE = re.compile(r"^-?\d{1,3}(?:[.,\s]?\d{3})*(?:[.,]\d+)?$")
+
+
+def _mascara(hsv: np.ndarray, faixas) -> np.ndarray:
+    mascara = np.zeros(hsv.shape[:2], dtype=bool)
+    for baixo, alto in faixas:
+        mascara |= cv2.inRange(hsv, baixo, alto).astype(bool)
+    return mascara
+
+
+def _faixa_candles(ocupadas: np.ndarray, folga: int = 4) -> Tuple[int, int]:
+    """
+    Linhas (inicio, fim) do painel de candles: o maior bloco vertical de
+    linhas com pixels coloridos (separa o painel de volume logo abaixo).
+    """
+    linhas = np.flatnonzero(ocupadas)
+    if not len(linhas):
+        return 0, 0
+    quebras = np.flatnonzero(np.diff(linhas) > folga)
+    inicios = np.r_[linhas[0], linhas[quebras + 1]]
+    fins = np.r_[linhas[quebras], linhas[-1]]
+    maior = int(np.argmax(fins - inicios))
+    return int(inicios[maior]), int(fins[maior]) + 1
+
+
+def _linhas_horizontais(colorido: np.ndarray) -> np.ndarray:
+    """
+    Linhas finas (até ESPESSURA_LINHA) que cruzam boa parte da largura — a
+    linha tracejada de último preço, desenhada na cor do candle.
+    """
+    cobertas = colorido.mean(axis=1) >= COBERTURA_LINHA
+    borda = np.diff(np.r_[0, cobertas.astype(np.int8), 0])
+    inicios, fins = np.flatnonzero(borda == 1), np.flatnonzero(borda == -1)
+    finas = np.zeros_like(cobertas)
+    for i, f in zip(inicios, fins):
+        if f - i <= ESPESSURA_LINHA:
+            finas[i:f] = True
+    return finas
+
+
+def extrair_candles(img: np.ndarray, hsv_alta=None, hsv_baixa=None) -> List[Dict]:
+    """
+    Candles de uma imagem BGR do gráfico, da esquerda para a direita.
+
+    Returns:
+        [{"x": coluna central, "largura", "alta": bool,
+          "open", "high", "low", "close"}] — valores em linhas da imagem (0 = topo)
+    """
+    hsv = cv2.cvtColor(img, cv2.COLOR_BGR2HSV)
+    alta = _mascara(hsv, hsv_alta or HSV_ALTA)
+    baixa = _mascara(hsv, hsv_baixa or HSV_BAIXA)
+    colorido = alta | baixa
+
+    # A linha de último preço viraria dezenas de "candles" de 1px (e esticaria
+    # o pavio dos candles que ela cruza)
+    linha_preco = _linhas_horizontais(colorido)
+    colorido[linha_preco] = False
+    alta[linha_preco] = False
+
+    y0, y1 = _faixa_candles(colorido.any(axis=1))
+    if y1 <= y0:
+        return []
+    colorido, alta = colorido[y0:y1], alta[y0:y1]
+    h = colorido.shape[0]
+
+    # Varredura por coluna: primeira/última linha colorida e cor dominante
+    # (colunas vazias ficam neutras: o reduceat abaixo vai de um início ao próximo)
+    colunas = colorido.any(axis=0)
+    topo = np.where(colunas, np.argmax(colorido, axis=0), h)
+    fundo = np.where(colunas, h - 1 - np.argmax(colorido[::-1], axis=0), -1)
+    votos_alta = alta.sum(axis=0)
+    votos_total = colorido.sum(axis=0)
+
+    # Colunas vizinhas com cor formam um candle
+    borda = np.diff(np.r_[0, colunas.astype(np.int8), 0])
+    inicios = np.flatnonzero(borda == 1)
+    fins = np.flatnonzero(borda == -1)   # exclusivo
+    if not len(inicios):
+        return []
+
+    high = np.minimum.reduceat(topo, inicios)
+    low = np.maximum.reduceat(fundo, inicios)
+    eh_alta = np.add.reduceat(votos_alta, inicios) * 2 >= np.add.reduceat(votos_total, inicios)
+    # O corpo ocupa a largura toda; o pavio só o meio — as colunas da borda dão o corpo
+    ultimos = fins - 1
+    corpo_topo = np.maximum(topo[inicios], topo[ultimos])
+    corpo_fundo = np.minimum(fundo[inicios], fundo[ultimos])
+    corpo_fundo = np.maximum(corpo_fundo, corpo_topo)
+
+    open_ = np.where(eh_alta, corpo_fundo, corpo_topo) + y0
+    close = np.where(eh_alta, corpo_topo, corpo_fundo) + y0
+    high, low = high + y0, low + y0
+
+    return [
+        {"x": int((i + f - 1) // 2), "largura": int(f - i), "alta": bool(a),
+         "open": int(o), "high": int(hi), "low": int(lo), "close": int(c)}
+        for i, f, a, o, hi, lo, c in zip(inicios, fins, eh_alta, open_, high, low, close)
+        if lo - hi + 1 >= ALTURA_MIN
+    ]
+
+
+def calibrar_eixo(rotulos: List[Tuple[float, str]]) -> Optional[Tuple[float, float]]:
+    """
+    Ajusta preço = a * linha + b a partir de rótulos do eixo de preço.
+
+    Args:
+        rotulos: [(linha_central, texto)] — por exemplo, saídas do OCR do eixo
+
+    Returns:
+        (a, b) ou None se não houver ao menos 2 números distintos
+    """
+    pontos = []
+    for linha, texto in rotulos:
+        texto = texto.strip().replace(" ", "")
+        if not _NUMERO_RE.match(texto):
+            continue
+        # "1,234.50" / "1.234,50" / "1234.5": o último separador é o decimal
+        if "," in texto and "." in texto:
+            decimal = "," if texto.rfind(",") > texto.rfind(".") else "."
+            milhar = "." if decimal == "," else ","
+            texto = texto.replace(milhar, "").replace(decimal, ".")
+        else:
+            texto = texto.replace(",", ".")
+        try:
+            pontos.append((float(linha), float(texto)))
+        except ValueError:
+            continue
+    if len({p for _, p in pontos}) < 2:
+        return None
+    linhas, precos = np.array(pontos).T
+    a, b = np.polyfit(linhas, precos, 1)
+    if a >= 0:   # preço tem que subir para cima (linha menor)
+        return None
+    return float(a), float(b)
+
+
+def para_precos(candles: List[Dict], calibracao: Tuple[float, float] = None, altura: int = None) -> List[Dict]:
+    """
+    Converte as linhas dos candles em valores: preço (com calibração) ou
+    pixels invertidos (altura - linha, maior = mais alto) sem calibração.
+    """
+    if calibracao:
+        a, b = calibracao
+        valor = lambda linha: round(a * linha + b, 6)
+    else:
+        valor = lambda linha: float(altura - linha)
+    return [
+        {"x": c["x"], "open": valor(c["open"]), "high": valor(c["high"]),
+         "low": valor(c["low"]), "close": valor(c["close"])}
+        for c in candles
+    ]
+
+
+def ler_grafico(roi="tradingview_grafico", roi_eixo=None, calibrar: bool = True,
+                max_barras: int = None) -> Dict:
+    """
+    Captura a ROI do gráfico e devolve a série de barras.
+
+    Args:
+        roi: preset de ROI (ou [x, y, largura, altura]) com a área dos candles
+        roi_eixo: área do eixo de preço para calibrar via OCR (padrão: faixa à direita da ROI)
+        calibrar: tenta converter pixels em preço lendo o eixo com OCR
+        max_barras: só as últimas N barras
+
+    Returns:
+        {"sucesso": bool, "barras": [{"x", "open", "high", "low", "close"}],
+         "unidade": "preco" | "pixel", "total": int}
+    """
+    from frame_service import servico_captura
+    from roi_presets import resolver_regiao
+
+    try:
+        regiao = resolver_regiao(roi)
+        frame = servico_captura().frame(regiao=regiao)
+        img = frame.bgr()
+        candles = extrair_candles(img)
+        if max_barras:
+            candles = candles[-max_barras:]
+
+        calibracao = None
+        if calibrar and candles and regiao:
+            calibracao = _calibrar_por_ocr(regiao, roi_eixo)
+
+        barras = para_precos(candles, calibracao, img.shape[0])
+        return {
+            "sucesso": True,
+            "barras": barras,
+            "unidade": "preco" if calibracao else "pixel",
+            "total": len(barras),
+        }
+    except Exception as e:
+        return {"sucesso": False, "mensagem": str(e)}
+
+
+def _calibrar_por_ocr(regiao, roi_eixo=None) -> Optional[Tuple[float, float]]:
+    """Lê os rótulos do eixo de preço (por padrão, a faixa logo à direita da ROI)."""
+    from vision_utils import detectar_texto_tela
+    from roi_presets import resolver_regiao
+
+    x, y, w, h = regiao
+    eixo = resolver_regiao(roi_eixo) if roi_eixo else (x + w, y, max(60, w // 10), h)
+    resultado = detectar_texto_tela(eixo)
+    if not resultado.get("sucesso"):
+        return None
+    # Linhas do eixo em coordenadas da ROI do gráfico
+    rotulos = [(t["centro"][1] - y, t["texto"]) for t in resultado["textos"]]
+    return calibrar_eixo(rotulos)
@@ -0,0 +1,193 @@
+"""
+Content Scan — Varredura paralela de conteúdo (quando ainda não há índice).
+Os arquivos são mapeados em memória (mmap) e o texto literal é procurado
+direto nos bytes (find sobre os bytes em minúsculas), sem decodificar nem
+quebrar em linhas o arquivo inteiro; regex roda sobre o texto decodificado,
+por linha (MULTILINE), como no índice. Binários são descartados pelos
+primeiros bytes. Os
+arquivos vão em lotes para um pool de processos enquanto a árvore ainda está
+sendo percorrida, e os resultados saem à medida que cada lote termina.
+"""
+
+import os
+import re
+import mmap
+import atexit
+import threading
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import Callable, Dict, Iterator, List
+
+LOTE = 64                 # arquivos por tarefa do pool (amortiza a troca entre processos)
+MIN_PARALELO = 2 * LOTE   # abaixo disso, varre no próprio processo
+MAX_BYTES = 50_000_000
+AMOSTRA_BINARIO = 1024
+TRABALHADORES = max(2, min(4, (os.cpu_count() or 2) - 1))
+
+
+def preparar_busca(texto: str, regex: bool = False) -> tuple:
+    """
+    Descrição serializável da busca (vai para os processos do pool).
+    Texto literal: as variantes em bytes minúsculos (lower() em bytes só dobra
+    ASCII; as variantes cobrem "Ação"/"ação"/"AÇÃO"). Regex: padrão (str, para o
+    IGNORECASE valer também fora do ASCII) e flags — ^/$ valem por linha.
+    """
+    if regex:
+        return ("regex", texto, re.IGNORECASE | re.MULTILINE)
+    variantes = tuple(dict.fromkeys(v.encode("utf-8").lower() for v in (texto, texto.lower(), texto.upper())))
+    return ("literal", variantes)
+
+
+def _achados(dados, busca: tuple) -> Iterator[tuple]:
+    """(inicio, fim) de cada ocorrência, em ordem."""
+    if busca[0] == "regex":
+        for achado in re.compile(busca[1], busca[2]).finditer(dados):
+            yield achado.start(), achado.end()
+        return
+    variantes = busca[1]
+    if not any(v.upper() != v for v in variantes):
+        texto = dados          # sem letras: procura direto no mmap, sem cópia
+    else:
+        texto = dados[:].lower()
+    posicoes = []
+    for alvo in variantes:
+        pos = texto.find(alvo)
+        while pos != -1:
+            posicoes.append((pos, pos + len(alvo)))
+            pos = texto.find(alvo, pos + 1)
+    yield from sorted(posicoes)
+
+
+def escanear_arquivos(caminhos: List[str], busca: tuple, limite: int) -> List[Dict]:
+    """Procura em cada arquivo (roda no processo do pool)."""
+    resultados = []
+    for caminho in caminhos:
+        try:
+            tamanho = os.path.getsize(caminho)
+            if not tamanho or tamanho > MAX_BYTES:
+                continue
+            with open(caminho, "rb") as f:
+                if b"\0" in f.read(AMOSTRA_BINARIO):
+                    continue
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as dados:
+                    if busca[0] == "regex":
+                        conteudo, quebra = dados[:].decode("utf-8", errors="ignore"), "\n"
+                    else:
+                        conteudo, quebra = dados, b"\n"
+                    linha, contado, ultima = 1, 0, -1
+                    for inicio_achado, fim_achado in _achados(conteudo, busca):
+                        inicio = conteudo.rfind(quebra, 0, inicio_achado) + 1
+                        if inicio == ultima:
+                            continue   # outra ocorrência na mesma linha
+                        fim = conteudo.find(quebra, fim_achado)
+                        fim = len(conteudo) if fim == -1 else fim
+                        linha += conteudo[contado:inicio].count(quebra)
+                        contado = ultima = inicio
+                        trecho = conteudo[inicio:fim]
+                        if isinstance(trecho, bytes):
+                            trecho = trecho.decode("utf-8", errors="ignore")
+                        resultados.append({
+                            "arquivo": caminho,
+                            "linha": linha,
+                            "conteudo": trecho.strip()[:200]
+                        })
+                        if len(resultados) >= limite:
+                            return resultados
+        except (OSError, ValueError):
+            continue
+    return resultados
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _obter_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn: fork de um processo com threads (GUI, áudio) pode travar o filho
+            _pool = ProcessPoolExecutor(max_workers=TRABALHADORES, mp_context=mp.get_context("spawn"))
+            atexit.register(_pool.shutdown, wait=False, cancel_futures=True)
+        return _pool
+
+
+def _caminhar(diretorio: str, extensao: str, ignorar: Callable[[str], bool]) -> Iterator[str]:
+    pilha = [diretorio]
+    while pilha:
+        atual = pilha.pop()
+        try:
+            with os.scandir(atual) as entradas:
+                for entrada in entradas:
+                    try:
+                        if entrada.is_dir(follow_symlinks=False):
+                            if not ignorar(entrada.name):
+                                pilha.append(entrada.path)
+                        elif entrada.is_file(follow_symlinks=False):
+                            if not extensao or entrada.name.lower().endswith(extensao.lower()):
+                                yield entrada.path
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+
+
+def varrer_conteudo(diretorio: str, texto: str, extensao: str = None, regex: bool = False,
+                    limite: int = 30, ignorar: Callable[[str], bool] = None,
+                    cancelado: Callable[[], bool] = None) -> Iterator[Dict]:
+    """
+    Gera as linhas que contêm o texto (ou casam o regex) à medida que são encontradas.
+
+    Args:
+        ignorar: pastas a pular, pelo nome
+        cancelado: consultada entre lotes; True interrompe a varredura
+    """
+    busca = preparar_busca(texto, regex)
+    ignorar = ignorar or (lambda nome: nome.startswith('.'))
+    cancelado = cancelado or (lambda: False)
+    arquivos = _caminhar(diretorio, extensao, ignorar)
+    entregues = 0
+
+    # Primeiro lote: se a árvore for pequena, nem vale subir o pool
+    primeiros = []
+    for caminho in arquivos:
+        primeiros.append(caminho)
+        if len(primeiros) >= MIN_PARALELO:
+            break
+    if len(primeiros) < MIN_PARALELO:
+        yield from escanear_arquivos(primeiros, busca, limite)
+        return
+
+    pool = _obter_pool()
+    pendentes = set()
+    lote = []
+    fila = iter(primeiros)
+    esgotado = False
+    try:
+        while True:
+            # Mantém o pool ocupado enquanto ainda há árvore para percorrer
+            while not esgotado and len(pendentes) < 4 * TRABALHADORES:
+                caminho = next(fila, None)
+                if caminho is None:
+                    caminho = next(arquivos, None)
+                if caminho is not None:
+                    lote.append(caminho)
+                if len(lote) >= LOTE or (caminho is None and lote):
+                    pendentes.add(pool.submit(escanear_arquivos, lote, busca, limite))
+                    lote = []
+                if caminho is None:
+                    esgotado = True
+            if not pendentes:
+                return
+            prontos, pendentes = wait(pendentes, timeout=0.5, return_when=FIRST_COMPLETED)
+            for futuro in prontos:
+                for r in futuro.result():
+                    yield r
+                    entregues += 1
+                    if entregues >= limite:
+                        return
+            if cancelado():
+                return
+    finally:
+        for futuro in pendentes:
+            futuro.cancel()
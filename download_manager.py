@@ -0,0 +1,341 @@
+"""
+Download Manager — Downloads segmentados, retomáveis e verificados.
+Quando o servidor aceita Range, o arquivo é dividido em segmentos baixados
+em paralelo pela sessão HTTP compartilhada, cada um escrevendo na sua faixa
+de um arquivo .part. O andamento fica num arquivo de estado ao lado
+(.part.json), então um download interrompido (erro, timeout, cancelamento)
+continua de onde parou na próxima chamada. O tamanho do bloco lido se adapta
+à velocidade da conexão, e no final o tamanho (e o SHA-256, se informado) é
+conferido antes de o arquivo ir para o destino.
+"""
+
+import os
+import json
+import time
+import hashlib
+import threading
+from typing import Callable, Dict, List, Optional
+
+SEGMENTOS = 4
+SEGMENTO_MIN = 8 * 1024 * 1024      # abaixo de 2x isso, um segmento só
+BLOCO_INICIAL = 64 * 1024
+BLOCO_MIN = 16 * 1024
+BLOCO_MAX = 4 * 1024 * 1024
+TENTATIVAS = 3                      # por segmento, retomando do último byte gravado
+INTERVALO_ESTADO = 1.0              # segundos entre gravações do .part.json
+INTERVALO_PROGRESSO = 1.0
+
+
+class DownloadInterrompido(Exception):
+    """O download foi cancelado; o parcial e o estado ficaram salvos para retomar."""
+
+
+class _ArquivoMudou(IOError):
+    """O servidor não atendeu a faixa pedida (o arquivo mudou desde o início do download)."""
+
+
+def _formatar_bytes(n: float) -> str:
+    for unidade in ("B", "KB", "MB"):
+        if n < 1024:
+            return f"{n:.1f}{unidade}"
+        n /= 1024
+    return f"{n:.1f}GB"
+
+
+class _Segmento:
+    """Faixa [pos, fim] do arquivo (fim inclusivo; pos = próximo byte a baixar)."""
+
+    def __init__(self, inicio: int, fim: int, pos: int = None):
+        self.inicio = inicio
+        self.fim = fim
+        self.pos = inicio if pos is None else pos
+
+    @property
+    def completo(self) -> bool:
+        return self.pos > self.fim
+
+    def para_dict(self) -> Dict:
+        return {"inicio": self.inicio, "fim": self.fim, "pos": self.pos}
+
+
+class Download:
+    """Um download de url para destino (use baixar() para o fluxo completo)."""
+
+    def __init__(self, url: str, destino: str, segmentos: int = SEGMENTOS,
+                 ao_progresso: Callable[[str], None] = None, cancelado: Callable[[], bool] = None):
+        self.url = url
+        self.destino = destino
+        self.parcial = destino + ".part"
+        self.arquivo_estado = destino + ".part.json"
+        self.max_segmentos = max(1, segmentos)
+        self._ao_progresso = ao_progresso
+        self._cancelado = cancelado or (lambda: False)
+        self._lock = threading.Lock()
+        self._parar = threading.Event()
+        self._erros: List[Exception] = []
+        self.segmentos: List[_Segmento] = []
+        self.tamanho: Optional[int] = None
+        self.validador: Dict = {}          # etag / last_modified do servidor
+        self.retomado_de = 0
+        self._baixados_sessao = 0          # bytes desta execução (para a taxa)
+        self._inicio = time.monotonic()
+        self._ultimo_progresso = self._inicio
+        self._ultimo_estado = 0.0
+
+    # ── estado em disco ─────────────────────────────────────────────
+
+    def _carregar_estado(self) -> Optional[Dict]:
+        try:
+            with open(self.arquivo_estado, "r", encoding="utf-8") as f:
+                estado = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if estado.get("url") != self.url or not os.path.exists(self.parcial):
+            return None
+        return estado
+
+    def _salvar_estado(self, forcar: bool = False):
+        agora = time.monotonic()
+        if not forcar and agora - self._ultimo_estado < INTERVALO_ESTADO:
+            return
+        self._ultimo_estado = agora
+        with self._lock:
+            estado = {
+                "url": self.url, "tamanho": self.tamanho, **self.validador,
+                "segmentos": [s.para_dict() for s in self.segmentos],
+            }
+        with open(self.arquivo_estado + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(estado, f)
+        os.replace(self.arquivo_estado + ".tmp", self.arquivo_estado)
+
+    def _limpar_estado(self):
+        for caminho in (self.arquivo_estado, self.arquivo_estado + ".tmp"):
+            try:
+                os.remove(caminho)
+            except OSError:
+                pass
+
+    # ── progresso ───────────────────────────────────────────────────
+
+    def baixados(self) -> int:
+        with self._lock:
+            return sum(s.pos - s.inicio for s in self.segmentos)
+
+    def _progresso(self, forcar: bool = False):
+        agora = time.monotonic()
+        if self._ao_progresso is None or (not forcar and agora - self._ultimo_progresso < INTERVALO_PROGRESSO):
+            return
+        self._ultimo_progresso = agora
+        baixados = self.baixados()
+        taxa = self._baixados_sessao / max(agora - self._inicio, 1e-6)
+        if self.tamanho:
+            restante = (self.tamanho - baixados) / taxa if taxa > 0 else 0
+            self._ao_progresso(
+                f"{_formatar_bytes(baixados)}/{_formatar_bytes(self.tamanho)} "
+                f"({baixados * 100 // self.tamanho}%) — {_formatar_bytes(taxa)}/s, faltam ~{int(restante)}s"
+            )
+        else:
+            self._ao_progresso(f"{_formatar_bytes(baixados)} — {_formatar_bytes(taxa)}/s")
+
+    def _contar(self, segmento: _Segmento, n: int):
+        # Sem reportar daqui: os segmentos rodam em threads próprias e o
+        # ao_progresso da skill (reportar_progresso) só vale na thread dela
+        with self._lock:
+            segmento.pos += n
+            self._baixados_sessao += n
+
+    # ── rede ────────────────────────────────────────────────────────
+
+    def _sondar(self):
+        """
+        GET com Range: bytes=0-0. 206 = aceita faixas (tamanho no Content-Range);
+        senão devolve a resposta aberta para o download sequencial.
+        """
+        from http_client import sessao_http
+
+        resp = sessao_http().get(self.url, headers={"Range": "bytes=0-0", "Accept-Encoding": "identity"},
+                                 stream=True, timeout=30)
+        resp.raise_for_status()
+        self.validador = {k: v for k, v in (("etag", resp.headers.get("ETag")),
+                                            ("last_modified", resp.headers.get("Last-Modified"))) if v}
+        total = resp.headers.get("Content-Range", "").rpartition("/")[2]
+        if resp.status_code == 206 and total.isdigit():
+            self.tamanho = int(total)
+            resp.close()
+            return None
+        return resp
+
+    def _dividir(self) -> List[_Segmento]:
+        n = max(1, min(self.max_segmentos, self.tamanho // SEGMENTO_MIN))
+        passo = max(1, -(-self.tamanho // n))
+        return [_Segmento(i, min(i + passo, self.tamanho) - 1) for i in range(0, self.tamanho, passo)]
+
+    def _baixar_segmento(self, segmento: _Segmento):
+        from http_client import sessao_http
+
+        bloco = BLOCO_INICIAL
+        falhas = 0
+        while not segmento.completo and not self._parar.is_set():
+            cabecalhos = {"Range": f"bytes={segmento.pos}-{segmento.fim}", "Accept-Encoding": "identity"}
+            # Se o arquivo mudou no servidor, vem 200 em vez de 206 (ETag fraca não vale para If-Range)
+            etag = self.validador.get("etag", "")
+            if etag and not etag.startswith("W/"):
+                cabecalhos["If-Range"] = etag
+            elif self.validador.get("last_modified"):
+                cabecalhos["If-Range"] = self.validador["last_modified"]
+            try:
+                with sessao_http().get(self.url, headers=cabecalhos, stream=True, timeout=30) as resp:
+                    if resp.status_code != 206:
+                        raise _ArquivoMudou(f"Servidor respondeu {resp.status_code} a um pedido de faixa")
+                    with open(self.parcial, "r+b") as f:
+                        f.seek(segmento.pos)
+                        while not segmento.completo:
+                            if self._parar.is_set():
+                                return
+                            inicio = time.monotonic()
+                            dados = resp.raw.read(min(bloco, segmento.fim - segmento.pos + 1))
+                            if not dados:
+                                raise IOError("Conexão encerrada antes do fim do segmento")
+                            f.write(dados)
+                            f.flush()   # o estado só avança sobre bytes já entregues ao SO
+                            self._contar(segmento, len(dados))
+                            # Bloco maior em conexão rápida, menor em conexão lenta
+                            duracao = time.monotonic() - inicio
+                            if duracao < 0.2 and len(dados) == bloco:
+                                bloco = min(bloco * 2, BLOCO_MAX)
+                            elif duracao > 1.0:
+                                bloco = max(bloco // 2, BLOCO_MIN)
+                            falhas = 0
+            except Exception as e:
+                falhas += 1
+                if falhas >= TENTATIVAS or isinstance(e, _ArquivoMudou):
+                    with self._lock:
+                        self._erros.append(e)
+                    self._parar.set()
+                    return
+                time.sleep(0.5 * falhas)
+
+    def _baixar_segmentos(self):
+        estado = self._carregar_estado()
+        if estado and estado.get("tamanho") == self.tamanho \
+                and all(estado.get(k) == v for k, v in self.validador.items()):
+            self.segmentos = [_Segmento(s["inicio"], s["fim"], s["pos"]) for s in estado["segmentos"]]
+            self.retomado_de = self.baixados()
+            self._progresso_msg(f"retomando de {_formatar_bytes(self.retomado_de)}")
+        else:
+            self.segmentos = self._dividir()
+            with open(self.parcial, "wb") as f:
+                f.truncate(self.tamanho)
+        self._salvar_estado(forcar=True)
+
+        threads = [
+            threading.Thread(target=self._baixar_segmento, args=(s,), name=f"download-seg{i}", daemon=True)
+            for i, s in enumerate(self.segmentos) if not s.completo
+        ]
+        for t in threads:
+            t.start()
+        while True:
+            vivas = [t for t in threads if t.is_alive()]
+            if not vivas:
+                break
+            vivas[0].join(timeout=0.25)
+            if self._cancelado():
+                self._parar.set()
+            self._salvar_estado()
+            self._progresso()
+        self._salvar_estado(forcar=True)
+
+        if any(isinstance(e, _ArquivoMudou) for e in self._erros):
+            # O parcial não serve mais: a próxima chamada começa do zero
+            self._limpar_estado()
+            raise self._erros[0]
+        if self._cancelado():
+            raise DownloadInterrompido("Download cancelado")
+        if self._erros:
+            raise self._erros[0]
+
+    def _baixar_sequencial(self, resp):
+        """Servidor sem Range: um fluxo só, sem retomada."""
+        self.segmentos = [_Segmento(0, (self.tamanho or 0) - 1)]
+        bloco = BLOCO_INICIAL
+        with resp, open(self.parcial, "wb") as f:
+            while True:
+                if self._cancelado():
+                    raise DownloadInterrompido("Download cancelado")
+                inicio = time.monotonic()
+                dados = resp.raw.read(bloco, decode_content=True)
+                if not dados:
+                    break
+                f.write(dados)
+                self._contar(self.segmentos[0], len(dados))
+                self._progresso()
+                if time.monotonic() - inicio < 0.2 and len(dados) == bloco:
+                    bloco = min(bloco * 2, BLOCO_MAX)
+        comprimento = resp.headers.get("Content-Length")
+        if comprimento and comprimento.isdigit() and "Content-Encoding" not in resp.headers:
+            self.tamanho = int(comprimento)
+
+    def _progresso_msg(self, mensagem: str):
+        if self._ao_progresso is not None:
+            self._ao_progresso(mensagem)
+
+    # ── fluxo ───────────────────────────────────────────────────────
+
+    def executar(self, sha256: str = None) -> Dict:
+        os.makedirs(os.path.dirname(os.path.abspath(self.destino)), exist_ok=True)
+        resp = self._sondar()
+        if resp is None:
+            self._baixar_segmentos()
+        else:
+            self._limpar_estado()
+            self._baixar_sequencial(resp)
+        self._progresso(forcar=True)
+
+        tamanho = os.path.getsize(self.parcial)
+        if self.tamanho is not None and tamanho != self.tamanho:
+            raise IOError(f"Tamanho não confere: {tamanho} bytes, esperado {self.tamanho}")
+        if sha256:
+            calculado = sha256_arquivo(self.parcial)
+            if calculado.lower() != sha256.strip().lower():
+                # Conteúdo corrompido: não adianta retomar, começa do zero na próxima
+                self._limpar_estado()
+                os.remove(self.parcial)
+                raise IOError(f"SHA-256 não confere: {calculado}")
+
+        os.replace(self.parcial, self.destino)
+        self._limpar_estado()
+        duracao = time.monotonic() - self._inicio
+        return {
+            "caminho": self.destino,
+            "tamanho": tamanho,
+            "segmentos": len(self.segmentos),
+            "retomado_de": self.retomado_de,
+            "duracao_s": round(duracao, 2),
+            "taxa_mb_s": round(self._baixados_sessao / max(duracao, 1e-6) / (1024 * 1024), 2),
+            "sha256_verificado": bool(sha256),
+        }
+
+
+def sha256_arquivo(caminho: str) -> str:
+    h = hashlib.sha256()
+    with open(caminho, "rb") as f:
+        for bloco in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(bloco)
+    return h.hexdigest()
+
+
+def baixar(url: str, destino: str, segmentos: int = SEGMENTOS, sha256: str = None,
+           ao_progresso: Callable[[str], None] = None, cancelado: Callable[[], bool] = None) -> Dict:
+    """
+    Baixa url para destino (segmentado se o servidor aceitar Range).
+
+    Args:
+        sha256: hash esperado do arquivo (opcional)
+        ao_progresso: recebe mensagens de andamento (bytes, %, taxa, ETA)
+        cancelado: consultada durante o download; True interrompe e deixa o parcial para retomar
+
+    Raises:
+        DownloadInterrompido: cancelado (chamar de novo retoma)
+        IOError / requests.RequestException: falha de rede ou verificação
+    """
+    return Download(url, destino, segmentos, ao_progresso, cancelado).executar(sha256)
@@ -0,0 +1,453 @@
+"""
+File Index — Índice local de arquivos para pesquisar_arquivos / pesquisar_conteudo.
+Nomes ficam num índice de trigramas e o conteúdo dos arquivos de texto num
+índice invertido de tokens (com o vocabulário também em trigramas, para achar
+os tokens que contêm um trecho), então uma consulta só abre os arquivos que
+podem conter o termo. O índice de cada pasta é montado em segundo plano na primeira
+consulta e depois mantido incrementalmente: por um observador do sistema de
+arquivos (watchdog, se instalado) ou revarrendo só os metadados (mtime e
+tamanho) de tempos em tempos e reindexando o que mudou.
+"""
+
+import os
+import re
+import time
+import itertools
+import threading
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+_TOKEN_RE = re.compile(r"\w{2,64}")
+
+AMOSTRA_BINARIO = 1024   # binário = tem byte nulo no começo (mesmo critério do content_scan)
+
+
+def pasta_ignorada(nome: str) -> bool:
+    return nome.startswith('.') or nome in ('node_modules', '__pycache__')
+
+
+def literais_regex(padrao: str) -> List[str]:
+    """
+    Trechos literais (3+ caracteres de palavra) que todo texto casado pelo regex
+    precisa conter — usados para filtrar candidatos. Vazio se não der para garantir.
+    """
+    if "|" in padrao:
+        return []
+    limpo = re.sub(r"\\.", " ", padrao)                  # \d, \., \w...
+    limpo = re.sub(r"\[[^\]]*\]", " ", limpo)             # classes
+    limpo = re.sub(r"\(\?P?<(?![=!])\w*>", "(", limpo)      # nome de grupo não é texto
+    limpo = re.sub(r"\(\?P=\w+\)|\(\?[aiLmsux-]+\)", " ", limpo)   # referências e flags
+    limpo = re.sub(r"\(\?[aiLmsux-]+:", "(", limpo)
+    limpo = _sem_grupos_opcionais(limpo)
+    limpo = re.sub(r".(?:[?*]|\{(?:,|0[,}])[^}]*\}?)", " ", limpo)   # caractere opcional
+    return re.findall(r"\w{3,}", limpo.lower())
+
+
+def _sem_grupos_opcionais(padrao: str) -> str:
+    """Apaga grupos que podem não casar nada: (...)?, (...)*, (...){0,n} e lookarounds negativos."""
+    texto = list(padrao)
+    abertos = []
+    i = 0
+    while i < len(texto):
+        c = texto[i]
+        if c == "(":
+            abertos.append(i)
+        elif c == ")" and abertos:
+            inicio = abertos.pop()
+            resto = "".join(texto[i + 1:i + 8])
+            quantificador = re.match(r"[?*]|\{(?:,|0[,}])", resto)
+            negativo = "".join(texto[inicio:inicio + 4]).startswith(("(?!", "(?<!"))
+            if quantificador or negativo:
+                fim = i + 1 + (len(quantificador.group()) if quantificador else 0)
+                texto[inicio:fim] = " " * (fim - inicio)
+        i += 1
+    return "".join(texto)
+
+
+class IndiceArquivos:
+    """Índice de nomes (trigramas) e conteúdo (tokens) de uma árvore de pastas."""
+
+    REVALIDAR = 30.0            # sem watchdog: revarre os metadados depois disso
+    MAX_BYTES_CONTEUDO = 1_000_000
+    MAX_CANDIDATOS = 2000       # arquivos abertos por consulta de conteúdo
+    MIN_ARQUIVOS_RANK = 50      # arquivos lidos (depois de ter resultados suficientes) antes de ranquear
+
+    def __init__(self, raiz: str):
+        self.raiz = os.path.abspath(raiz)
+        self._arquivos = {}                   # caminho -> (mtime_ns, tamanho, nome_minusculo, tokens)
+        self._trigramas = defaultdict(set)    # trigrama do nome -> caminhos
+        self._postings = defaultdict(set)     # token do conteúdo -> caminhos
+        self._vocabulario = defaultdict(set)  # trigrama -> tokens do conteúdo que o contêm
+        self._grandes = set()                 # textos acima de MAX_BYTES_CONTEUDO (sempre candidatos)
+        self._sujos = set()                   # caminhos avisados pelo watchdog
+        self._lock = threading.Lock()
+        self._atualizando = threading.Lock()
+        self._observador = None
+        self.pronto = threading.Event()
+        self._parado = threading.Event()
+        self.ultima_varredura = 0.0
+        self.duracao_construcao = None
+
+    # ─── Construção e atualização ─────────────────────────────────
+
+    def construir(self):
+        """Monta o índice (em segundo plano) e liga o observador, se houver."""
+        def _rodar():
+            inicio = time.monotonic()
+            try:
+                self._sincronizar(self._varrer(self.raiz), self.raiz)
+            except Exception as e:
+                print(f"[FileIndex] Erro indexando {self.raiz}: {e}")
+            if self._parado.is_set():
+                return
+            self.duracao_construcao = round(time.monotonic() - inicio, 2)
+            self.ultima_varredura = time.monotonic()
+            self._iniciar_observador()
+            self.pronto.set()
+        threading.Thread(target=_rodar, name="indice-arquivos", daemon=True).start()
+
+    def atualizar(self):
+        """Aplica as mudanças pendentes (watchdog) ou agenda uma revarredura se o índice envelheceu."""
+        if not self.pronto.is_set() or self._parado.is_set():
+            return
+        if self._observador is not None:
+            with self._lock:
+                sujos, self._sujos = self._sujos, set()
+            for caminho in sujos:
+                self._atualizar_caminho(caminho)
+        elif time.monotonic() - self.ultima_varredura > self.REVALIDAR and self._atualizando.acquire(blocking=False):
+            def _revarrer():
+                try:
+                    self._sincronizar(self._varrer(self.raiz), self.raiz)
+                    self.ultima_varredura = time.monotonic()
+                except Exception as e:
+                    print(f"[FileIndex] Erro atualizando {self.raiz}: {e}")
+                finally:
+                    self._atualizando.release()
+            threading.Thread(target=_revarrer, name="indice-arquivos", daemon=True).start()
+
+    def _varrer(self, pasta: str) -> Dict[str, tuple]:
+        """caminho -> (mtime_ns, tamanho) de todos os arquivos sob a pasta (só metadados)."""
+        vistos = {}
+        pilha = [pasta]
+        while pilha and not self._parado.is_set():
+            atual = pilha.pop()
+            try:
+                with os.scandir(atual) as entradas:
+                    for entrada in entradas:
+                        try:
+                            if entrada.is_dir(follow_symlinks=False):
+                                if not pasta_ignorada(entrada.name):
+                                    pilha.append(entrada.path)
+                            elif entrada.is_file(follow_symlinks=False):
+                                info = entrada.stat(follow_symlinks=False)   # no Windows vem da listagem
+                                vistos[entrada.path] = (info.st_mtime_ns, info.st_size)
+                        except OSError:
+                            continue
+            except OSError:
+                continue
+        return vistos
+
+    def _sincronizar(self, vistos: Dict[str, tuple], prefixo: str):
+        """Deixa o índice (sob o prefixo) igual à varredura: remove sumidos, reindexa alterados."""
+        prefixo_pasta = prefixo.rstrip(os.sep) + os.sep
+        with self._lock:
+            atuais = [c for c in self._arquivos if c == prefixo or c.startswith(prefixo_pasta)]
+        for caminho in atuais:
+            if caminho not in vistos:
+                self._remover(caminho)
+        for caminho, (mtime, tamanho) in vistos.items():
+            if self._parado.is_set():
+                return   # índice descartado no meio da construção
+            item = self._arquivos.get(caminho)
+            if item is None or item[0] != mtime or item[1] != tamanho:
+                self._indexar(caminho, mtime, tamanho)
+
+    def _atualizar_caminho(self, caminho: str):
+        if os.path.isdir(caminho):
+            self._sincronizar(self._varrer(caminho), caminho)
+        elif os.path.isfile(caminho):
+            try:
+                info = os.stat(caminho)
+            except OSError:
+                return
+            self._sincronizar({caminho: (info.st_mtime_ns, info.st_size)}, caminho)
+        else:
+            self._sincronizar({}, caminho)
+
+    def _ler_tokens(self, caminho: str, tamanho: int) -> tuple:
+        """
+        (texto, tokens): texto ou binário decidido pelos primeiros bytes, qualquer que
+        seja a extensão (Dockerfile, .env, .properties...); tokens é None para binários
+        e para textos grandes demais para indexar.
+        """
+        try:
+            with open(caminho, "rb") as f:
+                amostra = f.read(AMOSTRA_BINARIO)
+                if b"\0" in amostra:
+                    return False, None
+                if tamanho > self.MAX_BYTES_CONTEUDO:
+                    return True, None
+                dados = amostra + f.read()
+        except OSError:
+            return False, None
+        return True, frozenset(_TOKEN_RE.findall(dados.decode("utf-8", errors="ignore").lower()))
+
+    def _indexar(self, caminho: str, mtime: int, tamanho: int):
+        texto, tokens = self._ler_tokens(caminho, tamanho)
+        nome = os.path.basename(caminho).lower()
+        with self._lock:
+            self._remover_sem_lock(caminho)
+            self._arquivos[caminho] = (mtime, tamanho, nome, tokens)
+            if texto and tokens is None:
+                self._grandes.add(caminho)
+            for i in range(len(nome) - 2):
+                self._trigramas[nome[i:i + 3]].add(caminho)
+            for token in tokens or ():
+                if token not in self._postings:
+                    for i in range(len(token) - 2):
+                        self._vocabulario[token[i:i + 3]].add(token)
+                self._postings[token].add(caminho)
+
+    def _remover(self, caminho: str):
+        with self._lock:
+            self._remover_sem_lock(caminho)
+
+    def _remover_sem_lock(self, caminho: str):
+        item = self._arquivos.pop(caminho, None)
+        if item is None:
+            return
+        self._grandes.discard(caminho)
+        nome, tokens = item[2], item[3]
+        for i in range(len(nome) - 2):
+            conjunto = self._trigramas.get(nome[i:i + 3])
+            if conjunto is not None:
+                conjunto.discard(caminho)
+                if not conjunto:
+                    del self._trigramas[nome[i:i + 3]]
+        for token in tokens or ():
+            conjunto = self._postings.get(token)
+            if conjunto is not None:
+                conjunto.discard(caminho)
+                if not conjunto:
+                    del self._postings[token]
+                    for i in range(len(token) - 2):
+                        vocab = self._vocabulario.get(token[i:i + 3])
+                        if vocab is not None:
+                            vocab.discard(token)
+                            if not vocab:
+                                del self._vocabulario[token[i:i + 3]]
+
+    def _iniciar_observador(self):
+        try:
+            from watchdog.observers import Observer
+            from watchdog.events import FileSystemEventHandler
+        except ImportError:
+            return
+        indice = self
+
+        class _Marcador(FileSystemEventHandler):
+            def on_any_event(self, evento):
+                with indice._lock:
+                    indice._sujos.add(evento.src_path)
+                    if getattr(evento, "dest_path", None):
+                        indice._sujos.add(evento.dest_path)
+
+        try:
+            observador = Observer()
+            observador.schedule(_Marcador(), self.raiz, recursive=True)
+            observador.daemon = True
+            observador.start()
+            self._observador = observador
+        except Exception as e:
+            print(f"[FileIndex] Watchdog indisponível para {self.raiz}: {e}")
+
+    def parar(self):
+        """Interrompe a construção/revarredura em andamento e o observador."""
+        self._parado.set()
+        if self._observador is not None:
+            self._observador.stop()
+            self._observador = None
+
+    # ─── Consultas ────────────────────────────────────────────────
+
+    def _sob(self, pasta: Optional[str]):
+        if not pasta:
+            return lambda c: True
+        prefixo = os.path.normcase(os.path.abspath(pasta)).rstrip(os.sep) + os.sep
+        return lambda c: os.path.normcase(c).startswith(prefixo)
+
+    def buscar_nomes(self, termo: str, extensoes: List[str] = None, limite: int = 50,
+                     regex: bool = False, pasta: str = None) -> List[Dict]:
+        """
+        Arquivos cujo nome contém o termo (ou casa o regex), do mais relevante ao menos:
+        nome exato, depois começo do nome, depois nomes mais curtos e mais recentes.
+        """
+        self.atualizar()
+        sob = self._sob(pasta)
+        termo_min = termo.lower()
+        with self._lock:
+            if regex:
+                padrao = re.compile(termo, re.IGNORECASE)
+                candidatos = [c for c, item in self._arquivos.items() if padrao.search(item[2])]
+            elif len(termo_min) >= 3:
+                conjuntos = sorted(
+                    (self._trigramas.get(termo_min[i:i + 3], set()) for i in range(len(termo_min) - 2)), key=len
+                )
+                candidatos = set.intersection(*conjuntos) if conjuntos[0] else set()
+                candidatos = [c for c in candidatos if termo_min in self._arquivos[c][2]]
+            else:
+                candidatos = [c for c, item in self._arquivos.items() if termo_min in item[2]]
+            itens = [(c, self._arquivos[c]) for c in candidatos if sob(c)]
+
+        if extensoes:
+            itens = [(c, item) for c, item in itens if any(item[2].endswith(e.strip().lower()) for e in extensoes)]
+
+        def _rank(par):
+            nome = par[1][2]
+            base = os.path.splitext(nome)[0]
+            if regex:
+                classe = 0
+            else:
+                classe = 0 if termo_min in (nome, base) else 1 if nome.startswith(termo_min) else 2
+            return classe, len(nome), -par[1][0]
+
+        itens.sort(key=_rank)
+        return [
+            {"nome": os.path.basename(c), "caminho": c, "tamanho_kb": round(item[1] / 1024, 1)}
+            for c, item in itens[:limite]
+        ]
+
+    def _tokens_com(self, literal: str) -> set:
+        """Tokens do vocabulário que contêm o literal (trigramas, ou varredura das chaves se tiver 2 letras)."""
+        if len(literal) < 3:
+            tokens = set()
+            for trigrama, vocab in self._vocabulario.items():
+                if literal in trigrama:
+                    tokens |= vocab
+            if literal in self._postings:
+                tokens.add(literal)
+            return tokens
+        conjuntos = sorted(
+            (self._vocabulario.get(literal[i:i + 3]) or set() for i in range(len(literal) - 2)), key=len
+        )
+        if not conjuntos[0]:
+            return set()
+        return {t for t in set.intersection(*conjuntos) if literal in t}
+
+    def _candidatos_conteudo(self, literais: List[str]) -> tuple:
+        """
+        (candidatos, exatos): arquivos que contêm todos os literais como parte de
+        algum token, e os que os contêm como tokens inteiros. (None, None) = sem filtro.
+        """
+        if not literais:
+            return None, None
+        candidatos = exatos = None
+        # Literais mais longos primeiro: são os mais seletivos
+        for literal in sorted(set(literais), key=len, reverse=True):
+            postings = self._postings.get(literal)
+            exatos_literal = set(postings) if postings else set()
+            arquivos = set(exatos_literal)
+            # O literal pode ser pedaço de um token maior ("conta" em "contador")
+            for token in self._tokens_com(literal):
+                if token != literal:
+                    arquivos |= self._postings[token]
+            candidatos = arquivos if candidatos is None else candidatos & arquivos
+            exatos = exatos_literal if exatos is None else exatos & exatos_literal
+            if not candidatos:
+                break
+        return candidatos, exatos & candidatos
+
+    def buscar_conteudo(self, texto: str, extensao: str = None, limite: int = 30,
+                        regex: bool = False, pasta: str = None) -> List[Dict]:
+        """
+        Linhas que contêm o texto (ou casam o regex), sem diferenciar maiúsculas.
+        Só os arquivos que o índice aponta como candidatos são abertos — primeiro
+        os que têm o termo como palavra inteira, depois os mais recentes — e a
+        leitura para quando já há resultados suficientes; entre os lidos, os com
+        mais ocorrências vêm primeiro.
+        """
+        self.atualizar()
+        sob = self._sob(pasta)
+        if regex:
+            padrao = re.compile(texto, re.IGNORECASE)
+            literais = literais_regex(texto)
+            casa = padrao.search
+        else:
+            alvo = texto.lower()
+            literais = _TOKEN_RE.findall(alvo)
+            casa = lambda linha: alvo in linha.lower()
+
+        with self._lock:
+            candidatos, exatos = self._candidatos_conteudo(literais)
+            if candidatos is None:
+                candidatos, exatos = [c for c, item in self._arquivos.items() if item[3] is not None], set()
+            # Textos grandes não têm tokens no índice: só lendo para saber
+            candidatos = [
+                (c, self._arquivos[c][0]) for c in itertools.chain(candidatos, self._grandes)
+                if sob(c) and (not extensao or c.lower().endswith(extensao.lower()))
+            ]
+        candidatos.sort(key=lambda par: (par[0] not in exatos, -par[1]))
+
+        por_arquivo = []
+        encontrados = 0
+        for lidos, (caminho, _) in enumerate(candidatos[:self.MAX_CANDIDATOS], 1):
+            linhas = []
+            try:
+                with open(caminho, "r", encoding="utf-8", errors="ignore") as f:
+                    for i, linha in enumerate(f, 1):
+                        if casa(linha):
+                            linhas.append({"arquivo": caminho, "linha": i, "conteudo": linha.strip()[:200]})
+            except OSError:
+                continue
+            if linhas:
+                por_arquivo.append(linhas)
+                encontrados += len(linhas)
+            if encontrados >= limite and lidos >= self.MIN_ARQUIVOS_RANK:
+                break
+
+        por_arquivo.sort(key=len, reverse=True)
+        resultados = []
+        for linhas in por_arquivo:
+            resultados.extend(linhas[:limite - len(resultados)])
+            if len(resultados) >= limite:
+                break
+        return resultados
+
+    def estatisticas(self) -> Dict:
+        with self._lock:
+            return {
+                "raiz": self.raiz,
+                "arquivos": len(self._arquivos),
+                "com_conteudo": sum(1 for item in self._arquivos.values() if item[3] is not None),
+                "textos_grandes": len(self._grandes),
+                "tokens": len(self._postings),
+                "trigramas_vocabulario": len(self._vocabulario),
+                "pronto": self.pronto.is_set(),
+                "construcao_s": self.duracao_construcao,
+                "observador": self._observador is not None,
+            }
+
+
+_indices = {}
+_indices_lock = threading.Lock()
+MAX_INDICES = 8
+
+
+def indice_arquivos(pasta: str) -> IndiceArquivos:
+    """
+    Índice que cobre a pasta: o de uma pasta acima dela, se já existir, ou um
+    novo (construído em segundo plano — confira .pronto antes de consultar).
+    """
+    pasta = os.path.abspath(pasta)
+    chave = os.path.normcase(pasta)
+    with _indices_lock:
+        for raiz, indice in _indices.items():
+            if chave == raiz or chave.startswith(raiz.rstrip(os.sep) + os.sep):
+                return indice
+        if len(_indices) >= MAX_INDICES:
+            _indices.pop(next(iter(_indices))).parar()
+        indice = IndiceArquivos(pasta)
+        _indices[chave] = indice
+        indice.construir()
+        return indice
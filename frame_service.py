@@ -0,0 +1,184 @@
+"""
+Frame Service — Captura de tela compartilhada.
+Uma única captura por tick atende todos os consumidores (visão, screenshots,
+preview da GUI e stream do Gemini). Os consumidores recebem views NumPy/PIL
+somente-leitura do mesmo buffer, sem cópia, e cada tamanho reduzido é
+calculado uma vez por frame e reaproveitado.
+NOTA: MSS é thread-local no Windows, então cada thread mantém sua instância.
+"""
+
+import time
+import threading
+import cv2
+import numpy as np
+from PIL import Image
+
+
+def limitar_regiao(regiao, largura: int, altura: int) -> tuple:
+    """
+    (x, y, largura, altura) cortada aos limites da área — janelas maximizadas
+    começam em (-8, -8) e passam da tela.
+    """
+    x, y, w, h = regiao
+    x0, y0 = min(max(0, x), largura - 1), min(max(0, y), altura - 1)
+    x1, y1 = min(x + w, largura), min(y + h, altura)
+    return x0, y0, max(1, x1 - x0), max(1, y1 - y0)
+
+
+class Frame:
+    """Uma captura da tela. Views e versões derivadas são calculadas sob demanda e cacheadas."""
+
+    def __init__(self, bgra: np.ndarray, left: int, top: int, seq: int, instante: float):
+        self.seq = seq
+        self.instante = instante
+        self.altura, self.largura = bgra.shape[:2]
+        self.monitor = {"left": left, "top": top, "width": self.largura, "height": self.altura}
+        self.bgra = bgra
+        self.bgra.flags.writeable = False
+        self._derivados = {}
+        self._lock = threading.RLock()   # derivados dependem uns dos outros (reduzido → bgr)
+
+    @classmethod
+    def do_mss(cls, shot, seq: int, instante: float) -> "Frame":
+        # shot.raw é alocado pelo mss nesta captura (não é reescrito depois): view sem cópia
+        largura, altura = shot.size
+        bgra = np.frombuffer(shot.raw, dtype=np.uint8).reshape(altura, largura, 4)
+        return cls(bgra, shot.left, shot.top, seq, instante)
+
+    def recorte(self, regiao) -> "Frame":
+        """Sub-frame (x, y, largura, altura) relativo a este frame — view, sem cópia."""
+        x, y, w, h = limitar_regiao(regiao, self.largura, self.altura)
+        return self._derivado(("recorte", (x, y, w, h)), lambda: Frame(
+            self.bgra[y:y + h, x:x + w], self.monitor["left"] + x, self.monitor["top"] + y,
+            self.seq, self.instante
+        ))
+
+    def _derivado(self, chave, calcular):
+        with self._lock:
+            valor = self._derivados.get(chave)
+            if valor is None:
+                valor = calcular()
+                if isinstance(valor, np.ndarray) and valor.flags.owndata:
+                    valor.flags.writeable = False
+                self._derivados[chave] = valor
+            return valor
+
+    def bgr(self) -> np.ndarray:
+        """Frame BGR (OpenCV), somente-leitura e compartilhado — copie antes de desenhar."""
+        return self._derivado("bgr", lambda: cv2.cvtColor(self.bgra, cv2.COLOR_BGRA2BGR))
+
+    def cinza(self) -> np.ndarray:
+        return self._derivado("cinza", lambda: cv2.cvtColor(self.bgra, cv2.COLOR_BGRA2GRAY))
+
+    def pil(self) -> Image.Image:
+        """PIL Image RGB em resolução cheia."""
+        return self._derivado("pil", lambda: Image.fromarray(cv2.cvtColor(self.bgra, cv2.COLOR_BGRA2RGB)))
+
+    def reduzido(self, tamanho) -> np.ndarray:
+        """Frame BGR reduzido para (largura, altura), calculado uma vez por tamanho."""
+        tamanho = tuple(tamanho)
+        return self._derivado(("reduzido", tamanho), lambda: self._reduzir(tamanho))
+
+    def _reduzir(self, tamanho) -> np.ndarray:
+        # INTER_AREA é bem mais rápido em fator inteiro: reduz primeiro pelo maior fator
+        # inteiro que ainda deixa os dois eixos >= ao tamanho pedido (ex.: 4K → 1080p)
+        img = self.bgr()
+        fator = min(self.largura // tamanho[0], self.altura // tamanho[1])
+        if fator >= 2:
+            img = cv2.resize(img, (self.largura // fator, self.altura // fator), interpolation=cv2.INTER_AREA)
+        return cv2.resize(img, tamanho, interpolation=cv2.INTER_AREA)
+
+    def reduzido_pil(self, tamanho) -> Image.Image:
+        tamanho = tuple(tamanho)
+        return self._derivado(("reduzido_pil", tamanho), lambda: Image.fromarray(
+            cv2.cvtColor(self.reduzido(tamanho), cv2.COLOR_BGR2RGB)
+        ))
+
+
+class ServicoCaptura:
+    """Captura compartilhada: no máximo uma captura por tick, mesmo com vários consumidores."""
+
+    TICK = 0.1   # frames mais novos que isso são reaproveitados
+
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._ultimo = {}   # monitor ou (monitor, regiao) -> Frame
+        self._seq = 0
+        self.capturas = 0
+        self.reaproveitados = 0
+        self.ultima_interacao = 0.0   # time.monotonic() do último clique/tecla/movimento
+        self.tempos_stream = {}       # médias por etapa do stream de tela (publicadas pelo ScreenCapture)
+
+    def _sct(self):
+        sct = getattr(self._local, "sct", None)
+        if sct is None:
+            import mss
+            sct = self._local.sct = mss.mss()
+        return sct
+
+    def frame(self, monitor: int = 0, max_idade: float = None, regiao=None) -> Frame:
+        """
+        Frame atual do monitor (0 = todos os monitores).
+
+        Args:
+            monitor: índice em mss.monitors
+            max_idade: idade máxima aceitável em segundos (padrão: TICK; 0 força captura nova)
+            regiao: (x, y, largura, altura) relativa ao monitor — captura só esse retângulo
+                (ou recorta, sem cópia, um frame cheio ainda válido)
+        """
+        max_idade = self.TICK if max_idade is None else max_idade
+        regiao = tuple(int(v) for v in regiao) if regiao else None
+        with self._lock:
+            agora = time.monotonic()
+            cheio = self._ultimo.get(monitor)
+            if cheio is not None and agora - cheio.instante <= max_idade:
+                self.reaproveitados += 1
+                return cheio.recorte(regiao) if regiao else cheio
+            chave = (monitor, regiao) if regiao else monitor
+            ultimo = self._ultimo.get(chave)
+            if ultimo is not None and agora - ultimo.instante <= max_idade:
+                self.reaproveitados += 1
+                return ultimo
+
+            sct = self._sct()
+            area = sct.monitors[monitor]
+            if regiao:
+                x, y, w, h = limitar_regiao(regiao, area["width"], area["height"])
+                area = {"left": area["left"] + x, "top": area["top"] + y, "width": w, "height": h}
+            shot = sct.grab(area)
+            self._seq += 1
+            self.capturas += 1
+            frame = Frame.do_mss(shot, self._seq, time.monotonic())
+            # Descarta recortes velhos para o dicionário não crescer com regiões avulsas
+            for k in [k for k, f in self._ultimo.items() if isinstance(k, tuple) and agora - f.instante > 1.0]:
+                del self._ultimo[k]
+            self._ultimo[chave] = frame
+            return frame
+
+    def origem(self, monitor: int = 0) -> tuple:
+        """(left, top) do monitor em coordenadas absolutas — as regiões são relativas a ele."""
+        with self._lock:
+            area = self._sct().monitors[monitor]
+        return area["left"], area["top"]
+
+    def sinalizar_interacao(self):
+        """Avisa que houve interação com a tela (o stream acelera por alguns segundos)."""
+        self.ultima_interacao = time.monotonic()
+
+    def estatisticas(self) -> dict:
+        return {"capturas": self.capturas, "reaproveitados": self.reaproveitados,
+                "tempos_stream": dict(self.tempos_stream)}
+
+
+_servico = None
+_servico_lock = threading.Lock()
+
+
+def servico_captura() -> ServicoCaptura:
+    """Instância única do serviço de captura."""
+    global _servico
+    with _servico_lock:
+        if _servico is None:
+            _servico = ServicoCaptura()
+        return _servico
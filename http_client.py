@@ -0,0 +1,253 @@
+"""
+HTTP Client — Sessão HTTP compartilhada e cache de respostas em disco.
+Todas as skills web usam a mesma requests.Session (keep-alive e pool de
+conexões por host, então DNS/TCP/TLS não se repetem a cada chamada). As
+respostas com ETag/Last-Modified ficam em memoria/http_cache/ e são
+revalidadas com requisição condicional (304 reaproveita o corpo salvo). O
+HTML é analisado com lxml quando instalado (bem mais rápido que o
+html.parser) e o texto extraído de uma página fica em memória pelo hash do
+corpo, então uma página que não mudou não é analisada de novo.
+"""
+
+import os
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "memoria", "http_cache")
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+
+
+class RespostaHTTP:
+    """Resposta (da rede ou do cache) com o corpo já lido."""
+
+    def __init__(self, url: str, status: int, conteudo: bytes, headers: Dict, encoding: str = None,
+                 do_cache: bool = False):
+        self.url = url
+        self.status_code = status
+        self.content = conteudo
+        self.headers = headers
+        self.encoding = encoding
+        self.do_cache = do_cache
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding or "utf-8", errors="replace")
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            import requests
+            raise requests.HTTPError(f"{self.status_code} para {self.url}")
+
+
+_sessao = None
+_sessao_lock = threading.Lock()
+
+
+def sessao_http():
+    """requests.Session única, com pool de conexões e retentativas em erros de conexão/5xx."""
+    global _sessao
+    with _sessao_lock:
+        if _sessao is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+
+            sessao = requests.Session()
+            retry = Retry(total=2, backoff_factor=0.3, status_forcelist=(502, 503, 504),
+                          allowed_methods=("GET", "HEAD"))
+            adaptador = HTTPAdapter(pool_connections=16, pool_maxsize=16, max_retries=retry)
+            sessao.mount("http://", adaptador)
+            sessao.mount("https://", adaptador)
+            sessao.headers["User-Agent"] = USER_AGENT
+            _sessao = sessao
+        return _sessao
+
+
+class CacheHTTP:
+    """Respostas GET em disco (corpo + metadados), revalidadas por ETag/Last-Modified."""
+
+    MAX_BYTES = 200 * 1024 * 1024
+    MAX_CORPO = 20 * 1024 * 1024   # respostas maiores não são guardadas
+
+    def __init__(self, diretorio: str = CACHE_DIR):
+        self.diretorio = diretorio
+        self._lock = threading.Lock()
+        self.stats = {"rede": 0, "revalidadas": 0, "frescas": 0}
+
+    def _caminhos(self, url: str):
+        chave = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        base = os.path.join(self.diretorio, chave)
+        return base + ".json", base + ".body"
+
+    def _ler(self, url: str):
+        meta_path, corpo_path = self._caminhos(url)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            with open(corpo_path, "rb") as f:
+                return meta, f.read()
+        except (OSError, ValueError):
+            return None, None
+
+    def _gravar(self, url: str, meta: Dict, corpo: bytes = None):
+        """Grava metadados e, se informado, o corpo (None = só atualiza os metadados)."""
+        os.makedirs(self.diretorio, exist_ok=True)
+        meta_path, corpo_path = self._caminhos(url)
+        with self._lock:
+            if corpo is not None:
+                with open(corpo_path + ".tmp", "wb") as f:
+                    f.write(corpo)
+                os.replace(corpo_path + ".tmp", corpo_path)
+            with open(meta_path + ".tmp", "w", encoding="utf-8") as f:
+                json.dump(meta, f, ensure_ascii=False)
+            os.replace(meta_path + ".tmp", meta_path)
+        if corpo is not None:
+            self._podar()
+
+    def _podar(self):
+        """Apaga as entradas mais antigas se o cache passou do tamanho máximo."""
+        try:
+            entradas = [e for e in os.scandir(self.diretorio) if e.name.endswith(".body")]
+        except OSError:
+            return
+        total = sum(e.stat().st_size for e in entradas)
+        if total <= self.MAX_BYTES:
+            return
+        for entrada in sorted(entradas, key=lambda e: e.stat().st_mtime):
+            total -= entrada.stat().st_size
+            for caminho in (entrada.path, entrada.path[:-5] + ".json"):
+                try:
+                    os.remove(caminho)
+                except OSError:
+                    pass
+            if total <= self.MAX_BYTES * 0.8:
+                break
+
+    @staticmethod
+    def _max_idade(headers: Dict) -> float:
+        controle = headers.get("Cache-Control", "") or ""
+        if "no-store" in controle or "no-cache" in controle:
+            return 0.0
+        for parte in controle.split(","):
+            parte = parte.strip()
+            if parte.startswith("max-age="):
+                try:
+                    return float(parte[len("max-age="):])
+                except ValueError:
+                    return 0.0
+        return 0.0
+
+    def get(self, url: str, headers: Dict = None, timeout: float = 15) -> RespostaHTTP:
+        """GET pela sessão compartilhada, servindo do cache quando ainda fresco ou quando o servidor diz 304."""
+        meta, corpo = self._ler(url)
+        pedido = dict(headers or {})
+        if meta is not None:
+            if time.time() - meta["salvo_em"] < meta.get("max_idade", 0):
+                self.stats["frescas"] += 1
+                return RespostaHTTP(url, meta["status"], corpo, meta["headers"], meta.get("encoding"), True)
+            if meta.get("etag"):
+                pedido["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                pedido["If-Modified-Since"] = meta["last_modified"]
+
+        resp = sessao_http().get(url, headers=pedido, timeout=timeout)
+        self.stats["rede"] += 1
+        if resp.status_code == 304 and meta is not None:
+            self.stats["revalidadas"] += 1
+            meta["salvo_em"] = time.time()
+            meta["max_idade"] = self._max_idade(resp.headers) or meta.get("max_idade", 0)
+            self._gravar(url, meta)
+            return RespostaHTTP(url, meta["status"], corpo, meta["headers"], meta.get("encoding"), True)
+
+        resposta = RespostaHTTP(resp.url, resp.status_code, resp.content, dict(resp.headers),
+                                resp.encoding or resp.apparent_encoding)
+        etag, modificado = resp.headers.get("ETag"), resp.headers.get("Last-Modified")
+        max_idade = self._max_idade(resp.headers)
+        cacheavel = resp.status_code == 200 and (etag or modificado or max_idade) \
+            and "no-store" not in resp.headers.get("Cache-Control", "") and len(resp.content) <= self.MAX_CORPO
+        if cacheavel:
+            self._gravar(url, {
+                "url": url, "status": resp.status_code, "etag": etag, "last_modified": modificado,
+                "max_idade": max_idade, "salvo_em": time.time(), "encoding": resposta.encoding,
+                "headers": {k: v for k, v in resp.headers.items() if k.lower() in ("content-type", "etag", "last-modified")},
+            }, resp.content)
+        return resposta
+
+
+_cache = None
+
+
+def cache_http() -> CacheHTTP:
+    global _cache
+    with _sessao_lock:
+        if _cache is None:
+            _cache = CacheHTTP()
+        return _cache
+
+
+def obter(url: str, headers: Dict = None, timeout: float = 15) -> RespostaHTTP:
+    """GET com sessão compartilhada + cache condicional."""
+    return cache_http().get(url, headers, timeout)
+
+
+# ═══════════════════════════════════════════════════════════════════
+#  HTML
+# ═══════════════════════════════════════════════════════════════════
+
+def _parser() -> str:
+    try:
+        import lxml  # noqa: F401
+        return "lxml"
+    except ImportError:
+        return "html.parser"
+
+
+PARSER_HTML = _parser()
+
+
+def analisar_html(html):
+    """BeautifulSoup com o parser mais rápido disponível."""
+    from bs4 import BeautifulSoup
+    return BeautifulSoup(html, PARSER_HTML)
+
+
+_extraidos = OrderedDict()   # hash do corpo -> {"titulo", "conteudo"}
+_extraidos_lock = threading.Lock()
+MAX_EXTRAIDOS = 128
+
+
+def extrair_texto(corpo: bytes, encoding: str = None) -> Dict:
+    """
+    Título e texto limpo de uma página (sem script/style/nav/footer/header).
+    O resultado fica em memória pelo hash do corpo.
+    """
+    chave = hashlib.sha1(corpo).hexdigest()
+    with _extraidos_lock:
+        if chave in _extraidos:
+            _extraidos.move_to_end(chave)
+            return _extraidos[chave]
+
+    soup = analisar_html(corpo.decode(encoding or "utf-8", errors="replace"))
+    for tag in soup(["script", "style", "nav", "footer", "header"]):
+        tag.decompose()
+    texto = soup.get_text(separator="\n", strip=True)
+    linhas = [l.strip() for l in texto.split("\n") if l.strip()]
+    extraido = {
+        "titulo": str(soup.title.string) if soup.title and soup.title.string else "",
+        "conteudo": "\n".join(linhas),
+    }
+
+    with _extraidos_lock:
+        _extraidos[chave] = extraido
+        while len(_extraidos) > MAX_EXTRAIDOS:
+            _extraidos.popitem(last=False)
+    return extraido
+
+
+def estatisticas() -> Dict:
+    return {"parser": PARSER_HTML, **cache_http().stats, "extraidos_em_memoria": len(_extraidos)}
@@ -2,13 +2,19 @@
 Sistema de Memória Persistente do ADK Agent.
 Salva conversas, notas e tarefas em JSON para que o agente
 NUNCA esqueça nada, mesmo após desligar o PC.
+Leituras vêm da RAM (MemoryStore); gravações vão para um diário append-only.
 """
 
 import os
-import json
-import time
+import atexit
+import threading
 from datetime import datetime
 
+from memory_store import MemoryStore
+from memory_index import IndiceTextual, tokenizar
+from memory_context import ResumoContexto
+from memory_history import HistoricoConversas
+
 # Diretório de memória
 MEMORIA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "memoria")
 os.makedirs(MEMORIA_DIR, exist_ok=True)
@@ -19,27 +25,128 @@ TAREFAS_FILE = os.path.join(MEMORIA_DIR, "tarefas.json")
 APRENDIZADOS_FILE = os.path.join(MEMORIA_DIR, "aprendizados.json")
 
 
-def _carregar_json(filepath: str, default=None):
-    """Carrega um arquivo JSON."""
-    if default is None:
-        default = []
-    try:
-        if os.path.exists(filepath):
-            with open(filepath, "r", encoding="utf-8") as f:
-                return json.load(f)
-    except Exception as e:
-        print(f"[Memória] Erro ao carregar {filepath}: {e}")
-    return default
+HISTORICO_DIR = os.path.join(MEMORIA_DIR, "historico")
 
+_store = None
+_historico = None
+_store_lock = threading.Lock()
+
+
+def _get_store() -> MemoryStore:
+    """Singleton do MemoryStore (carrega os arquivos do disco apenas uma vez)."""
+    global _store, _historico
+    with _store_lock:
+        if _store is None:
+            store = MemoryStore(MEMORIA_DIR, {
+                "conversas": CONVERSAS_FILE,
+                "notas": NOTAS_FILE,
+                "tarefas": TAREFAS_FILE,
+                "aprendizados": APRENDIZADOS_FILE,
+            })
+            # Registrado antes de qualquer gravação: nada sai da RAM sem ser arquivado
+            _historico = HistoricoConversas(store, HISTORICO_DIR)
+            _store = store
+    return _store
+
+
+def _get_historico() -> HistoricoConversas:
+    _get_store()
+    return _historico
 
-def _salvar_json(filepath: str, data):
-    """Salva dados em JSON."""
-    try:
-        os.makedirs(os.path.dirname(filepath), exist_ok=True)
-        with open(filepath, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-    except Exception as e:
-        print(f"[Memória] Erro ao salvar {filepath}: {e}")
+
+_resumo = None
+_resumo_lock = threading.Lock()
+
+
+def _get_resumo() -> ResumoContexto:
+    """Singleton do resumo de contexto (mantido pelos eventos do store)."""
+    global _resumo
+    with _resumo_lock:
+        if _resumo is None:
+            _resumo = ResumoContexto(_get_store())
+    return _resumo
+
+
+_semantica = None
+_semantica_lock = threading.Lock()
+
+
+def _get_semantica():
+    """Singleton da memória semântica (None se NumPy não estiver disponível)."""
+    global _semantica
+    with _semantica_lock:
+        if _semantica is None:
+            try:
+                from memory_semantic import MemoriaSemantica
+                _semantica = MemoriaSemantica(_get_store(), os.path.join(MEMORIA_DIR, "vetorial"))
+                atexit.register(_semantica.salvar)
+            except ImportError as e:
+                print(f"[Memória] Busca semântica indisponível: {e}")
+                _semantica = False
+    return _semantica or None
+
+
+# ═══════════════════════════════════════════════════════════════════
+#  ÍNDICE TEXTUAL — Busca em notas, aprendizados e conversas
+# ═══════════════════════════════════════════════════════════════════
+
+_CAMPOS_INDICE = {
+    "notas": {"titulo": 2.0, "conteudo": 1.0},
+    "aprendizados": {"conteudo": 1.0, "fonte": 0.5},
+    "conversas": {"conteudo": 1.0},
+}
+
+_indices = None
+_indices_lock = threading.Lock()
+
+
+def _get_indices() -> dict:
+    """Constrói os índices uma vez; depois são mantidos pelos eventos do store."""
+    global _indices
+    with _indices_lock:
+        if _indices is None:
+            store = _get_store()
+            store.ouvir(_atualizar_indices)
+            indices = {}
+            for colecao, pesos in _CAMPOS_INDICE.items():
+                indices[colecao] = IndiceTextual(pesos)
+                for registro in store.listar(colecao):
+                    indices[colecao].indexar(registro["id"], registro)
+            _indices = indices
+    return _indices
+
+
+def _atualizar_indices(colecao: str, op: str, registro: dict):
+    """Ouvinte do MemoryStore: reindexa o registro alterado."""
+    with _indices_lock:
+        indice = _indices.get(colecao) if _indices else None
+        if indice is None:
+            return
+        if op == "arquivar":
+            for r in registro:
+                indice.remover(r["id"])
+        elif op == "del":
+            indice.remover(registro["id"])
+        else:
+            indice.indexar(registro["id"], registro)
+
+
+def _buscar(colecao: str, termo: str, campos: tuple, limite: int = None) -> list:
+    """Busca ranqueada no índice; consultas sem tokens úteis caem no scan linear."""
+    store = _get_store()
+    if not tokenizar(termo):
+        termo = termo.lower()
+        registros = [
+            r for r in store.listar(colecao)
+            if any(termo in str(r.get(c, "")).lower() for c in campos)
+        ]
+        return registros[-limite:] if limite else registros
+
+    indices = _get_indices()
+    with _indices_lock:
+        ranking = indices[colecao].buscar(termo, limite)
+    registros = (store.obter(colecao, doc_id) for doc_id, _ in ranking)
+    return [r for r in registros if r is not None]
 
 
 # ═══════════════════════════════════════════════════════════════════
@@ -48,56 +155,75 @@ def _salvar_json(filepath: str, data):
 
 def salvar_mensagem(role: str, conteudo: str):
     """Salva uma mensagem no histórico de conversas."""
-    conversas = _carregar_json(CONVERSAS_FILE, [])
-    conversas.append({
+    # Últimas ~200 ficam na RAM; as mais antigas vão para memoria/historico/
+    _get_store().adicionar("conversas", {
         "role": role,
         "conteudo": conteudo[:2000],
         "timestamp": datetime.now().isoformat()
     })
-    # Manter últimas 200 mensagens
-    if len(conversas) > 200:
-        conversas = conversas[-200:]
-    _salvar_json(CONVERSAS_FILE, conversas)
 
 
 def obter_historico(n: int = 50) -> list:
-    """Retorna as últimas N mensagens."""
-    conversas = _carregar_json(CONVERSAS_FILE, [])
-    return conversas[-n:]
+    """Retorna as últimas N mensagens (da RAM)."""
+    return _get_store().listar("conversas", ultimos=n)
 
 
-def obter_resumo_contexto() -> str:
-    """Gera um resumo do contexto anterior para o system instruction."""
-    notas = _carregar_json(NOTAS_FILE, [])
-    tarefas = _carregar_json(TAREFAS_FILE, [])
-    aprendizados = _carregar_json(APRENDIZADOS_FILE, [])
-    historico = obter_historico(20)
+def paginar_historico(pagina: int = 0, tamanho: int = 20) -> dict:
+    """Página do histórico completo (0 = mais recentes), lendo só os segmentos necessários."""
+    return dict(_get_historico().pagina(pagina, tamanho), sucesso=True)
 
-    partes = []
 
-    if notas:
-        partes.append("📝 NOTAS SALVAS:")
-        for nota in notas[-15:]:
-            partes.append(f"  - [{nota.get('titulo', 'sem título')}]: {nota.get('conteudo', '')[:200]}")
+def resumo_do_dia(dia: str) -> dict:
+    """Resumo das conversas de um dia (AAAA-MM-DD)."""
+    historico = _get_historico()
+    resumo = historico.resumo_dia(dia)
+    if resumo is None:
+        return {"sucesso": False, "mensagem": f"Sem conversas em {dia}", "dias_disponiveis": historico.dias()[-30:]}
+    return {"sucesso": True, "resumo": resumo}
 
-    tarefas_pendentes = [t for t in tarefas if not t.get("concluida")]
-    if tarefas_pendentes:
-        partes.append("\n📋 TAREFAS PENDENTES:")
-        for t in tarefas_pendentes[-10:]:
-            partes.append(f"  - #{t.get('id', '?')}: {t.get('descricao', '')[:200]}")
 
-    if aprendizados:
-        partes.append("\n🧠 APRENDIZADOS:")
-        for a in aprendizados[-10:]:
-            partes.append(f"  - {a.get('conteudo', '')[:200]}")
+def buscar_conversas(termo: str, limite: int = 20) -> dict:
+    """Busca mensagens do histórico que contêm o termo."""
+    mensagens = _buscar("conversas", termo, ("conteudo",), limite)
+    return {"sucesso": True, "mensagens": mensagens, "total": len(mensagens)}
 
-    if historico:
-        partes.append("\n💬 ÚLTIMAS MENSAGENS:")
-        for msg in historico[-10:]:
-            role = "👤" if msg.get("role") == "user" else "🤖"
-            partes.append(f"  {role} {msg.get('conteudo', '')[:150]}")
 
-    return "\n".join(partes) if partes else "Sem memória anterior."
+def buscar_memoria(consulta: str, k: int = 5) -> dict:
+    """Busca semântica em notas e aprendizados (por significado, não só palavras)."""
+    semantica = _get_semantica()
+    if semantica is None:
+        return {"sucesso": False, "mensagem": "Busca semântica indisponível. Instale: pip install numpy"}
+    resultados = [
+        dict(registro, tipo=colecao, similaridade=score)
+        for colecao, registro, score in semantica.buscar(consulta, k)
+    ]
+    return {"sucesso": True, "resultados": resultados, "total": len(resultados)}
+
+
+def memoria_relevante(consulta: str, k: int = 5) -> str:
+    """Bloco de texto com as notas/aprendizados mais relevantes para a mensagem do usuário."""
+    semantica = _get_semantica()
+    if semantica is None:
+        return ""
+    try:
+        encontrados = semantica.buscar(consulta, k)
+    except Exception as e:
+        print(f"[Memória] Erro na busca semântica: {e}")
+        return ""
+    linhas = []
+    for colecao, registro, _ in encontrados:
+        if colecao == "notas":
+            linhas.append(f"  - [{registro.get('titulo', 'sem título')}]: {registro.get('conteudo', '')[:300]}")
+        else:
+            linhas.append(f"  - {registro.get('conteudo', '')[:300]}")
+    if not linhas:
+        return ""
+    return "═══ MEMÓRIA RELEVANTE ═══\n" + "\n".join(linhas)
+
+
+def obter_resumo_contexto() -> str:
+    """Resumo do contexto anterior para o system instruction (em cache, sem disco)."""
+    return _get_resumo().texto()
 
 
 # ═══════════════════════════════════════════════════════════════════
@@ -106,40 +232,29 @@ def obter_resumo_contexto() -> str:
 
 def salvar_nota(titulo: str, conteudo: str) -> dict:
     """Salva uma nota na memória persistente."""
-    notas = _carregar_json(NOTAS_FILE, [])
-    nota = {
-        "id": len(notas) + 1,
+    nota = _get_store().adicionar("notas", {
         "titulo": titulo,
         "conteudo": conteudo,
         "criada_em": datetime.now().isoformat()
-    }
-    notas.append(nota)
-    _salvar_json(NOTAS_FILE, notas)
+    })
     return {"sucesso": True, "mensagem": f"Nota #{nota['id']} salva: {titulo}"}
 
 
-def buscar_notas(termo: str) -> dict:
-    """Busca notas que contêm o termo."""
-    notas = _carregar_json(NOTAS_FILE, [])
-    encontradas = [
-        n for n in notas
-        if termo.lower() in n.get("titulo", "").lower()
-        or termo.lower() in n.get("conteudo", "").lower()
-    ]
+def buscar_notas(termo: str, limite: int = 50) -> dict:
+    """Busca notas que contêm o termo (sem acento, por prefixo, mais relevantes primeiro)."""
+    encontradas = _buscar("notas", termo, ("titulo", "conteudo"), limite)
     return {"sucesso": True, "notas": encontradas, "total": len(encontradas)}
 
 
 def listar_notas() -> dict:
     """Lista todas as notas salvas."""
-    notas = _carregar_json(NOTAS_FILE, [])
+    notas = _get_store().listar("notas")
     return {"sucesso": True, "notas": notas, "total": len(notas)}
 
 
 def deletar_nota(nota_id: int) -> dict:
     """Deleta uma nota pelo ID."""
-    notas = _carregar_json(NOTAS_FILE, [])
-    notas = [n for n in notas if n.get("id") != nota_id]
-    _salvar_json(NOTAS_FILE, notas)
+    _get_store().remover("notas", nota_id)
     return {"sucesso": True, "mensagem": f"Nota #{nota_id} deletada"}
 
 
@@ -149,33 +264,27 @@ def deletar_nota(nota_id: int) -> dict:
 
 def salvar_tarefa(descricao: str) -> dict:
     """Salva uma nova tarefa."""
-    tarefas = _carregar_json(TAREFAS_FILE, [])
-    tarefa = {
-        "id": len(tarefas) + 1,
+    tarefa = _get_store().adicionar("tarefas", {
         "descricao": descricao,
         "concluida": False,
         "criada_em": datetime.now().isoformat()
-    }
-    tarefas.append(tarefa)
-    _salvar_json(TAREFAS_FILE, tarefas)
+    })
     return {"sucesso": True, "mensagem": f"Tarefa #{tarefa['id']} criada: {descricao}"}
 
 
 def concluir_tarefa(tarefa_id: int) -> dict:
     """Marca uma tarefa como concluída."""
-    tarefas = _carregar_json(TAREFAS_FILE, [])
-    for t in tarefas:
-        if t.get("id") == tarefa_id:
-            t["concluida"] = True
-            t["concluida_em"] = datetime.now().isoformat()
-            _salvar_json(TAREFAS_FILE, tarefas)
-            return {"sucesso": True, "mensagem": f"Tarefa #{tarefa_id} concluída!"}
+    if _get_store().atualizar("tarefas", tarefa_id, {
+        "concluida": True,
+        "concluida_em": datetime.now().isoformat()
+    }):
+        return {"sucesso": True, "mensagem": f"Tarefa #{tarefa_id} concluída!"}
     return {"sucesso": False, "mensagem": f"Tarefa #{tarefa_id} não encontrada"}
 
 
 def listar_tarefas(apenas_pendentes: bool = True) -> dict:
     """Lista tarefas."""
-    tarefas = _carregar_json(TAREFAS_FILE, [])
+    tarefas = _get_store().listar("tarefas")
     if apenas_pendentes:
         tarefas = [t for t in tarefas if not t.get("concluida")]
     return {"sucesso": True, "tarefas": tarefas, "total": len(tarefas)}
@@ -187,24 +296,15 @@ def listar_tarefas(apenas_pendentes: bool = True) -> dict:
 
 def salvar_aprendizado(conteudo: str, fonte: str = "") -> dict:
     """Salva algo que o agente aprendeu (de vídeos, pesquisas, etc)."""
-    aprendizados = _carregar_json(APRENDIZADOS_FILE, [])
-    aprendizado = {
-        "id": len(aprendizados) + 1,
+    aprendizado = _get_store().adicionar("aprendizados", {
         "conteudo": conteudo,
         "fonte": fonte,
         "aprendido_em": datetime.now().isoformat()
-    }
-    aprendizados.append(aprendizado)
-    _salvar_json(APRENDIZADOS_FILE, aprendizados)
+    })
     return {"sucesso": True, "mensagem": f"Aprendizado #{aprendizado['id']} salvo"}
 
 
-def buscar_aprendizados(termo: str) -> dict:
-    """Busca nos aprendizados."""
-    aprendizados = _carregar_json(APRENDIZADOS_FILE, [])
-    encontrados = [
-        a for a in aprendizados
-        if termo.lower() in a.get("conteudo", "").lower()
-        or termo.lower() in a.get("fonte", "").lower()
-    ]
+def buscar_aprendizados(termo: str, limite: int = 50) -> dict:
+    """Busca nos aprendizados (sem acento, por prefixo, mais relevantes primeiro)."""
+    encontrados = _buscar("aprendizados", termo, ("conteudo", "fonte"), limite)
     return {"sucesso": True, "aprendizados": encontrados, "total": len(encontrados)}
@@ -0,0 +1,106 @@
+"""
+Memory Context — Resumo de contexto em cache para o system instruction.
+Mantém os trechos já truncados de cada seção (notas, tarefas, aprendizados,
+mensagens) e só remonta o texto quando algo muda. Um orçamento de tokens
+corta as seções menos prioritárias para o prompt não crescer sem limite.
+"""
+
+import threading
+from collections import OrderedDict
+
+
+class ResumoContexto:
+    """Resumo incremental da memória, atualizado pelos eventos do MemoryStore."""
+
+    # Seções em ordem de exibição: (coleção, cabeçalho, itens máximos)
+    SECOES = [
+        ("notas", "📝 NOTAS SALVAS:", 15),
+        ("tarefas", "📋 TAREFAS PENDENTES:", 10),
+        ("aprendizados", "🧠 APRENDIZADOS:", 10),
+        ("conversas", "💬 ÚLTIMAS MENSAGENS:", 10),
+    ]
+    # Ordem de corte quando o orçamento estoura (primeiro o menos importante)
+    PRIORIDADE_CORTE = ["conversas", "aprendizados", "notas", "tarefas"]
+    CHARS_POR_TOKEN = 4
+
+    def __init__(self, store, orcamento_tokens: int = 1500):
+        self.store = store
+        self.orcamento_tokens = orcamento_tokens
+        self._lock = threading.Lock()
+        self._trechos = {colecao: OrderedDict() for colecao, _, _ in self.SECOES}
+        self._texto = None
+        self._recarregar()
+        store.ouvir(self.atualizar)
+
+    @staticmethod
+    def _trecho(colecao: str, registro: dict) -> str:
+        """Linha já truncada de um registro (mesmo formato do resumo antigo)."""
+        if colecao == "notas":
+            return f"  - [{registro.get('titulo', 'sem título')}]: {registro.get('conteudo', '')[:200]}"
+        if colecao == "tarefas":
+            return f"  - #{registro.get('id', '?')}: {registro.get('descricao', '')[:200]}"
+        if colecao == "aprendizados":
+            return f"  - {registro.get('conteudo', '')[:200]}"
+        role = "👤" if registro.get("role") == "user" else "🤖"
+        return f"  {role} {registro.get('conteudo', '')[:150]}"
+
+    def _recarregar(self, colecoes=None):
+        """Recalcula os trechos a partir do store (RAM, sem disco)."""
+        for colecao, _, maximo in self.SECOES:
+            if colecoes and colecao not in colecoes:
+                continue
+            if colecao == "tarefas":
+                registros = [t for t in self.store.listar("tarefas") if not t.get("concluida")][-maximo:]
+            else:
+                registros = self.store.listar(colecao, ultimos=maximo)
+            self._trechos[colecao] = OrderedDict(
+                (r.get("id"), self._trecho(colecao, r)) for r in registros
+            )
+        self._texto = None
+
+    def atualizar(self, colecao: str, op: str, registro: dict):
+        """Ouvinte do MemoryStore: ajusta só a seção afetada."""
+        maximos = {c: m for c, _, m in self.SECOES}
+        if colecao not in maximos:
+            return
+        if op == "arquivar":
+            return  # só sai da RAM o que é mais antigo que a janela do resumo
+        with self._lock:
+            trechos = self._trechos[colecao]
+            rid = registro.get("id")
+            pendente = colecao != "tarefas" or not registro.get("concluida")
+            if op == "add" and pendente:
+                trechos[rid] = self._trecho(colecao, registro)
+                while len(trechos) > maximos[colecao]:
+                    trechos.popitem(last=False)
+            elif rid in trechos:
+                if op == "upd" and pendente:
+                    trechos[rid] = self._trecho(colecao, registro)
+                else:
+                    # Saiu da janela: outro registro pode precisar entrar no lugar
+                    self._recarregar([colecao])
+            else:
+                return
+            self._texto = None
+
+    def texto(self) -> str:
+        """Resumo pronto; só remonta a string quando alguma seção mudou."""
+        with self._lock:
+            if self._texto is None:
+                self._texto = self._montar()
+            return self._texto
+
+    def _montar(self) -> str:
+        linhas = {colecao: list(trechos.values()) for colecao, trechos in self._trechos.items()}
+        orcamento = self.orcamento_tokens * self.CHARS_POR_TOKEN
+        total = sum(len(l) + 1 for ls in linhas.values() for l in ls)
+        for colecao in self.PRIORIDADE_CORTE:
+            while total > orcamento and linhas[colecao]:
+                total -= len(linhas[colecao].pop(0)) + 1
+
+        partes = []
+        for colecao, cabecalho, _ in self.SECOES:
+            if linhas[colecao]:
+                partes.append(("\n" if partes else "") + cabecalho)
+                partes.extend(linhas[colecao])
+        return "\n".join(partes) if partes else "Sem memória anterior."
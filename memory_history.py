@@ -0,0 +1,236 @@
+"""
+Memory History — Histórico de conversas em camadas.
+  quente: últimas mensagens na RAM (coleção "conversas" do MemoryStore)
+  morna:  segmentos JSONL em disco com SEGMENTO mensagens cada
+  fria:   segmentos antigos comprimidos (gzip) + resumo por dia
+Como os ids das mensagens são sequenciais, o segmento de qualquer id é
+calculado direto, e paginar lê só os segmentos do intervalo pedido.
+"""
+
+import os
+import gzip
+import json
+import threading
+from collections import Counter
+
+from memory_index import tokenizar
+
+
+class HistoricoConversas:
+    """Arquiva as mensagens que saem da RAM e pagina qualquer intervalo do histórico."""
+
+    SEGMENTO = 1000           # mensagens por segmento
+    SEGMENTOS_MORNOS = 5      # segmentos completos mantidos sem compressão
+    PALAVRAS_RESUMO = 15      # palavras-chave guardadas por dia
+
+    def __init__(self, store, diretorio: str):
+        self.store = store
+        self.diretorio = diretorio
+        self.dir_frio = os.path.join(diretorio, "frio")
+        self.resumos_file = os.path.join(diretorio, "resumos_diarios.json")
+        os.makedirs(self.dir_frio, exist_ok=True)
+        self._lock = threading.Lock()
+        self._resumos = self._carregar_resumos()
+        # Maior id já arquivado: mensagens até ele que voltarem (replay) não são anexadas de novo
+        self._ultimo_arquivado = max((r.get("ultimo_id") or 0 for r in self._resumos.values()), default=0)
+        store.ouvir(self._ao_alterar)
+
+    # ─── Caminhos dos segmentos ───────────────────────────────────
+
+    def _segmento(self, msg_id: int) -> int:
+        return (msg_id - 1) // self.SEGMENTO
+
+    def _arquivo_morno(self, seg: int) -> str:
+        return os.path.join(self.diretorio, f"seg_{seg:06d}.jsonl")
+
+    def _arquivo_frio(self, seg: int) -> str:
+        return os.path.join(self.dir_frio, f"seg_{seg:06d}.jsonl.gz")
+
+    # ─── Arquivamento ─────────────────────────────────────────────
+
+    def _ao_alterar(self, colecao: str, op: str, registro):
+        if colecao == "conversas" and op == "arquivar":
+            self.arquivar(registro)
+
+    def arquivar(self, mensagens: list):
+        """Anexa mensagens (em ordem de id) aos segmentos mornos e atualiza resumos."""
+        with self._lock:
+            por_segmento = {}
+            for msg in mensagens:
+                if msg["id"] > self._ultimo_arquivado:
+                    por_segmento.setdefault(self._segmento(msg["id"]), []).append(msg)
+            if not por_segmento:
+                return
+            for seg, msgs in por_segmento.items():
+                if os.path.exists(self._arquivo_frio(seg)):
+                    continue  # já arquivado (replay após queda)
+                try:
+                    with open(self._arquivo_morno(seg), "a", encoding="utf-8") as f:
+                        f.write("".join(json.dumps(m, ensure_ascii=False) + "\n" for m in msgs))
+                except Exception as e:
+                    print(f"[Memória] Erro ao arquivar conversas: {e}")
+                    continue
+                self._acumular_resumos(msgs)
+                self._ultimo_arquivado = max(self._ultimo_arquivado, msgs[-1]["id"])
+            self._salvar_resumos()
+            self._comprimir_antigos()
+
+    def _comprimir_antigos(self):
+        """Comprime os segmentos completos mais antigos que os SEGMENTOS_MORNOS recentes."""
+        completos = []
+        for nome in os.listdir(self.diretorio):
+            if nome.startswith("seg_") and nome.endswith(".jsonl"):
+                seg = int(nome[4:10])
+                if self._segmento_completo(seg):
+                    completos.append(seg)
+        for seg in sorted(completos)[:-self.SEGMENTOS_MORNOS or None]:
+            origem = self._arquivo_morno(seg)
+            destino = self._arquivo_frio(seg)
+            try:
+                with open(origem, "rb") as f_in, gzip.open(destino + ".tmp", "wb") as f_out:
+                    f_out.write(f_in.read())
+                os.replace(destino + ".tmp", destino)
+                os.remove(origem)
+            except Exception as e:
+                print(f"[Memória] Erro ao comprimir segmento {seg}: {e}")
+
+    def _segmento_completo(self, seg: int) -> bool:
+        """Todas as mensagens do segmento já saíram da RAM?"""
+        return self._hot_primeiro_id() > (seg + 1) * self.SEGMENTO
+
+    def _hot_primeiro_id(self) -> int:
+        hot = self.store.listar("conversas")
+        return hot[0]["id"] if hot else 1
+
+    def _ultimo_id(self) -> int:
+        hot = self.store.listar("conversas", ultimos=1)
+        return hot[-1]["id"] if hot else 0
+
+    # ─── Resumos diários ──────────────────────────────────────────
+
+    def _carregar_resumos(self) -> dict:
+        try:
+            with open(self.resumos_file, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _salvar_resumos(self):
+        try:
+            tmp = self.resumos_file + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self._resumos, f, ensure_ascii=False)
+            os.replace(tmp, self.resumos_file)
+        except Exception as e:
+            print(f"[Memória] Erro ao salvar resumos diários: {e}")
+
+    def _acumular_resumos(self, mensagens: list):
+        for dia, msgs in _agrupar_por_dia(mensagens).items():
+            resumo = self._resumos.setdefault(dia, _resumo_vazio())
+            _somar_resumo(resumo, msgs, self.PALAVRAS_RESUMO)
+
+    def resumo_dia(self, dia: str) -> dict:
+        """Resumo de um dia (AAAA-MM-DD): contagens, horário, palavras-chave e primeiras perguntas."""
+        with self._lock:
+            resumo = json.loads(json.dumps(self._resumos.get(dia, _resumo_vazio())))
+        recentes = [m for m in self.store.listar("conversas") if m.get("timestamp", "").startswith(dia)]
+        if recentes:
+            _somar_resumo(resumo, recentes, self.PALAVRAS_RESUMO)
+        if not resumo["total"]:
+            return None
+        resumo["palavras"] = list(resumo["palavras"])[:self.PALAVRAS_RESUMO]
+        return dict(resumo, dia=dia)
+
+    def dias(self) -> list:
+        """Dias que têm mensagens arquivadas ou na RAM."""
+        with self._lock:
+            dias = set(self._resumos)
+        dias.update(m.get("timestamp", "")[:10] for m in self.store.listar("conversas"))
+        return sorted(d for d in dias if d)
+
+    # ─── Leitura / paginação ──────────────────────────────────────
+
+    def _ler_segmento(self, seg: int) -> list:
+        caminho = self._arquivo_morno(seg)
+        abrir = open
+        if not os.path.exists(caminho):
+            caminho = self._arquivo_frio(seg)
+            abrir = gzip.open
+            if not os.path.exists(caminho):
+                return []
+        mensagens = []
+        with abrir(caminho, "rt", encoding="utf-8") as f:
+            for linha in f:
+                try:
+                    mensagens.append(json.loads(linha))
+                except ValueError:
+                    continue
+        return mensagens
+
+    def intervalo(self, inicio_id: int, fim_id: int) -> list:
+        """Mensagens com id em [inicio_id, fim_id], lendo só a camada necessária."""
+        inicio_id = max(1, inicio_id)
+        if fim_id < inicio_id:
+            return []
+        primeiro_hot = self._hot_primeiro_id()
+        mensagens = []
+        if inicio_id < primeiro_hot:
+            vistos = set()
+            with self._lock:
+                for seg in range(self._segmento(inicio_id), self._segmento(min(fim_id, primeiro_hot - 1)) + 1):
+                    for m in self._ler_segmento(seg):
+                        if inicio_id <= m["id"] <= fim_id and m["id"] < primeiro_hot and m["id"] not in vistos:
+                            vistos.add(m["id"])
+                            mensagens.append(m)
+            mensagens.sort(key=lambda m: m["id"])
+        if fim_id >= primeiro_hot:
+            mensagens.extend(m for m in self.store.listar("conversas") if inicio_id <= m["id"] <= fim_id)
+        return mensagens
+
+    def pagina(self, pagina: int = 0, tamanho: int = 20) -> dict:
+        """Página do histórico contando a partir das mais recentes (pagina=0)."""
+        total = self._ultimo_id()
+        fim = total - pagina * tamanho
+        inicio = fim - tamanho + 1
+        mensagens = self.intervalo(inicio, fim) if fim > 0 else []
+        return {
+            "mensagens": mensagens,
+            "pagina": pagina,
+            "total_paginas": (total + tamanho - 1) // tamanho if tamanho else 0,
+            "total_mensagens": total,
+        }
+
+
+def _agrupar_por_dia(mensagens: list) -> dict:
+    dias = {}
+    for m in mensagens:
+        dias.setdefault(m.get("timestamp", "")[:10] or "sem-data", []).append(m)
+    return dias
+
+
+def _resumo_vazio() -> dict:
+    return {"total": 0, "usuario": 0, "agente": 0, "primeira": None, "ultima": None,
+            "primeiro_id": None, "ultimo_id": None, "palavras": {}, "perguntas": []}
+
+
+def _somar_resumo(resumo: dict, mensagens: list, n_palavras: int):
+    """Acumula um lote de mensagens do mesmo dia no resumo."""
+    palavras = Counter(resumo["palavras"])
+    for m in mensagens:
+        resumo["total"] += 1
+        if m.get("role") == "user":
+            resumo["usuario"] += 1
+            if len(resumo["perguntas"]) < 5:
+                resumo["perguntas"].append(m.get("conteudo", "")[:150])
+        else:
+            resumo["agente"] += 1
+        ts = m.get("timestamp")
+        if ts:
+            resumo["primeira"] = min(filter(None, [resumo["primeira"], ts]))
+            resumo["ultima"] = max(filter(None, [resumo["ultima"], ts]))
+        mid = m.get("id")
+        if mid is not None:
+            resumo["primeiro_id"] = min(filter(None, [resumo["primeiro_id"], mid]))
+            resumo["ultimo_id"] = max(filter(None, [resumo["ultimo_id"], mid]))
+        palavras.update(t for t in tokenizar(m.get("conteudo", "")) if len(t) > 3 and not t.isdigit())
+    resumo["palavras"] = dict(palavras.most_common(n_palavras * 3))
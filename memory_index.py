@@ -0,0 +1,159 @@
+"""
+Memory Index — Índice invertido para busca textual na memória do agente.
+Tokenização em português sem acentos, ranking BM25 e busca por prefixo.
+Mantido incrementalmente a cada gravação do MemoryStore.
+"""
+
+import re
+import math
+import bisect
+import heapq
+import unicodedata
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+STOPWORDS = frozenset("""
+a o e as os um uma uns umas de da do das dos em no na nos nas ao aos
+à às para pra por pelo pela pelos pelas com sem que se ou mas como mais
+muito ja nao sim eu voce ele ela isso esse essa este esta the of and to in
+""".split())
+
+
+def normalizar(texto: str) -> str:
+    """Minúsculas e sem acentos ('Análise' → 'analise')."""
+    decomposto = unicodedata.normalize("NFKD", texto.lower())
+    return "".join(c for c in decomposto if not unicodedata.combining(c))
+
+
+def tokenizar(texto: str) -> List[str]:
+    """Quebra texto em tokens normalizados, sem stopwords e sem plural simples."""
+    tokens = []
+    for tok in _TOKEN_RE.findall(normalizar(texto or "")):
+        if tok in STOPWORDS:
+            continue
+        if len(tok) > 4 and tok.endswith("s") and not tok.endswith("ss"):
+            tok = tok[:-1]
+        tokens.append(tok)
+    return tokens
+
+
+class IndiceTextual:
+    """Índice invertido BM25 de uma coleção (documentos identificados por id)."""
+
+    K1 = 1.2
+    B = 0.75
+    MIN_PREFIXO = 3       # prefixos mais curtos só casam o termo exato
+    MAX_EXPANSOES = 50    # termos do vocabulário por prefixo
+
+    def __init__(self, pesos_campos: Dict[str, float]):
+        """
+        Args:
+            pesos_campos: {"titulo": 2.0, "conteudo": 1.0} — peso de cada campo no tf
+        """
+        self.pesos_campos = pesos_campos
+        self._postings = defaultdict(dict)   # termo -> {doc_id: tf ponderado}
+        self._termos_doc = {}                # doc_id -> set(termos)
+        self._tam_doc = {}                   # doc_id -> tamanho ponderado
+        self._tam_total = 0.0
+        self._vocabulario = []               # termos ordenados (busca por prefixo)
+
+    def __len__(self):
+        return len(self._tam_doc)
+
+    def indexar(self, doc_id, registro: dict):
+        """Indexa (ou reindexa) um registro."""
+        if doc_id in self._tam_doc:
+            self.remover(doc_id)
+        tf = defaultdict(float)
+        for campo, peso in self.pesos_campos.items():
+            for tok in tokenizar(str(registro.get(campo, "") or "")):
+                tf[tok] += peso
+        if not tf:
+            return
+        for termo, freq in tf.items():
+            posting = self._postings[termo]
+            if not posting:
+                bisect.insort(self._vocabulario, termo)
+            posting[doc_id] = freq
+        self._termos_doc[doc_id] = set(tf)
+        tamanho = sum(tf.values())
+        self._tam_doc[doc_id] = tamanho
+        self._tam_total += tamanho
+
+    def remover(self, doc_id):
+        """Remove um documento do índice."""
+        termos = self._termos_doc.pop(doc_id, None)
+        if termos is None:
+            return
+        self._tam_total -= self._tam_doc.pop(doc_id, 0.0)
+        for termo in termos:
+            posting = self._postings.get(termo)
+            if posting is None:
+                continue
+            posting.pop(doc_id, None)
+            if not posting:
+                del self._postings[termo]
+                i = bisect.bisect_left(self._vocabulario, termo)
+                if i < len(self._vocabulario) and self._vocabulario[i] == termo:
+                    del self._vocabulario[i]
+
+    def _expandir(self, prefixo: str) -> List[str]:
+        """Termos do vocabulário que começam com o prefixo (limitado a MAX_EXPANSOES)."""
+        if len(prefixo) < self.MIN_PREFIXO:
+            return [prefixo] if prefixo in self._postings else []
+        i = bisect.bisect_left(self._vocabulario, prefixo)
+        fim = min(i + self.MAX_EXPANSOES, len(self._vocabulario))
+        termos = []
+        while i < fim and self._vocabulario[i].startswith(prefixo):
+            termos.append(self._vocabulario[i])
+            i += 1
+        return termos
+
+    def buscar(self, consulta: str, limite: int = None) -> List[Tuple[object, float]]:
+        """
+        Busca documentos que contêm TODOS os termos da consulta (termo ou prefixo).
+
+        Returns:
+            [(doc_id, score)] ordenado por relevância BM25
+        """
+        termos_consulta = tokenizar(consulta)
+        n_docs = len(self._tam_doc)
+        if not termos_consulta or not n_docs:
+            return []
+        media = self._tam_total / n_docs
+
+        # Postings de cada termo da consulta, do mais raro para o mais comum
+        grupos = []
+        for termo in dict.fromkeys(termos_consulta):
+            postings = [self._postings[t] for t in self._expandir(termo)]
+            if not postings:
+                return []
+            grupos.append(postings)
+        grupos.sort(key=lambda ps: sum(len(p) for p in ps))
+
+        scores = None
+        for postings in grupos:
+            parcial = defaultdict(float)
+            for posting in postings:
+                idf = math.log(1 + (n_docs - len(posting) + 0.5) / (len(posting) + 0.5))
+                # Depois do primeiro termo só os candidatos restantes importam
+                if scores is not None and len(scores) < len(posting):
+                    itens = ((d, posting[d]) for d in scores if d in posting)
+                else:
+                    itens = posting.items()
+                for doc_id, tf in itens:
+                    norm = tf + self.K1 * (1 - self.B + self.B * self._tam_doc[doc_id] / media)
+                    parcial[doc_id] += idf * tf * (self.K1 + 1) / norm
+            if scores is None:
+                scores = parcial
+            else:
+                scores = {d: s + parcial[d] for d, s in scores.items() if d in parcial}
+            if not scores:
+                return []
+
+        chave = lambda x: (x[1], x[0])
+        if limite:
+            return heapq.nlargest(limite, scores.items(), key=chave)
+        return sorted(scores.items(), key=chave, reverse=True)
@@ -0,0 +1,341 @@
+"""
+Memory Semantic — Recuperação semântica local da memória do agente.
+Embeddings em CPU (sentence-transformers se instalado, senão hashing de
+n-gramas com NumPy) e índice vetorial persistido em disco (HNSW via
+hnswlib quando disponível, senão busca plana vetorizada).
+"""
+
+import os
+import json
+import zlib
+import threading
+import numpy as np
+from typing import List, Tuple
+
+from memory_index import normalizar, tokenizar
+
+
+# ═══════════════════════════════════════════════════════════════════
+#  Embeddings — sempre em CPU
+# ═══════════════════════════════════════════════════════════════════
+
+class EmbedderHash:
+    """Embedding por feature hashing de palavras e trigramas (sem modelo)."""
+
+    nome = "hash-v1"
+
+    def __init__(self, dim: int = 512):
+        self.dim = dim
+
+    def _features(self, texto: str) -> List[str]:
+        palavras = tokenizar(texto)
+        feats = list(palavras)
+        for p in palavras:
+            p = f"#{p}#"
+            feats.extend(p[i:i + 3] for i in range(len(p) - 2))
+        return feats
+
+    def embed(self, textos: List[str]) -> np.ndarray:
+        vetores = np.zeros((len(textos), self.dim), dtype=np.float32)
+        for i, texto in enumerate(textos):
+            for feat in self._features(texto):
+                h = zlib.crc32(feat.encode("utf-8"))
+                vetores[i, h % self.dim] += 1.0 if (h >> 31) & 1 else -1.0
+        return _normalizar_linhas(vetores)
+
+
+class EmbedderSentenceTransformers:
+    """Modelo multilíngue pequeno do sentence-transformers rodando em CPU."""
+
+    MODELO = "paraphrase-multilingual-MiniLM-L12-v2"
+
+    def __init__(self):
+        from sentence_transformers import SentenceTransformer
+        self._modelo = SentenceTransformer(self.MODELO, device="cpu")
+        self.dim = self._modelo.get_sentence_embedding_dimension()
+        self.nome = f"st-{self.MODELO}"
+
+    def embed(self, textos: List[str]) -> np.ndarray:
+        vetores = self._modelo.encode(textos, batch_size=32, convert_to_numpy=True, show_progress_bar=False)
+        return _normalizar_linhas(vetores.astype(np.float32))
+
+
+def criar_embedder():
+    """Usa sentence-transformers se instalado; senão cai para o embedding por hashing."""
+    try:
+        return EmbedderSentenceTransformers()
+    except Exception:
+        return EmbedderHash()
+
+
+def _normalizar_linhas(vetores: np.ndarray) -> np.ndarray:
+    normas = np.linalg.norm(vetores, axis=1, keepdims=True)
+    normas[normas == 0] = 1.0
+    return vetores / normas
+
+
+# ═══════════════════════════════════════════════════════════════════
+#  Índice vetorial persistente
+# ═══════════════════════════════════════════════════════════════════
+
+class IndiceVetorial:
+    """
+    Índice de vetores normalizados (similaridade de cosseno).
+    Os vetores ficam numa matriz NumPy (fonte da verdade, salva em .npy);
+    com hnswlib instalado e coleção grande, as buscas usam um grafo HNSW.
+    """
+
+    LIMIAR_ANN = 5000   # abaixo disso a busca plana é mais rápida que o HNSW
+
+    def __init__(self, dim: int):
+        self.dim = dim
+        self._vetores = np.zeros((0, dim), dtype=np.float32)
+        self._chaves = []
+        self._pos = {}
+        self._hnsw = None
+        self._rotulos = {}       # chave -> rótulo no HNSW
+        self._chave_por_rotulo = {}
+        self._proximo_rotulo = 0
+
+    def __len__(self):
+        return len(self._chaves)
+
+    def __contains__(self, chave):
+        return chave in self._pos
+
+    def chaves(self) -> List[str]:
+        return list(self._chaves)
+
+    def adicionar(self, chaves: List[str], vetores: np.ndarray):
+        """Adiciona (ou substitui) vetores."""
+        for chave in chaves:
+            self.remover(chave)
+        n = len(self._chaves)
+        necessario = n + len(chaves)
+        if necessario > self._vetores.shape[0]:
+            nova = np.zeros((max(necessario, 2 * self._vetores.shape[0], 64), self.dim), dtype=np.float32)
+            nova[:n] = self._vetores[:n]
+            self._vetores = nova
+        self._vetores[n:necessario] = vetores
+        for i, chave in enumerate(chaves):
+            self._pos[chave] = n + i
+            self._chaves.append(chave)
+        if self._hnsw is not None:
+            self._hnsw_adicionar(chaves, vetores)
+
+    def remover(self, chave: str):
+        """Remove um vetor (troca com a última linha para manter a matriz compacta)."""
+        pos = self._pos.pop(chave, None)
+        if pos is None:
+            return
+        ultimo = len(self._chaves) - 1
+        if pos != ultimo:
+            chave_ultima = self._chaves[ultimo]
+            self._vetores[pos] = self._vetores[ultimo]
+            self._chaves[pos] = chave_ultima
+            self._pos[chave_ultima] = pos
+        self._chaves.pop()
+        rotulo = self._rotulos.pop(chave, None)
+        if self._hnsw is not None and rotulo is not None:
+            self._chave_por_rotulo.pop(rotulo, None)
+            self._hnsw.mark_deleted(rotulo)
+
+    def buscar(self, vetor: np.ndarray, k: int = 5) -> List[Tuple[str, float]]:
+        """Retorna [(chave, similaridade)] dos k vizinhos mais próximos."""
+        n = len(self._chaves)
+        if n == 0:
+            return []
+        k = min(k, n)
+        if self._hnsw is None and n >= self.LIMIAR_ANN:
+            self._construir_hnsw()
+        if self._hnsw is not None:
+            try:
+                self._hnsw.set_ef(max(50, 2 * k))
+                labels, dists = self._hnsw.knn_query(vetor.reshape(1, -1), k=k)
+                return [(self._chave_por_rotulo[int(l)], float(1.0 - d))
+                        for l, d in zip(labels[0], dists[0]) if int(l) in self._chave_por_rotulo]
+            except RuntimeError:
+                pass  # grafo com muitos removidos: cai para a busca plana
+        scores = self._vetores[:n] @ vetor
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(self._chaves[i], float(scores[i])) for i in top]
+
+    # ─── HNSW opcional ────────────────────────────────────────────
+
+    def _construir_hnsw(self):
+        try:
+            import hnswlib
+        except ImportError:
+            return
+        n = len(self._chaves)
+        self._hnsw = hnswlib.Index(space="cosine", dim=self.dim)
+        self._hnsw.init_index(max_elements=max(2 * n, 1024), ef_construction=200, M=16)
+        self._rotulos = {}
+        self._chave_por_rotulo = {}
+        self._proximo_rotulo = 0
+        self._hnsw_adicionar(list(self._chaves), self._vetores[:n])
+
+    def _hnsw_adicionar(self, chaves: List[str], vetores: np.ndarray):
+        necessario = self._proximo_rotulo + len(chaves)
+        if necessario > self._hnsw.get_max_elements():
+            self._hnsw.resize_index(2 * necessario)
+        rotulos = np.arange(self._proximo_rotulo, necessario)
+        self._hnsw.add_items(vetores, rotulos)
+        for chave, rotulo in zip(chaves, rotulos):
+            self._rotulos[chave] = int(rotulo)
+            self._chave_por_rotulo[int(rotulo)] = chave
+        self._proximo_rotulo = necessario
+
+    # ─── Persistência ─────────────────────────────────────────────
+
+    def salvar(self, diretorio: str, meta: dict):
+        """Grava vetores (.npy), chaves e metadados (JSON) e o grafo HNSW se existir."""
+        os.makedirs(diretorio, exist_ok=True)
+        n = len(self._chaves)
+        tmp = os.path.join(diretorio, "vetores.tmp.npy")
+        np.save(tmp, self._vetores[:n])
+        os.replace(tmp, os.path.join(diretorio, "vetores.npy"))
+        dados = dict(meta, dim=self.dim, chaves=self._chaves)
+        if self._hnsw is not None:
+            self._hnsw.save_index(os.path.join(diretorio, "hnsw.bin"))
+            dados["rotulos"] = self._rotulos
+            dados["proximo_rotulo"] = self._proximo_rotulo
+        tmp = os.path.join(diretorio, "indice.tmp.json")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(dados, f, ensure_ascii=False)
+        os.replace(tmp, os.path.join(diretorio, "indice.json"))
+
+    @classmethod
+    def carregar(cls, diretorio: str, dim: int, meta: dict):
+        """Carrega o índice salvo; retorna None se não existir ou não bater com meta/dim."""
+        try:
+            with open(os.path.join(diretorio, "indice.json"), "r", encoding="utf-8") as f:
+                dados = json.load(f)
+            if dados.get("dim") != dim or any(dados.get(k) != v for k, v in meta.items()):
+                return None
+            vetores = np.load(os.path.join(diretorio, "vetores.npy"))
+            if len(vetores) != len(dados["chaves"]):
+                return None
+        except (OSError, ValueError, KeyError):
+            return None
+        indice = cls(dim)
+        indice._vetores = vetores.astype(np.float32)
+        indice._chaves = list(dados["chaves"])
+        indice._pos = {c: i for i, c in enumerate(indice._chaves)}
+        caminho_hnsw = os.path.join(diretorio, "hnsw.bin")
+        if "rotulos" in dados and os.path.exists(caminho_hnsw):
+            try:
+                import hnswlib
+                indice._hnsw = hnswlib.Index(space="cosine", dim=dim)
+                indice._hnsw.load_index(caminho_hnsw, max_elements=max(2 * len(vetores), 1024))
+                indice._rotulos = dados["rotulos"]
+                indice._chave_por_rotulo = {r: c for c, r in indice._rotulos.items()}
+                indice._proximo_rotulo = dados["proximo_rotulo"]
+            except Exception:
+                indice._hnsw = None
+                indice._rotulos = {}
+                indice._chave_por_rotulo = {}
+        return indice
+
+
+# ═══════════════════════════════════════════════════════════════════
+#  Memória semântica — notas e aprendizados
+# ═══════════════════════════════════════════════════════════════════
+
+class MemoriaSemantica:
+    """Mantém o índice vetorial de notas e aprendizados sincronizado com o MemoryStore."""
+
+    COLECOES = {
+        "notas": lambda r: f"{r.get('titulo', '')}. {r.get('conteudo', '')}",
+        "aprendizados": lambda r: f"{r.get('conteudo', '')} {r.get('fonte', '')}",
+    }
+    SALVAR_APOS = 20   # alterações antes de regravar o índice no disco
+
+    def __init__(self, store, diretorio: str, embedder=None):
+        self.store = store
+        self.diretorio = diretorio
+        self.embedder = embedder or criar_embedder()
+        self._meta = {"embedder": self.embedder.nome}
+        self._lock = threading.Lock()
+        self._alteracoes = 0
+
+        self.indice = IndiceVetorial.carregar(diretorio, self.embedder.dim, self._meta)
+        if self.indice is None:
+            self.indice = IndiceVetorial(self.embedder.dim)
+        # Ouvinte antes da sincronização: o que for gravado no meio também é embedado
+        store.ouvir(self._ao_alterar)
+        self._sincronizar()
+
+    def _existe(self, chave: str) -> bool:
+        colecao, rid = chave.split(":", 1)
+        return self.store.obter(colecao, int(rid)) is not None
+
+    def _sincronizar(self):
+        """
+        Embeda o que falta e remove vetores de registros que já não existem.
+        O ouvinte já está ativo: chaves que ele tocou no meio do caminho ficam como ele deixou.
+        """
+        atuais = {}
+        for colecao, texto in self.COLECOES.items():
+            for r in self.store.listar(colecao):
+                atuais[f"{colecao}:{r['id']}"] = texto(r)
+        with self._lock:
+            for chave in self.indice.chaves():
+                if chave not in atuais and not self._existe(chave):
+                    self.indice.remover(chave)
+            faltando = [c for c in atuais if c not in self.indice]
+        for i in range(0, len(faltando), 256):
+            lote = faltando[i:i + 256]
+            vetores = self.embedder.embed([atuais[c] for c in lote])
+            with self._lock:
+                manter = [c not in self.indice and self._existe(c) for c in lote]
+                if any(manter):
+                    self.indice.adicionar([c for c, m in zip(lote, manter) if m], vetores[np.array(manter)])
+        if faltando:
+            self.salvar()
+
+    def _ao_alterar(self, colecao: str, op: str, registro: dict):
+        if colecao not in self.COLECOES or op == "arquivar":
+            return
+        chave = f"{colecao}:{registro['id']}"
+        vetor = None
+        if op != "del":
+            completo = self.store.obter(colecao, registro["id"]) or registro
+            vetor = self.embedder.embed([self.COLECOES[colecao](completo)])
+        with self._lock:
+            if vetor is None:
+                self.indice.remover(chave)
+            else:
+                self.indice.adicionar([chave], vetor)
+            self._alteracoes += 1
+            if self._alteracoes >= self.SALVAR_APOS:
+                self._salvar()
+
+    def buscar(self, consulta: str, k: int = 5, minimo: float = 0.2) -> List[Tuple[str, dict, float]]:
+        """Retorna [(colecao, registro, similaridade)] mais relevantes para a consulta."""
+        if not normalizar(consulta).strip():
+            return []
+        vetor = self.embedder.embed([consulta])[0]
+        with self._lock:
+            vizinhos = self.indice.buscar(vetor, k)
+        resultados = []
+        for chave, score in vizinhos:
+            if score < minimo:
+                continue
+            colecao, rid = chave.split(":", 1)
+            registro = self.store.obter(colecao, int(rid))
+            if registro is not None:
+                resultados.append((colecao, registro, round(score, 3)))
+        return resultados
+
+    def salvar(self):
+        with self._lock:
+            self._salvar()
+
+    def _salvar(self):
+        try:
+            self.indice.salvar(self.diretorio, self._meta)
+            self._alteracoes = 0
+        except Exception as e:
+            print(f"[Memória] Erro ao salvar índice semântico: {e}")
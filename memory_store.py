@@ -0,0 +1,265 @@
+"""
+Memory Store — Armazenamento em memória do ADK Agent.
+Carrega conversas, notas, tarefas e aprendizados UMA vez, serve leituras
+direto da RAM e persiste alterações em segundo plano (write-behind) num
+diário append-only. De tempos em tempos o diário é compactado de volta
+nos arquivos JSON de snapshot.
+"""
+
+import os
+import json
+import atexit
+import threading
+
+
+class MemoryStore:
+    """Store único por processo com diário append-only e compactação periódica."""
+
+    FLUSH_INTERVAL = 1.0      # segundos entre gravações do diário
+    COMPACTAR_APOS = 500      # operações no diário antes de compactar
+    LIMITES = {"conversas": 200}
+    FOLGA = 50                # acima do limite, descarta em lotes (menos eventos de arquivamento)
+
+    def __init__(self, diretorio: str, arquivos: dict):
+        """
+        Args:
+            diretorio: Pasta da memória (ex: memoria/)
+            arquivos: {"notas": ".../notas.json", ...} — snapshots por coleção
+        """
+        self.diretorio = diretorio
+        self.arquivos = dict(arquivos)
+        self.diario_file = os.path.join(diretorio, "diario.jsonl")
+
+        self._lock = threading.RLock()
+        self._io_lock = threading.Lock()
+        self._dados = {nome: [] for nome in self.arquivos}
+        self._max_id = {nome: 0 for nome in self.arquivos}
+        self._por_id = {nome: {} for nome in self.arquivos}
+        self._pendentes = []
+        self._ops_no_diario = 0
+        self._ouvintes = []
+
+        self._carregar()
+
+        self._parar = threading.Event()
+        self._flusher = threading.Thread(target=self._loop_flush, name="MemoryStoreFlush", daemon=True)
+        self._flusher.start()
+        atexit.register(self.fechar)
+
+    # ─── Carga inicial ────────────────────────────────────────────
+
+    def _carregar(self):
+        """Carrega snapshots JSON e reaplica o diário por cima."""
+        for nome, caminho in self.arquivos.items():
+            registros = _carregar_json(caminho, [])
+            self._dados[nome] = registros
+            self._por_id[nome] = {r["id"]: r for r in registros if "id" in r}
+            self._max_id[nome] = max(self._por_id[nome], default=0)
+            for r in registros:
+                if "id" not in r:  # registros antigos (ex: conversas) não tinham id
+                    self._max_id[nome] += 1
+                    r["id"] = self._max_id[nome]
+                    self._por_id[nome][r["id"]] = r
+
+        if not os.path.exists(self.diario_file):
+            return
+        try:
+            with open(self.diario_file, "r", encoding="utf-8") as f:
+                for linha in f:
+                    try:
+                        op = json.loads(linha)
+                    except ValueError:
+                        continue  # linha truncada por desligamento abrupto
+                    self._aplicar(op["c"], op["op"], op["r"])
+                    self._ops_no_diario += 1
+        except Exception as e:
+            print(f"[Memória] Erro ao ler diário: {e}")
+        # Sem aparar aqui: ainda não há ouvintes para arquivar o excedente; a
+        # próxima inserção apara (com a FOLGA) e notifica "arquivar" normalmente
+
+    def _aplicar(self, colecao: str, op: str, registro: dict):
+        """Aplica uma operação à coleção em memória (idempotente por id)."""
+        registros = self._dados.setdefault(colecao, [])
+        por_id = self._por_id.setdefault(colecao, {})
+        rid = registro.get("id")
+        if op == "add":
+            if rid is not None and rid <= self._max_id.get(colecao, 0):
+                if rid in por_id:
+                    for i, r in enumerate(registros):
+                        if r.get("id") == rid:
+                            registros[i] = por_id[rid] = registro
+                return  # se não existe: já removido ou descartado pelo limite
+            registros.append(registro)
+            if rid is not None:
+                por_id[rid] = registro
+                self._max_id[colecao] = max(self._max_id.get(colecao, 0), rid)
+        elif op == "upd":
+            alvo = por_id.get(rid)
+            if alvo is not None:
+                alvo.update(registro)
+        elif op == "del":
+            if por_id.pop(rid, None) is not None:
+                self._dados[colecao] = [r for r in registros if r.get("id") != rid]
+        elif op == "arquivar":
+            # Saíram da RAM pelo limite até este id (já entregues aos ouvintes de "arquivar")
+            manter = [r for r in registros if r.get("id", 0) > rid]
+            for r in registros[:len(registros) - len(manter)]:
+                por_id.pop(r.get("id"), None)
+            self._dados[colecao] = manter
+
+    def _aparar(self, colecao: str, folga: int = None) -> list:
+        """Descarta os registros mais antigos quando a coleção passa do limite + folga."""
+        limite = self.LIMITES.get(colecao)
+        registros = self._dados.get(colecao, [])
+        folga = self.FOLGA if folga is None else folga
+        if not limite or len(registros) <= limite + folga:
+            return []
+        descartados = registros[:-limite]
+        del registros[:-limite]
+        por_id = self._por_id.get(colecao, {})
+        for r in descartados:
+            por_id.pop(r.get("id"), None)
+        return descartados
+
+    # ─── API pública ──────────────────────────────────────────────
+
+    def adicionar(self, colecao: str, registro: dict) -> dict:
+        """Adiciona registro com id sequencial e agenda persistência."""
+        with self._lock:
+            registro = {"id": self._max_id.get(colecao, 0) + 1, **registro}
+            self._aplicar(colecao, "add", registro)
+            descartados = self._aparar(colecao)
+            self._pendentes.append({"c": colecao, "op": "add", "r": dict(registro)})
+            if descartados:
+                # No diário também: sem isso o replay traria de volta o que já foi arquivado
+                self._pendentes.append({"c": colecao, "op": "arquivar", "r": {"id": descartados[-1]["id"]}})
+        self._notificar(colecao, "add", registro)
+        if descartados:
+            # Registros que saíram da RAM por limite (não foram apagados pelo usuário)
+            self._notificar(colecao, "arquivar", descartados)
+        return registro
+
+    def atualizar(self, colecao: str, registro_id: int, campos: dict) -> bool:
+        """Atualiza campos de um registro existente."""
+        with self._lock:
+            alvo = self._por_id.get(colecao, {}).get(registro_id)
+            if alvo is None:
+                return False
+            alvo.update(campos)
+            self._pendentes.append({"c": colecao, "op": "upd", "r": dict(campos, id=registro_id)})
+            registro = dict(alvo)
+        self._notificar(colecao, "upd", registro)
+        return True
+
+    def remover(self, colecao: str, registro_id: int) -> bool:
+        """Remove um registro pelo id."""
+        with self._lock:
+            removido = registro_id in self._por_id.get(colecao, {})
+            if removido:
+                self._aplicar(colecao, "del", {"id": registro_id})
+                self._pendentes.append({"c": colecao, "op": "del", "r": {"id": registro_id}})
+        if removido:
+            self._notificar(colecao, "del", {"id": registro_id})
+        return removido
+
+    def listar(self, colecao: str, ultimos: int = None) -> list:
+        """Retorna cópia rasa da coleção (ou dos últimos N registros)."""
+        with self._lock:
+            registros = self._dados.get(colecao, [])
+            if ultimos is not None:
+                registros = registros[-ultimos:] if ultimos > 0 else []
+            return list(registros)
+
+    def obter(self, colecao: str, registro_id: int):
+        """Retorna o registro pelo id (O(1)) ou None."""
+        with self._lock:
+            return self._por_id.get(colecao, {}).get(registro_id)
+
+    def ouvir(self, callback):
+        """
+        Registra callback(colecao, op, registro) chamado a cada alteração.
+        op: "add", "upd", "del" ou "arquivar" (registro é a lista descartada pelo limite).
+        """
+        self._ouvintes.append(callback)
+
+    def _notificar(self, colecao: str, op: str, registro: dict):
+        for callback in list(self._ouvintes):
+            try:
+                callback(colecao, op, registro)
+            except Exception as e:
+                print(f"[Memória] Erro em ouvinte: {e}")
+
+    # ─── Persistência write-behind ────────────────────────────────
+
+    def _loop_flush(self):
+        while not self._parar.wait(self.FLUSH_INTERVAL):
+            self.flush()
+
+    def flush(self):
+        """Grava operações pendentes no diário e compacta se necessário."""
+        with self._io_lock:
+            with self._lock:
+                pendentes, self._pendentes = self._pendentes, []
+            if pendentes:
+                try:
+                    os.makedirs(self.diretorio, exist_ok=True)
+                    with open(self.diario_file, "a", encoding="utf-8") as f:
+                        f.write("".join(json.dumps(op, ensure_ascii=False) + "\n" for op in pendentes))
+                    self._ops_no_diario += len(pendentes)
+                except Exception as e:
+                    print(f"[Memória] Erro ao gravar diário: {e}")
+                    with self._lock:
+                        self._pendentes[:0] = pendentes
+                    return
+            if self._ops_no_diario >= self.COMPACTAR_APOS:
+                self._compactar()
+
+    def compactar(self):
+        """Reescreve os snapshots JSON e zera o diário."""
+        with self._io_lock:
+            self._compactar()
+
+    def _compactar(self):
+        with self._lock:
+            # O snapshot já contém as operações pendentes, que podem ser descartadas.
+            snapshot = {nome: [dict(r) for r in regs] for nome, regs in self._dados.items()}
+            self._pendentes = []
+        for nome, caminho in self.arquivos.items():
+            _salvar_json_atomico(caminho, snapshot.get(nome, []))
+        try:
+            # Se cair antes daqui, o replay do diário antigo é idempotente por id.
+            with open(self.diario_file, "w", encoding="utf-8"):
+                pass
+            self._ops_no_diario = 0
+        except Exception as e:
+            print(f"[Memória] Erro ao compactar diário: {e}")
+
+    def fechar(self):
+        """Para o flusher e grava tudo que estiver pendente."""
+        self._parar.set()
+        self.flush()
+
+
+def _carregar_json(filepath: str, default=None):
+    """Carrega um arquivo JSON."""
+    if default is None:
+        default = []
+    try:
+        if os.path.exists(filepath):
+            with open(filepath, "r", encoding="utf-8") as f:
+                return json.load(f)
+    except Exception as e:
+        print(f"[Memória] Erro ao carregar {filepath}: {e}")
+    return default
+
+
+def _salvar_json_atomico(filepath: str, data):
+    """Salva JSON via arquivo temporário + rename (nunca deixa snapshot pela metade)."""
+    try:
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        tmp = filepath + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, filepath)
+    except Exception as e:
+        print(f"[Memória] Erro ao salvar {filepath}: {e}")
@@ -0,0 +1,91 @@
+"""
+OCR Cache — Cache de resultados de OCR por conteúdo da tela.
+A chave é um hash dos pixels da região capturada (por tiles), então a mesma
+tela devolve o resultado na hora, e qualquer pixel alterado invalida.
+LRU com TTL curto para não servir texto velho.
+"""
+
+import time
+import hashlib
+import threading
+import numpy as np
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+
+def hash_tiles(img: np.ndarray, tile: int = 64) -> np.ndarray:
+    """
+    Hash de 64 bits de cada tile (tile x tile pixels) da imagem.
+    Retorna matriz (linhas_de_tiles, colunas_de_tiles) de uint64 — qualquer
+    pixel alterado muda o hash do seu tile.
+    """
+    h, w = img.shape[:2]
+    canais = img.shape[2] if img.ndim == 3 else 1
+    th, tw = -(-h // tile), -(-w // tile)
+    if th * tile != h or tw * tile != w:
+        pad = [(0, th * tile - h), (0, tw * tile - w)] + [(0, 0)] * (img.ndim - 2)
+        img = np.pad(img, pad)
+    faixas = np.ascontiguousarray(img).reshape(th, tile, tw, tile * canais)
+    hashes = np.empty((th, tw), dtype=np.uint64)
+    for i in range(th):
+        faixa = faixas[i]
+        for j in range(tw):
+            digest = hashlib.blake2b(faixa[:, j].tobytes(), digest_size=8).digest()
+            hashes[i, j] = int.from_bytes(digest, "little")
+    return hashes
+
+
+def assinatura(img: np.ndarray) -> str:
+    """Assinatura da imagem inteira (forma + hash de todos os tiles)."""
+    digest = hashlib.blake2b(hash_tiles(img).tobytes(), digest_size=16)
+    digest.update(str(img.shape).encode())
+    return digest.hexdigest()
+
+
+class CacheOCR:
+    """Cache LRU + TTL de resultados de OCR."""
+
+    def __init__(self, max_itens: int = 32, ttl: float = 10.0):
+        self.max_itens = max_itens
+        self.ttl = ttl
+        self._itens = OrderedDict()   # chave -> (instante, resultado)
+        self._lock = threading.Lock()
+        self.acertos = 0
+        self.falhas = 0
+
+    @staticmethod
+    def chave(img: np.ndarray, regiao: Optional[Tuple[int, int, int, int]], idiomas) -> tuple:
+        return (assinatura(img), tuple(regiao) if regiao else None, tuple(idiomas or ()))
+
+    def obter(self, chave: tuple):
+        """Resultado em cache (ou None se ausente/expirado)."""
+        with self._lock:
+            item = self._itens.get(chave)
+            if item is None or time.monotonic() - item[0] > self.ttl:
+                if item is not None:
+                    del self._itens[chave]
+                self.falhas += 1
+                return None
+            self._itens.move_to_end(chave)
+            self.acertos += 1
+            return item[1]
+
+    def guardar(self, chave: tuple, resultado: dict):
+        with self._lock:
+            self._itens[chave] = (time.monotonic(), resultado)
+            self._itens.move_to_end(chave)
+            while len(self._itens) > self.max_itens:
+                self._itens.popitem(last=False)
+
+    def limpar(self):
+        with self._lock:
+            self._itens.clear()
+
+    def estatisticas(self) -> dict:
+        total = self.acertos + self.falhas
+        return {
+            "itens": len(self._itens),
+            "acertos": self.acertos,
+            "falhas": self.falhas,
+            "taxa_acerto": round(self.acertos / total, 3) if total else 0.0,
+        }
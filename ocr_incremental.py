@@ -0,0 +1,141 @@
+"""
+OCR Incremental — Relê só as partes da tela que mudaram.
+Divide o frame em tiles, compara com a captura anterior (NumPy), agrupa os
+tiles alterados em retângulos e roda o OCR apenas neles. O resultado é
+mesclado num modelo persistente do texto da tela: textos de áreas que não
+mudaram mantêm coordenadas (e ids) estáveis.
+"""
+
+import threading
+import numpy as np
+import cv2
+from collections import OrderedDict
+from typing import Callable, Dict, List, Tuple
+
+Caixa = Tuple[int, int, int, int]   # x1, y1, x2, y2
+
+
+def tiles_alterados(anterior: np.ndarray, atual: np.ndarray, tile: int) -> np.ndarray:
+    """Máscara booleana (linhas_de_tiles, colunas_de_tiles) dos tiles com algum pixel diferente."""
+    diff = anterior != atual
+    if diff.ndim == 3:
+        diff = diff.any(axis=2)
+    h, w = diff.shape
+    th, tw = -(-h // tile), -(-w // tile)
+    if th * tile != h or tw * tile != w:
+        diff = np.pad(diff, ((0, th * tile - h), (0, tw * tile - w)))
+    return diff.reshape(th, tile, tw, tile).any(axis=(1, 3))
+
+
+def _intersecta(a: Caixa, b: Caixa) -> bool:
+    return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
+
+
+class _ModeloTela:
+    """Estado de uma região: último frame e textos conhecidos."""
+
+    def __init__(self):
+        self.frame = None
+        self.textos = {}        # id -> {"texto", "confianca", "bbox"}
+        self.proximo_id = 1
+        self.lock = threading.Lock()
+
+
+class OCRIncremental:
+    """Motor de OCR incremental por tiles, com um modelo por (região, idiomas)."""
+
+    TILE = 64
+    MARGEM = 8                # pixels extras em volta de cada retângulo sujo
+    LIMIAR_TELA_CHEIA = 0.5   # acima dessa fração de tiles sujos, relê tudo
+    MAX_MODELOS = 4
+
+    def __init__(self):
+        self._modelos = OrderedDict()
+        self._lock = threading.Lock()
+        self.ultima_atualizacao = {}
+
+    def ler(self, chave, img: np.ndarray, ler_fn: Callable[[np.ndarray], list]) -> List[Dict]:
+        """
+        Atualiza o modelo da chave com o frame e devolve todos os textos.
+
+        Args:
+            chave: identifica a região/idiomas (frames de chaves diferentes não se misturam)
+            img: frame atual (BGR)
+            ler_fn: função OCR no formato do EasyOCR — ler_fn(img) -> [(pontos, texto, confiança)]
+
+        Returns:
+            [{"id", "texto", "confianca", "bbox": [x1, y1, x2, y2]}] em coordenadas do frame
+        """
+        with self._lock:
+            modelo = self._modelos.pop(chave, None) or _ModeloTela()
+            self._modelos[chave] = modelo
+            while len(self._modelos) > self.MAX_MODELOS:
+                self._modelos.popitem(last=False)
+
+        with modelo.lock:
+            return self._atualizar(chave, modelo, img, ler_fn)
+
+    def _atualizar(self, chave, modelo: _ModeloTela, img: np.ndarray, ler_fn) -> List[Dict]:
+        h, w = img.shape[:2]
+        if modelo.frame is None or modelo.frame.shape != img.shape:
+            sujos = [(0, 0, w, h)]
+        else:
+            mascara = tiles_alterados(modelo.frame, img, self.TILE)
+            if not mascara.any():
+                sujos = []
+            elif mascara.mean() > self.LIMIAR_TELA_CHEIA:
+                sujos = [(0, 0, w, h)]
+            else:
+                sujos = self._retangulos(mascara, w, h, modelo)
+
+        for caixa in sujos:
+            self._reler(modelo, img, caixa, ler_fn)
+        modelo.frame = img.copy()
+        self.ultima_atualizacao[chave] = {
+            "retangulos_relidos": len(sujos),
+            "area_relida": round(float(sum((c[2] - c[0]) * (c[3] - c[1]) for c in sujos)) / (w * h), 3),
+        }
+        return [dict(t, id=i) for i, t in sorted(modelo.textos.items(), key=lambda x: (x[1]["bbox"][1], x[1]["bbox"][0]))]
+
+    def _retangulos(self, mascara: np.ndarray, w: int, h: int, modelo: _ModeloTela) -> List[Caixa]:
+        """Agrupa tiles sujos vizinhos em retângulos e os estende até cobrir textos cortados."""
+        # Dilata 1 tile para juntar textos que atravessam a borda entre tiles
+        dilatada = cv2.dilate(mascara.astype(np.uint8), np.ones((3, 3), np.uint8))
+        n, _, stats, _ = cv2.connectedComponentsWithStats(dilatada, connectivity=8)
+        caixas = []
+        for i in range(1, n):
+            tx, ty, tw, th = (int(v) for v in stats[i, :4])
+            caixas.append((
+                max(0, tx * self.TILE - self.MARGEM),
+                max(0, ty * self.TILE - self.MARGEM),
+                min(w, (tx + tw) * self.TILE + self.MARGEM),
+                min(h, (ty + th) * self.TILE + self.MARGEM),
+            ))
+        # Um texto conhecido que encosta no retângulo precisa ser relido inteiro
+        expandidas = []
+        for caixa in caixas:
+            x1, y1, x2, y2 = caixa
+            for t in modelo.textos.values():
+                if _intersecta(caixa, t["bbox"]):
+                    bx1, by1, bx2, by2 = t["bbox"]
+                    x1, y1, x2, y2 = min(x1, bx1), min(y1, by1), max(x2, bx2), max(y2, by2)
+            expandidas.append((x1, y1, x2, y2))
+        return expandidas
+
+    def _reler(self, modelo: _ModeloTela, img: np.ndarray, caixa: Caixa, ler_fn):
+        x1, y1, x2, y2 = caixa
+        for tid in [i for i, t in modelo.textos.items() if _intersecta(caixa, t["bbox"])]:
+            del modelo.textos[tid]
+        for pontos, texto, confianca in ler_fn(img[y1:y2, x1:x2]):
+            xs = [p[0] for p in pontos]
+            ys = [p[1] for p in pontos]
+            modelo.textos[modelo.proximo_id] = {
+                "texto": texto,
+                "confianca": float(confianca),
+                "bbox": [int(min(xs)) + x1, int(min(ys)) + y1, int(max(xs)) + x1, int(max(ys)) + y1],
+            }
+            modelo.proximo_id += 1
+
+    def limpar(self):
+        with self._lock:
+            self._modelos.clear()
@@ -0,0 +1,122 @@
+"""
+OCR Index — Índice de busca sobre os textos detectados pelo OCR.
+Os textos são normalizados (sem acentos, minúsculas) e indexados por
+trigramas; a busca tolera erros de OCR por distância de edição e devolve
+todas as ocorrências ordenadas por similaridade, confiança e proximidade.
+Um índice atende várias consultas sobre a mesma passada de OCR.
+"""
+
+import math
+import unicodedata
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Tuple
+
+
+def dobrar(texto: str, minusculas: bool = True) -> str:
+    """Remove acentos e espaços repetidos ('  Ação ' → 'acao')."""
+    if minusculas:
+        texto = texto.lower()
+    decomposto = unicodedata.normalize("NFKD", texto)
+    return " ".join("".join(c for c in decomposto if not unicodedata.combining(c)).split())
+
+
+def _trigramas(texto: str) -> set:
+    return {texto[i:i + 3] for i in range(len(texto) - 2)}
+
+
+def distancia_substring(padrao: str, texto: str, maximo: int) -> Optional[int]:
+    """
+    Menor distância de edição entre o padrão e qualquer trecho do texto
+    (o padrão pode começar em qualquer posição). None se passar de `maximo`.
+    """
+    m = len(padrao)
+    if m == 0:
+        return 0
+    anterior = list(range(m + 1))
+    melhor = anterior[m]
+    for c in texto:
+        atual = [0]
+        for i in range(1, m + 1):
+            custo = 0 if padrao[i - 1] == c else 1
+            atual.append(min(anterior[i] + 1, atual[i - 1] + 1, anterior[i - 1] + custo))
+        melhor = min(melhor, atual[m])
+        anterior = atual
+    return melhor if melhor <= maximo else None
+
+
+class IndiceOCR:
+    """Índice por trigramas de uma lista de textos do OCR (formato de detectar_texto_tela)."""
+
+    def __init__(self, textos: List[Dict]):
+        self.textos = textos
+        self._dobrados = [dobrar(t.get("texto", "")) for t in textos]
+        self._trigramas = defaultdict(list)   # trigrama -> [índice do texto]
+        for i, d in enumerate(self._dobrados):
+            for tri in _trigramas(d):
+                self._trigramas[tri].append(i)
+
+    @staticmethod
+    def erros_padrao(consulta: str) -> int:
+        """Erros de OCR tolerados por padrão: nenhum até 4 letras, depois ~1 a cada 4."""
+        return 0 if len(consulta) <= 4 else len(consulta) // 4
+
+    def _candidatos(self, consulta: str, max_erros: int) -> List[int]:
+        """Textos que podem conter a consulta com até max_erros (lema dos q-gramas)."""
+        # Conta trigramas distintos dos dois lados ("10000", "banana" repetem trigramas);
+        # cada erro destrói no máximo 3 deles
+        trigramas = _trigramas(consulta)
+        necessarios = len(trigramas) - 3 * max_erros
+        if necessarios <= 0:
+            return list(range(len(self.textos)))
+        contagem = Counter()
+        for tri in trigramas:
+            contagem.update(self._trigramas.get(tri, ()))
+        return [i for i, n in contagem.items() if n >= necessarios]
+
+    def buscar(self, consulta: str, max_erros: int = None, case_sensitive: bool = False,
+               perto: Tuple[int, int] = None, limite: int = None) -> List[Dict]:
+        """
+        Todas as ocorrências da consulta, da melhor para a pior.
+
+        Args:
+            consulta: texto procurado (trecho de um texto detectado)
+            max_erros: distância de edição máxima (padrão: erros_padrao; 0 se case_sensitive)
+            case_sensitive: exige maiúsculas/minúsculas iguais ao procurado
+            perto: (x, y) — favorece ocorrências mais próximas desse ponto
+            limite: máximo de ocorrências
+
+        Returns:
+            [{**texto_detectado, "similaridade", "erros", "score"}]
+        """
+        alvo = dobrar(consulta)
+        if not alvo:
+            return []
+        if max_erros is None:
+            max_erros = 0 if case_sensitive else self.erros_padrao(alvo)
+        alvo_exato = dobrar(consulta, minusculas=False) if case_sensitive else None
+
+        ocorrencias = []
+        for i in self._candidatos(alvo, max_erros):
+            item = self.textos[i]
+            if alvo_exato is not None:
+                erros = distancia_substring(alvo_exato, dobrar(item.get("texto", ""), minusculas=False), max_erros)
+            else:
+                erros = 0 if alvo in self._dobrados[i] else distancia_substring(alvo, self._dobrados[i], max_erros)
+            if erros is None:
+                continue
+            similaridade = 1.0 - erros / len(alvo)
+            cobertura = min(1.0, len(alvo) / max(1, len(self._dobrados[i])))
+            score = 0.6 * similaridade + 0.25 * float(item.get("confianca", 0.0)) + 0.15 * cobertura
+            distancia = 0.0
+            if perto and item.get("centro"):
+                distancia = math.hypot(item["centro"][0] - perto[0], item["centro"][1] - perto[1])
+                score *= 1.0 / (1.0 + distancia / 2000.0)
+            ocorrencias.append((-round(score, 4), distancia, dict(
+                item, similaridade=round(similaridade, 2), erros=erros, score=round(score, 3)
+            )))
+        ocorrencias.sort(key=lambda o: (o[0], o[1]))
+        return [o[2] for o in ocorrencias[:limite]]
+
+    def buscar_varios(self, consultas: List[str], **opcoes) -> Dict[str, List[Dict]]:
+        """Responde várias consultas com o mesmo índice."""
+        return {c: self.buscar(c, **opcoes) for c in consultas}
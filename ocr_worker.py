@@ -0,0 +1,199 @@
+"""
+OCR Worker — Processo dedicado para o EasyOCR.
+Cada conjunto de idiomas tem um processo próprio que carrega o modelo uma
+vez e fica quente. Os frames vão por memória compartilhada (sem pickle dos
+pixels) e pedidos que chegam juntos são processados em lote, mantendo o
+OCR fora do GIL do loop de eventos do agente.
+"""
+
+import atexit
+import itertools
+import queue
+import threading
+import multiprocessing as mp
+from multiprocessing import shared_memory
+
+import numpy as np
+
+
+# ═══════════════════════════════════════════════════════════════════
+#  Lado do worker (roda no processo filho)
+# ═══════════════════════════════════════════════════════════════════
+
+def _para_lista(resultados) -> list:
+    """Resultado do EasyOCR em tipos simples (atravessa a fila sem numpy)."""
+    return [
+        ([[float(p[0]), float(p[1])] for p in pontos], str(texto), float(confianca))
+        for pontos, texto, confianca in resultados
+    ]
+
+
+def _loop_worker(idiomas, pedidos, respostas, max_lote):
+    try:
+        import easyocr
+        reader = easyocr.Reader(list(idiomas), gpu=False, verbose=False)
+        erro_carga = None
+    except Exception as e:
+        reader = None
+        erro_carga = f"EasyOCR não disponível ({e}). Instale: pip install easyocr"
+
+    while True:
+        pedido = pedidos.get()
+        if pedido is None:
+            break
+        # Junta o que já estiver na fila num lote só
+        lote = [pedido]
+        while len(lote) < max_lote:
+            try:
+                pedido = pedidos.get_nowait()
+            except queue.Empty:
+                break
+            if pedido is None:
+                pedidos.put(None)
+                break
+            lote.append(pedido)
+
+        if reader is None:
+            for pedido in lote:
+                respostas.put((pedido[0], None, erro_carga))
+            continue
+        # Frames do mesmo tamanho vão juntos para o readtext_batched
+        por_forma = {}
+        for pedido in lote:
+            por_forma.setdefault((tuple(pedido[2]), pedido[3]), []).append(pedido)
+        for grupo in por_forma.values():
+            _processar_grupo(reader, grupo, respostas)
+
+
+def _processar_grupo(reader, grupo, respostas):
+    memorias, imagens = [], []
+    try:
+        for pedido_id, nome_shm, forma, dtype in grupo:
+            shm = shared_memory.SharedMemory(name=nome_shm)
+            memorias.append(shm)
+            imagens.append(np.ndarray(forma, dtype=dtype, buffer=shm.buf))
+        if len(imagens) > 1:
+            lotes = reader.readtext_batched(imagens)
+        else:
+            lotes = [reader.readtext(imagens[0])]
+        for pedido, resultados in zip(grupo, lotes):
+            respostas.put((pedido[0], _para_lista(resultados), None))
+    except Exception as e:
+        for pedido in grupo:
+            respostas.put((pedido[0], None, str(e)))
+    finally:
+        del imagens
+        for shm in memorias:
+            shm.close()
+
+
+# ═══════════════════════════════════════════════════════════════════
+#  Lado do agente
+# ═══════════════════════════════════════════════════════════════════
+
+class _Worker:
+    """Um processo de OCR (um conjunto de idiomas) e seus pedidos pendentes."""
+
+    def __init__(self, ctx, idiomas: tuple, max_lote: int):
+        self.pedidos = ctx.Queue()
+        self.respostas = ctx.Queue()
+        self.processo = ctx.Process(
+            target=_loop_worker, args=(idiomas, self.pedidos, self.respostas, max_lote),
+            name=f"ocr-{'-'.join(idiomas)}", daemon=True,
+        )
+        self.processo.start()
+        self.pendentes = {}   # pedido_id -> [Event, resultado, erro]
+        self.lock = threading.Lock()
+        threading.Thread(target=self._receber, daemon=True).start()
+
+    def _receber(self):
+        while True:
+            try:
+                pedido_id, resultado, erro = self.respostas.get()
+            except (EOFError, OSError):
+                break
+            with self.lock:
+                espera = self.pendentes.pop(pedido_id, None)
+            if espera is not None:
+                espera[1], espera[2] = resultado, erro
+                espera[0].set()
+
+    def falhar_pendentes(self, erro: str):
+        with self.lock:
+            pendentes, self.pendentes = self.pendentes, {}
+        for espera in pendentes.values():
+            espera[2] = erro
+            espera[0].set()
+
+
+class ServicoOCR:
+    """Processos de OCR quentes, um por conjunto de idiomas."""
+
+    MAX_LOTE = 8
+    TIMEOUT = 120.0   # inclui o download/carga do modelo na primeira chamada
+
+    def __init__(self):
+        self._ctx = mp.get_context("spawn")
+        self._workers = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        atexit.register(self.encerrar)
+
+    def _worker(self, idiomas: tuple) -> _Worker:
+        with self._lock:
+            worker = self._workers.get(idiomas)
+            if worker is None or not worker.processo.is_alive():
+                worker = _Worker(self._ctx, idiomas, self.MAX_LOTE)
+                self._workers[idiomas] = worker
+            return worker
+
+    def ler(self, img: np.ndarray, idiomas) -> list:
+        """
+        OCR de um frame no processo do conjunto de idiomas.
+        Retorna no formato do EasyOCR: [(pontos, texto, confiança)].
+        """
+        idiomas = tuple(idiomas)
+        worker = self._worker(idiomas)
+        img = np.ascontiguousarray(img)
+        shm = shared_memory.SharedMemory(create=True, size=max(1, img.nbytes))
+        try:
+            np.ndarray(img.shape, dtype=img.dtype, buffer=shm.buf)[...] = img
+            pedido_id = next(self._ids)
+            espera = [threading.Event(), None, None]
+            with worker.lock:
+                worker.pendentes[pedido_id] = espera
+            worker.pedidos.put((pedido_id, shm.name, img.shape, img.dtype.str))
+
+            # Espera em fatias para perceber se o processo morreu
+            prazo = self.TIMEOUT
+            while not espera[0].wait(1.0):
+                prazo -= 1.0
+                if not worker.processo.is_alive():
+                    worker.falhar_pendentes("processo de OCR encerrou inesperadamente")
+                elif prazo <= 0:
+                    with worker.lock:
+                        worker.pendentes.pop(pedido_id, None)
+                    raise TimeoutError("OCR não respondeu a tempo")
+            if espera[2]:
+                raise RuntimeError(espera[2])
+            return espera[1]
+        finally:
+            shm.close()
+            shm.unlink()
+
+    def leitor(self, idiomas):
+        """Função ler_fn(img) presa a um conjunto de idiomas (para o OCR incremental)."""
+        return lambda img: self.ler(img, idiomas)
+
+    def encerrar(self):
+        with self._lock:
+            workers, self._workers = list(self._workers.values()), {}
+        for worker in workers:
+            try:
+                worker.pedidos.put(None)
+                worker.processo.join(timeout=2)
+                if worker.processo.is_alive():
+                    worker.processo.terminate()
+            except Exception as e:
+                print(f"[OCRWorker] Erro ao encerrar worker: {e}")
+            worker.falhar_pendentes("serviço de OCR encerrado")
@@ -0,0 +1,264 @@
+"""
+Process Runner — Execução de comandos com saída em fluxo.
+Cada comando vira um ProcessoComando: threads leem stdout/stderr em blocos
+(sem esperar o processo terminar) para um buffer circular de linhas, então a
+memória fica limitada mesmo com saídas enormes e o agente pode acompanhar o
+andamento (reportar_progresso) ou consultar depois. Comandos longos seguem
+em segundo plano no GerenciadorProcessos, com id para consulta e cancelamento.
+"""
+
+import time
+import atexit
+import codecs
+import locale
+import itertools
+import threading
+import subprocess
+from collections import deque
+from typing import Dict, List, Optional
+
+import psutil
+
+MAX_LINHAS = 2000              # por processo (as mais antigas são descartadas)
+MAX_LINHA = 4000               # caracteres por linha (barras de progresso sem \n)
+MAX_CONCLUIDOS = 20            # processos terminados mantidos para consulta
+ENCODING = locale.getpreferredencoding(False)   # o mesmo do text=True do subprocess
+
+
+class BufferSaida:
+    """Buffer circular de linhas numeradas (stdout e stderr intercalados)."""
+
+    def __init__(self, max_linhas: int = MAX_LINHAS):
+        self._linhas = deque(maxlen=max_linhas)   # (numero, fluxo, texto)
+        self._proximo = 0
+        self._lock = threading.Lock()
+
+    def adicionar(self, fluxo: str, texto: str):
+        with self._lock:
+            self._linhas.append((self._proximo, fluxo, texto[:MAX_LINHA]))
+            self._proximo += 1
+
+    @property
+    def total(self) -> int:
+        """Linhas recebidas desde o início (incluindo as já descartadas)."""
+        return self._proximo
+
+    def desde(self, numero: int = 0) -> List[tuple]:
+        with self._lock:
+            return [l for l in self._linhas if l[0] >= numero]
+
+    def descartadas(self) -> int:
+        with self._lock:
+            return self._linhas[0][0] if self._linhas else self._proximo
+
+    def texto(self, fluxo: str, max_chars: int, desde: int = 0) -> str:
+        """Final do fluxo ("stdout"/"stderr") a partir da linha informada, em até max_chars."""
+        partes, total = [], 0
+        for _, f, linha in reversed(self.desde(desde)):
+            if f != fluxo:
+                continue
+            total += len(linha) + 1
+            if total > max_chars:
+                if not partes:
+                    partes.append(linha[-max_chars:])
+                break
+            partes.append(linha)
+        return "\n".join(reversed(partes))
+
+
+def matar_arvore(proc: subprocess.Popen):
+    """Mata o processo e os filhos (com shell=True o comando roda num filho do shell)."""
+    try:
+        for filho in psutil.Process(proc.pid).children(recursive=True):
+            filho.kill()
+    except psutil.Error:
+        pass
+    try:
+        proc.kill()
+    except OSError:
+        pass
+    proc.wait()
+
+
+class ProcessoComando:
+    """Um comando rodando (ou terminado), com a saída no buffer circular."""
+
+    def __init__(self, id_processo: int, comando: str, diretorio: str = None, env: Dict = None,
+                 proc: subprocess.Popen = None):
+        """
+        Args:
+            proc: processo já iniciado (stdout/stderr em PIPE) para acompanhar em vez de
+                  rodar o comando — o comando fica só como descrição
+        """
+        self.id = id_processo
+        self.comando = comando
+        self.diretorio = diretorio
+        self.saida = BufferSaida()
+        self.iniciado = time.time()
+        self.terminado: Optional[float] = None
+        self.cancelado = False
+        self.cursor = 0   # próxima linha ainda não entregue em consultar()
+        self.proc = proc or subprocess.Popen(
+            comando,
+            shell=True,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            cwd=diretorio,
+            env=env,
+        )
+        self._leitores = [
+            threading.Thread(target=self._ler, args=(self.proc.stdout, "stdout"),
+                             name=f"cmd{id_processo}-stdout", daemon=True),
+            threading.Thread(target=self._ler, args=(self.proc.stderr, "stderr"),
+                             name=f"cmd{id_processo}-stderr", daemon=True),
+        ]
+        for leitor in self._leitores:
+            leitor.start()
+
+    def _ler(self, pipe, fluxo: str):
+        # Lê o que já chegou (read1), sem esperar a linha ou o processo terminar
+        decodificador = codecs.getincrementaldecoder(ENCODING)(errors="replace")
+        pendente = ""
+        try:
+            while True:
+                bloco = pipe.read1(65536)
+                if not bloco:
+                    break
+                pendente += decodificador.decode(bloco)
+                # \r também quebra linha (barras de progresso reescrevem a mesma linha)
+                linhas = pendente.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+                pendente = linhas.pop()
+                for linha in linhas:
+                    self.saida.adicionar(fluxo, linha)
+                if len(pendente) > MAX_LINHA:
+                    self.saida.adicionar(fluxo, pendente)
+                    pendente = ""
+            pendente += decodificador.decode(b"", final=True)
+            if pendente:
+                self.saida.adicionar(fluxo, pendente)
+        except (OSError, ValueError):
+            pass
+        finally:
+            pipe.close()
+
+    @property
+    def codigo(self) -> Optional[int]:
+        return self.proc.poll()
+
+    @property
+    def rodando(self) -> bool:
+        return self.proc.poll() is None
+
+    def esperar(self, timeout: float = None) -> bool:
+        """Espera o processo e a leitura da saída terminarem; True se terminou."""
+        try:
+            self.proc.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            return False
+        for leitor in self._leitores:
+            leitor.join(timeout=2)
+        if self.terminado is None:
+            self.terminado = time.time()
+        return True
+
+    def cancelar(self):
+        if self.rodando:
+            self.cancelado = True
+            matar_arvore(self.proc)
+        self.esperar(timeout=5)
+
+    def resultado(self, max_saida: int = 5000, max_erro: int = 2000, desde: int = 0) -> Dict:
+        """Resultado no formato das skills (saída e erro são o final de cada fluxo)."""
+        codigo = self.codigo
+        resultado = {
+            "sucesso": codigo == 0,
+            "saida": self.saida.texto("stdout", max_saida, desde),
+            "erro": self.saida.texto("stderr", max_erro, desde),
+            "codigo": codigo if codigo is not None else -1,
+        }
+        if self.saida.descartadas() > desde:
+            resultado["linhas_descartadas"] = self.saida.descartadas() - desde
+        return resultado
+
+    def resumo(self) -> Dict:
+        fim = self.terminado or time.time()
+        return {
+            "id": self.id,
+            "comando": self.comando[:200],
+            "rodando": self.rodando,
+            "codigo": self.codigo,
+            "cancelado": self.cancelado,
+            "duracao_s": round(fim - self.iniciado, 1),
+            "linhas": self.saida.total,
+        }
+
+
+class GerenciadorProcessos:
+    """Comandos iniciados pelo agente, consultáveis por id enquanto rodam e depois."""
+
+    def __init__(self):
+        self._processos: Dict[int, ProcessoComando] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def iniciar(self, comando: str, diretorio: str = None, env: Dict = None,
+                proc: subprocess.Popen = None) -> ProcessoComando:
+        processo = ProcessoComando(next(self._ids), comando, diretorio, env, proc)
+        with self._lock:
+            self._processos[processo.id] = processo
+            self._podar()
+        return processo
+
+    def _podar(self):
+        concluidos = sorted((p for p in self._processos.values() if not p.rodando), key=lambda p: p.iniciado)
+        for processo in concluidos[:max(0, len(concluidos) - MAX_CONCLUIDOS)]:
+            del self._processos[processo.id]
+
+    def obter(self, id_processo: int) -> Optional[ProcessoComando]:
+        with self._lock:
+            return self._processos.get(id_processo)
+
+    def remover(self, id_processo: int):
+        with self._lock:
+            self._processos.pop(id_processo, None)
+
+    def consultar(self, id_processo: int) -> Optional[Dict]:
+        """Estado do processo e a saída nova desde a consulta anterior."""
+        processo = self.obter(id_processo)
+        if processo is None:
+            return None
+        if not processo.rodando:
+            processo.esperar(timeout=2)
+        resultado = processo.resultado(desde=processo.cursor)
+        processo.cursor = processo.saida.total
+        resultado.update(processo.resumo())
+        if processo.rodando:
+            resultado["sucesso"] = True   # ainda não há código de saída
+        return resultado
+
+    def listar(self) -> List[Dict]:
+        with self._lock:
+            processos = list(self._processos.values())
+        return [p.resumo() for p in processos]
+
+    def encerrar(self):
+        """Mata tudo que ainda está rodando (saída do programa)."""
+        with self._lock:
+            processos = list(self._processos.values())
+        for processo in processos:
+            if processo.rodando:
+                processo.cancelar()
+
+
+_gerenciador = None
+_gerenciador_lock = threading.Lock()
+
+
+def gerenciador_processos() -> GerenciadorProcessos:
+    global _gerenciador
+    with _gerenciador_lock:
+        if _gerenciador is None:
+            _gerenciador = GerenciadorProcessos()
+            atexit.register(_gerenciador.encerrar)
+        return _gerenciador
@@ -0,0 +1,68 @@
+"""
+Python Worker — Processo Python pré-aquecido (usado por python_workers.py).
+Importa os módulos comuns assim que sobe e fica esperando, na stdin, uma
+linha JSON com o arquivo a executar. Roda esse único arquivo como __main__
+(como "python arquivo.py") e sai, então cada execução tem um processo limpo.
+
+Uso: python python_worker.py numpy,pandas,requests
+"""
+
+import os
+import sys
+import json
+import runpy
+import importlib
+import traceback
+import contextlib
+
+
+def preparar(modulos):
+    """Importa os módulos (silenciosamente; os que faltarem são ignorados)."""
+    with open(os.devnull, "w") as nulo, contextlib.redirect_stdout(nulo), contextlib.redirect_stderr(nulo):
+        for nome in modulos:
+            try:
+                importlib.import_module(nome)
+            except Exception:
+                pass
+
+
+def executar(arquivo: str):
+    arquivo = os.path.abspath(arquivo)
+    sys.argv = [arquivo]
+    sys.path.insert(0, os.path.dirname(arquivo))
+    try:
+        runpy.run_path(arquivo, run_name="__main__")
+    except SystemExit:
+        raise
+    except BaseException as e:
+        # Traceback a partir do código do usuário, sem os frames do worker/runpy
+        tb = e.__traceback__
+        while tb is not None and tb.tb_frame.f_code.co_filename != arquivo:
+            tb = tb.tb_next
+        traceback.print_exception(type(e), e, tb or e.__traceback__)
+        sys.exit(1)
+
+
+def main():
+    # A pasta do projeto não deve ficar no sys.path do código do usuário
+    # (memory/, skills/... esconderiam módulos de mesmo nome)
+    if sys.path and os.path.abspath(sys.path[0] or ".") == os.path.dirname(os.path.abspath(__file__)):
+        sys.path.pop(0)
+
+    preparar([m for m in (sys.argv[1] if len(sys.argv) > 1 else "").split(",") if m])
+
+    linha = sys.stdin.readline()
+    if not linha:
+        return   # pool encerrado antes de usar este worker
+    pedido = json.loads(linha)
+
+    # Sem stdin para o código do usuário (como no subprocess com DEVNULL)
+    sys.stdin.close()
+    sys.stdin = open(os.devnull, "r")
+    if pedido.get("diretorio"):
+        os.chdir(pedido["diretorio"])
+    executar(pedido["arquivo"])
+
+
+if __name__ == "__main__":
+    main()
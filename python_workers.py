@@ -0,0 +1,130 @@
+"""
+Python Workers — Pool de interpretadores Python pré-aquecidos.
+escrever_e_executar_codigo pagava a partida do interpretador e o import de
+numpy/pandas a cada trecho. Aqui alguns processos python_worker.py ficam
+prontos, já com esses módulos importados, esperando um arquivo para rodar.
+Cada worker roda um único arquivo e sai (isolamento igual ao de um processo
+novo); quando um é usado, outro já começa a aquecer no lugar.
+"""
+
+import os
+import sys
+import json
+import time
+import atexit
+import shutil
+import threading
+import subprocess
+from typing import Dict, List
+
+PRECARREGAR = ("numpy", "pandas", "requests")
+TRABALHADORES = 2
+MAX_OCIOSO = 30 * 60     # workers parados há mais que isso são renovados (pacotes instalados depois)
+
+# Mesmo interpretador que "python arquivo.py" usaria no terminal
+PYTHON = shutil.which("python") or sys.executable
+WORKER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "python_worker.py")
+
+
+class PoolPython:
+    """Processos Python ociosos e aquecidos, cada um para uma execução."""
+
+    def __init__(self, tamanho: int = TRABALHADORES, precarregar=PRECARREGAR, python: str = PYTHON):
+        self.tamanho = tamanho
+        self.precarregar = tuple(precarregar)
+        self.python = python
+        self._ociosos: List[tuple] = []   # (Popen, iniciado_em)
+        self._lock = threading.Lock()
+        self._encerrado = False
+        self.stats = {"quentes": 0, "frios": 0}
+
+    def _novo_trabalhador(self) -> subprocess.Popen:
+        env = dict(os.environ, PYTHONUNBUFFERED="1")   # saída em fluxo pelo pipe
+        return subprocess.Popen(
+            [self.python, WORKER, ",".join(self.precarregar)],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            env=env,
+        )
+
+    def aquecer(self):
+        """Completa o pool com workers novos (o import acontece neles, em paralelo)."""
+        with self._lock:
+            if self._encerrado:
+                return
+            agora = time.monotonic()
+            vivos = []
+            for proc, iniciado in self._ociosos:
+                if proc.poll() is None and agora - iniciado < MAX_OCIOSO:
+                    vivos.append((proc, iniciado))
+                else:
+                    self._descartar(proc)
+            while len(vivos) < self.tamanho:
+                vivos.append((self._novo_trabalhador(), agora))
+            self._ociosos = vivos
+
+    @staticmethod
+    def _descartar(proc: subprocess.Popen):
+        # Worker ocioso ainda não rodou nada do usuário: pode morrer direto
+        try:
+            proc.kill()
+        except OSError:
+            pass
+        proc.communicate()
+
+    def executar(self, arquivo: str, diretorio: str = None) -> subprocess.Popen:
+        """
+        Entrega o arquivo a um worker aquecido (ou a um novo, se não houver) e
+        devolve o processo — stdout/stderr em PIPE, para o process_runner acompanhar.
+        """
+        with self._lock:
+            proc = None
+            while self._ociosos:
+                candidato, iniciado = self._ociosos.pop(0)
+                if candidato.poll() is None and time.monotonic() - iniciado < MAX_OCIOSO:
+                    proc = candidato
+                    break
+                self._descartar(candidato)
+            self.stats["quentes" if proc is not None else "frios"] += 1
+        pedido = (json.dumps({"arquivo": os.path.abspath(arquivo), "diretorio": diretorio}) + "\n").encode("utf-8")
+        try:
+            if proc is None:
+                raise BrokenPipeError
+            proc.stdin.write(pedido)
+            proc.stdin.close()
+        except OSError:
+            # Worker morreu entre a checagem e o pedido: usa um novo
+            proc = self._novo_trabalhador()
+            proc.stdin.write(pedido)
+            proc.stdin.close()
+
+        # Repõe o worker usado sem atrasar esta execução
+        threading.Thread(target=self.aquecer, name="python-workers", daemon=True).start()
+        return proc
+
+    def estatisticas(self) -> Dict:
+        with self._lock:
+            return {"ociosos": len(self._ociosos), "precarregados": list(self.precarregar), **self.stats}
+
+    def encerrar(self):
+        with self._lock:
+            self._encerrado = True
+            ociosos, self._ociosos = self._ociosos, []
+        for proc, _ in ociosos:
+            self._descartar(proc)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def pool_python() -> PoolPython:
+    """Instância única do pool (começa a aquecer os workers na primeira chamada)."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = PoolPython()
+            _pool.aquecer()
+            atexit.register(_pool.encerrar)
+        return _pool
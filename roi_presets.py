@@ -0,0 +1,127 @@
+"""
+ROI Presets — Regiões de interesse nomeadas (gráfico do TradingView, painel do MT5...).
+Cada preset aponta para uma janela (por trecho do título) e um retângulo
+relativo a ela, ou para um retângulo fixo da tela. A posição da janela é
+resolvida uma vez e reaproveitada por alguns segundos, e as capturas pegam
+só esse retângulo direto do mss.
+"""
+
+import os
+import json
+import time
+import threading
+from typing import Dict, Optional, Tuple
+
+from frame_service import servico_captura
+
+ROI_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "memoria", "roi_presets.json")
+
+# nome -> {"janelas": [trechos do título], "relativo": (x, y, largura, altura) em frações da janela}
+#      ou {"regiao": [x, y, largura, altura]} em pixels da tela
+PRESETS_PADRAO = {
+    "tradingview": {"janelas": ["TradingView"], "relativo": (0.0, 0.0, 1.0, 1.0)},
+    "tradingview_grafico": {"janelas": ["TradingView"], "relativo": (0.04, 0.09, 0.80, 0.85)},
+    "mt5": {"janelas": ["MetaTrader 5", "MetaTrader"], "relativo": (0.0, 0.0, 1.0, 1.0)},
+    "mt5_grafico": {"janelas": ["MetaTrader 5", "MetaTrader"], "relativo": (0.0, 0.08, 0.80, 0.62)},
+    "mt5_ordens": {"janelas": ["MetaTrader 5", "MetaTrader"], "relativo": (0.0, 0.70, 1.0, 0.30)},
+}
+
+
+def _localizar_janela(trechos) -> Optional[Tuple[int, int, int, int]]:
+    """(x, y, largura, altura) da primeira janela visível cujo título contém um dos trechos."""
+    try:
+        import pygetwindow as gw
+    except ImportError:
+        return None
+    for trecho in trechos:
+        for janela in gw.getWindowsWithTitle(trecho):
+            if janela.width > 0 and janela.height > 0 and not getattr(janela, "isMinimized", False):
+                return janela.left, janela.top, janela.width, janela.height
+    return None
+
+
+class PresetsROI:
+    """Presets padrão + personalizados (memoria/roi_presets.json), com cache da posição resolvida."""
+
+    VALIDADE = 5.0   # segundos até procurar a janela de novo (ela pode ter sido movida)
+
+    def __init__(self, arquivo: str = ROI_FILE):
+        self.arquivo = arquivo
+        self._lock = threading.Lock()
+        self._resolvidos = {}   # nome -> (instante, regiao)
+        self._personalizados = self._carregar()
+
+    def _carregar(self) -> Dict:
+        try:
+            with open(self.arquivo, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _salvar(self):
+        os.makedirs(os.path.dirname(self.arquivo), exist_ok=True)
+        tmp = self.arquivo + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self._personalizados, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, self.arquivo)
+
+    def presets(self) -> Dict:
+        return {**PRESETS_PADRAO, **self._personalizados}
+
+    def definir(self, nome: str, regiao=None, janela: str = None, relativo=None) -> Dict:
+        """Cria/atualiza um preset: retângulo fixo (regiao) ou janela + retângulo relativo."""
+        if regiao:
+            preset = {"regiao": [int(v) for v in regiao]}
+        elif janela:
+            preset = {"janelas": [janela], "relativo": list(relativo or (0.0, 0.0, 1.0, 1.0))}
+        else:
+            raise ValueError("Informe 'regiao' ou 'janela'")
+        with self._lock:
+            self._personalizados[nome] = preset
+            self._resolvidos.pop(nome, None)
+            self._salvar()
+        return preset
+
+    def resolver(self, nome: str, atualizar: bool = False) -> Tuple[int, int, int, int]:
+        """(x, y, largura, altura) relativo à área capturada. ValueError se o preset não existe ou a janela não está aberta."""
+        preset = self.presets().get(nome)
+        if preset is None:
+            raise ValueError(f"ROI '{nome}' não existe. Disponíveis: {', '.join(sorted(self.presets()))}")
+        if "regiao" in preset:
+            return tuple(preset["regiao"])
+        with self._lock:
+            cache = self._resolvidos.get(nome)
+            if cache and not atualizar and time.monotonic() - cache[0] < self.VALIDADE:
+                return cache[1]
+        janela = _localizar_janela(preset["janelas"])
+        if janela is None:
+            raise ValueError(f"Janela de '{nome}' não encontrada ({' / '.join(preset['janelas'])})")
+        jx, jy, jw, jh = janela
+        # Janelas vêm em coordenadas absolutas; as regiões são relativas à área de captura
+        ox, oy = servico_captura().origem()
+        fx, fy, fw, fh = preset["relativo"]
+        regiao = (jx - ox + int(fx * jw), jy - oy + int(fy * jh), max(1, int(fw * jw)), max(1, int(fh * jh)))
+        with self._lock:
+            self._resolvidos[nome] = (time.monotonic(), regiao)
+        return regiao
+
+
+_presets = None
+_presets_lock = threading.Lock()
+
+
+def presets_roi() -> PresetsROI:
+    global _presets
+    with _presets_lock:
+        if _presets is None:
+            _presets = PresetsROI()
+        return _presets
+
+
+def resolver_regiao(regiao):
+    """Aceita None, [x, y, largura, altura] ou o nome de um preset; devolve tupla ou None."""
+    if not regiao:
+        return None
+    if isinstance(regiao, str):
+        return presets_roi().resolver(regiao)
+    return tuple(int(v) for v in regiao)
@@ -1,69 +1,171 @@
 """
-Screen Capture — Captura a tela usando MSS.
-Converte para JPEG base64 para enviar ao Gemini.
-NOTA: MSS é thread-local no Windows, então criamos instância por captura.
+Screen Capture — Captura a tela usando o serviço de captura compartilhado.
+Os frames vão ao Gemini como bytes JPEG (sem ida e volta por base64),
+reduzidos com INTER_AREA e codificados pelo OpenCV.
+O stream é adaptativo: uma miniatura compara cada captura com a última
+enviada, frames sem mudança não são codificados nem enviados, e o fps
+sobe quando a tela muda ou o usuário interage e cai aos poucos quando fica parada.
 """
 
 import asyncio
 import base64
-import io
+import time
+import cv2
+import numpy as np
 from PIL import Image
 
+from frame_service import servico_captura
+from roi_presets import resolver_regiao
+
 
 class ScreenCapture:
     """Captura de tela com redimensionamento para 768x768 JPEG."""
 
-    def __init__(self, fps: float = 1.0, resolution: int = 768):
+    MINIATURA = (160, 90)      # tamanho usado para comparar frames
+    LIMIAR_MUDANCA = 4         # diferença máxima de pixel (0-255) na miniatura que conta como mudança
+    RAMPA = 1.5                # fator de desaceleração por frame parado
+    REENVIO = 10.0             # reenvia um frame parado a cada N segundos
+    JANELA_INTERACAO = 3.0     # segundos em fps máximo após clique/tecla/mouse
+    RELATORIO = 60             # frames codificados por relatório de tempos
+
+    def __init__(self, fps: float = 1.0, resolution: int = 768, fps_min: float = 0.2, roi: str = None,
+                 on_log=None):
+        """
+        Args:
+            on_log: callback(texto) que recebe a média dos tempos por etapa a cada
+                    RELATORIO frames (ex: on_skill_log do agente); padrão: print
+        """
         self.fps = fps
+        self.fps_min = fps_min
         self.resolution = resolution
+        self.roi = roi   # preset de ROI (ou [x, y, largura, altura]); None = tela inteira
         self.running = False
+        self._miniatura = None
+        self._posicao_mouse = None
+        self.estatisticas = {"enviados": 0, "pulados": 0, "fps_atual": fps}
+        self.tempos = {}   # ms por etapa do último frame codificado (captura, reducao, jpeg)
+        self.on_log = on_log or (lambda texto: print(f"[ScreenCapture] {texto}"))
+        self._janela_tempos = []   # tempos dos frames desde o último relatório
 
-    def capture_frame(self) -> str:
-        """Captura um frame da tela e retorna como base64 JPEG.
-        Cria nova instância MSS a cada chamada (thread-safety no Windows).
-        """
-        import mss
-        with mss.mss() as sct:
-            monitor = sct.monitors[0]  # Tela inteira
-            screenshot = sct.grab(monitor)
+    def _codificar(self, frame, inicio: float) -> bytes:
+        """Reduz o frame e codifica em JPEG, registrando o tempo de cada etapa."""
+        t_captura = time.perf_counter()
+        img = frame.reduzido((self.resolution, self.resolution))
+        t_reducao = time.perf_counter()
+        ok, jpeg = cv2.imencode(".jpg", img, [cv2.IMWRITE_JPEG_QUALITY, 60])
+        if not ok:
+            raise RuntimeError("falha ao codificar JPEG")
+        fim = time.perf_counter()
+        self.tempos = {
+            "captura_ms": round((t_captura - inicio) * 1000, 1),
+            "reducao_ms": round((t_reducao - t_captura) * 1000, 1),
+            "jpeg_ms": round((fim - t_reducao) * 1000, 1),
+            "bytes": int(jpeg.size),
+        }
+        self._registrar_tempos()
+        return jpeg.tobytes()
 
-            # Converter para PIL Image
-            img = Image.frombytes("RGB", screenshot.size, screenshot.bgra, "raw", "BGRX")
-            img = img.resize((self.resolution, self.resolution), Image.LANCZOS)
+    def _registrar_tempos(self):
+        """Acumula os tempos e, a cada RELATORIO frames, publica as médias (info_sistema e log)."""
+        self._janela_tempos.append(self.tempos)
+        if len(self._janela_tempos) < self.RELATORIO:
+            return
+        janela, self._janela_tempos = self._janela_tempos, []
+        medias = {k: round(sum(t[k] for t in janela) / len(janela), 1) for k in janela[0]}
+        medias["bytes"] = int(medias["bytes"])
+        medias["frames"] = len(janela)
+        servico_captura().tempos_stream = medias
+        self.on_log(f"📸 Tela: captura {medias['captura_ms']}ms · redução {medias['reducao_ms']}ms · "
+                    f"JPEG {medias['jpeg_ms']}ms · {medias['bytes'] / 1024:.0f}KB "
+                    f"(média de {len(janela)} frames, {self.estatisticas['fps_atual']} fps)")
 
-            # Converter para JPEG base64
-            buffer = io.BytesIO()
-            img.save(buffer, format="JPEG", quality=60)
-            return base64.b64encode(buffer.getvalue()).decode("utf-8")
+    def _frame(self):
+        """Frame da ROI configurada (só esse retângulo); tela inteira se a ROI não puder ser resolvida."""
+        try:
+            regiao = resolver_regiao(self.roi)
+        except ValueError as e:
+            print(f"[ScreenCapture] ROI indisponível, usando tela inteira: {e}")
+            regiao = None
+        return servico_captura().frame(regiao=regiao)
+
+    def capture_frame_bytes(self) -> bytes:
+        """Captura um frame da tela (ou da ROI) e retorna os bytes JPEG."""
+        inicio = time.perf_counter()
+        return self._codificar(self._frame(), inicio)
+
+    def capture_frame(self) -> str:
+        """Captura um frame da tela e retorna como base64 JPEG."""
+        return base64.b64encode(self.capture_frame_bytes()).decode("utf-8")
 
     def capture_frame_pil(self) -> Image.Image:
         """Captura frame e retorna como PIL Image (para preview GUI).
-        Cria nova instância MSS a cada chamada.
+        Reaproveita o frame do stream se foi capturado no mesmo tick.
         """
-        import mss
-        with mss.mss() as sct:
-            monitor = sct.monitors[0]
-            screenshot = sct.grab(monitor)
-            img = Image.frombytes("RGB", screenshot.size, screenshot.bgra, "raw", "BGRX")
-            return img.resize((320, 200), Image.LANCZOS)
+        return servico_captura().frame().reduzido_pil((320, 200))
+
+    def _mudou(self, frame) -> bool:
+        """Compara a miniatura do frame com a do último frame enviado."""
+        miniatura = frame.reduzido(self.MINIATURA)
+        if self._miniatura is None:
+            return True
+        diff = np.abs(miniatura.astype(np.int16) - self._miniatura.astype(np.int16))
+        return int(diff.max()) >= self.LIMIAR_MUDANCA
+
+    def _houve_interacao(self) -> bool:
+        """Clique/tecla sinalizados pelas skills ou mouse movido pelo usuário."""
+        if time.monotonic() - servico_captura().ultima_interacao < self.JANELA_INTERACAO:
+            return True
+        try:
+            import pyautogui
+            posicao = tuple(pyautogui.position())
+        except Exception:
+            return False
+        movido = self._posicao_mouse is not None and posicao != self._posicao_mouse
+        self._posicao_mouse = posicao
+        return movido
+
+    def _proximo_frame(self, forcar: bool):
+        """Bytes JPEG do frame se a tela mudou (ou se forçado); None se nada mudou."""
+        inicio = time.perf_counter()
+        frame = self._frame()
+        if not forcar and not self._mudou(frame):
+            return None
+        self._miniatura = frame.reduzido(self.MINIATURA)
+        return self._codificar(frame, inicio)
 
     async def stream_frames(self, queue: asyncio.Queue):
-        """Loop assíncrono que coloca frames na fila."""
+        """Loop assíncrono que coloca na fila só os frames que mudaram, com fps adaptativo."""
         self.running = True
-        interval = 1.0 / self.fps
+        self._miniatura = None
+        intervalo_min = 1.0 / self.fps
+        intervalo_max = 1.0 / min(self.fps_min, self.fps)
+        intervalo = intervalo_min
+        ultimo_envio = 0.0
         while self.running:
             try:
-                frame_b64 = await asyncio.to_thread(self.capture_frame)
-                # Descarta frame antigo se fila cheia
-                if queue.full():
-                    try:
-                        queue.get_nowait()
-                    except asyncio.QueueEmpty:
-                        pass
-                await queue.put(frame_b64)
+                forcar = time.monotonic() - ultimo_envio >= self.REENVIO
+                jpeg = await asyncio.to_thread(self._proximo_frame, forcar)
+                interacao = await asyncio.to_thread(self._houve_interacao)
+                if jpeg is not None:
+                    ultimo_envio = time.monotonic()
+                    self.estatisticas["enviados"] += 1
+                    # Descarta frame antigo se fila cheia
+                    if queue.full():
+                        try:
+                            queue.get_nowait()
+                        except asyncio.QueueEmpty:
+                            pass
+                    await queue.put(jpeg)
+                else:
+                    self.estatisticas["pulados"] += 1
+                if (jpeg is not None and not forcar) or interacao:
+                    intervalo = intervalo_min
+                else:
+                    intervalo = min(intervalo * self.RAMPA, intervalo_max)
+                self.estatisticas["fps_atual"] = round(1.0 / intervalo, 2)
             except Exception as e:
                 print(f"[ScreenCapture] Erro: {e}")
-            await asyncio.sleep(interval)
+            await asyncio.sleep(intervalo)
 
     def stop(self):
         """Para a captura."""
@@ -0,0 +1,119 @@
+"""
+Skill Cache — Cache de resultados das skills idempotentes.
+Cada skill cacheável declara um TTL; a chave é o nome + parâmetros. A
+invalidação usa a mesma tabela de recursos da execução paralela: quando uma
+skill que altera um recurso termina (criar_arquivo num caminho, salvar_nota,
+executar_comando...), saem do cache os resultados que leram esse recurso.
+Resultados ligados a caminhos também conferem o mtime antes de servir.
+"""
+
+import os
+import json
+import time
+import threading
+from typing import Callable, Dict, Optional
+
+
+class CacheSkills:
+    """Resultados (JSON) de skills por (nome, parâmetros), com TTL e invalidação por recurso."""
+
+    MAX_ITENS = 256
+
+    def __init__(self, politica: Dict[str, float], recursos: Callable, conflitam: Callable):
+        """
+        Args:
+            politica: {skill: ttl em segundos} — só essas são cacheadas
+            recursos: recursos_skill(nome, params) -> {recurso: "r"|"w"}
+            conflitam: skills_conflitam(recursos_a, recursos_b) -> bool
+        """
+        self.politica = politica
+        self._recursos = recursos
+        self._conflitam = conflitam
+        self._itens = {}   # chave -> (expira, resultado, recursos, mtimes)
+        self._geracao = 0  # muda a cada invalidação (descarta leituras que a atravessaram)
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _chave(nome: str, params: dict) -> str:
+        return nome + ":" + json.dumps(params, sort_keys=True, ensure_ascii=False, default=str)
+
+    @staticmethod
+    def _mtimes(recursos: dict) -> tuple:
+        mtimes = []
+        for recurso in recursos:
+            if recurso.startswith("arquivos:"):
+                try:
+                    mtimes.append(os.stat(recurso[len("arquivos:"):]).st_mtime_ns)
+                except OSError:
+                    mtimes.append(None)
+        return tuple(mtimes)
+
+    def _contar(self, nome: str, evento: str):
+        s = self._stats.setdefault(nome, {"hits": 0, "misses": 0, "invalidados": 0})
+        s[evento] += 1
+
+    def obter(self, nome: str, params: dict) -> Optional[str]:
+        """Resultado em cache ainda válido, ou None."""
+        if nome not in self.politica:
+            return None
+        chave = self._chave(nome, params)
+        with self._lock:
+            item = self._itens.get(chave)
+        if item is not None and time.monotonic() < item[0] and self._mtimes(item[2]) == item[3]:
+            with self._lock:
+                self._contar(nome, "hits")
+            return item[1]
+        with self._lock:
+            self._itens.pop(chave, None)
+            self._contar(nome, "misses")
+        return None
+
+    def geracao(self) -> int:
+        return self._geracao
+
+    def registrar(self, nome: str, params: dict, resultado: dict, texto: str, geracao: int):
+        """
+        Depois de executar uma skill: guarda o resultado (se cacheável e bem-sucedido)
+        ou, se ela altera recursos, invalida o que leu esses recursos.
+
+        Args:
+            geracao: valor de geracao() antes da execução
+        """
+        recursos = self._recursos(nome, params)
+        if "w" in recursos.values():
+            self.invalidar(recursos)
+        ttl = self.politica.get(nome)
+        if not ttl or not isinstance(resultado, dict) or resultado.get("sucesso") is False:
+            return
+        mtimes = self._mtimes(recursos)
+        with self._lock:
+            if geracao != self._geracao:
+                return   # algo foi alterado durante a leitura
+            if len(self._itens) >= self.MAX_ITENS:
+                agora = time.monotonic()
+                self._itens = {k: v for k, v in self._itens.items() if v[0] > agora}
+                while len(self._itens) >= self.MAX_ITENS:
+                    del self._itens[min(self._itens, key=lambda k: self._itens[k][0])]
+            self._itens[self._chave(nome, params)] = (time.monotonic() + ttl, texto, recursos, mtimes)
+
+    def invalidar(self, recursos: dict = None) -> int:
+        """Remove os resultados que leram algum dos recursos (todos, se None)."""
+        with self._lock:
+            self._geracao += 1
+            if recursos is None:
+                removidos = list(self._itens)
+            else:
+                removidos = [k for k, v in self._itens.items() if self._conflitam(recursos, v[2])]
+            for chave in removidos:
+                self._contar(chave.split(":", 1)[0], "invalidados")
+                del self._itens[chave]
+            return len(removidos)
+
+    def estatisticas(self) -> Dict:
+        with self._lock:
+            stats = {}
+            for nome, s in self._stats.items():
+                total = s["hits"] + s["misses"]
+                stats[nome] = dict(s, taxa_acerto=round(s["hits"] / total, 3) if total else 0.0)
+            return {"itens": len(self._itens), "skills": stats}
@@ -0,0 +1,185 @@
+"""
+Skill Executor — Execução das skills em pools dedicados.
+Cada skill roda num pool do seu tipo (I/O, CPU, UI), com limite de workers
+próprio, para um OCR pesado não segurar uma pesquisa na internet nem duas
+ações de mouse rodarem juntas. Cada execução tem um sinal de cancelamento
+que as skills longas consultam (verificar_cancelamento) — é acionado por
+timeout ou quando o Gemini interrompe/cancela o turno — e pode mandar
+mensagens de andamento para o log de skills (reportar_progresso).
+"""
+
+import json
+import time
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor, CancelledError
+from typing import Callable, Dict
+
+
+# Pool de cada skill; as que não estão aqui vão para "io"
+POOL_SKILLS = {
+    # CPU: OCR, template matching, leitura de gráfico
+    "detectar_texto_tela": "cpu",
+    "localizar_texto": "cpu",
+    "localizar_textos": "cpu",
+    "localizar_elemento": "cpu",
+    "localizar_elementos": "cpu",
+    "ler_grafico": "cpu",
+    "salvar_screenshot_debug": "cpu",
+    # UI: mouse, teclado e janelas (um de cada vez)
+    "controlar_mouse_teclado": "ui",
+    "clicar_em_texto": "ui",
+    "abrir_aplicativo": "ui",
+    "abrir_url": "ui",
+}
+
+
+class SkillCancelada(Exception):
+    """A execução da skill foi cancelada (timeout ou interrupção do turno)."""
+
+
+_local = threading.local()
+
+
+def cancelamento_atual() -> threading.Event:
+    """Sinal de cancelamento da skill rodando nesta thread (None fora do executor)."""
+    return getattr(_local, "cancelamento", None)
+
+
+def reportar_progresso(mensagem: str):
+    """Andamento da skill rodando nesta thread (vai para o log de skills da GUI)."""
+    progresso = getattr(_local, "progresso", None)
+    if progresso is not None:
+        progresso(mensagem)
+
+
+def verificar_cancelamento():
+    """Ponto de cancelamento cooperativo: levanta SkillCancelada se a skill foi cancelada."""
+    evento = cancelamento_atual()
+    if evento is not None and evento.is_set():
+        raise SkillCancelada("Execução cancelada")
+
+
+class _Execucao:
+    """Uma chamada de skill submetida ao executor."""
+
+    def __init__(self, nome: str, pool: str, chave=None):
+        self.nome = nome
+        self.pool = pool
+        self.chave = chave   # id do function call (para cancelamento pelo Gemini)
+        self.cancelamento = threading.Event()
+        self.submetida = time.monotonic()
+        self.iniciada = None
+        self.future = None
+
+    def cancelar(self):
+        self.cancelamento.set()
+        if self.future is not None:
+            self.future.cancel()   # só tem efeito se ainda estiver na fila
+
+
+class ExecutorSkills:
+    """Pools limitados por tipo de skill, com cancelamento e estatísticas de fila/execução."""
+
+    POOLS = {"io": 8, "cpu": 2, "ui": 1}
+
+    def __init__(self, executar: Callable[[str, dict], str], ao_progresso: Callable[[str], None] = None):
+        self._executar = executar
+        self._ao_progresso = ao_progresso
+        self._pools = {
+            nome: ThreadPoolExecutor(max_workers=n, thread_name_prefix=f"skill-{nome}")
+            for nome, n in self.POOLS.items()
+        }
+        self._ativas = set()
+        self._stats = {}   # skill -> contadores
+        self._lock = threading.Lock()
+
+    def _rodar(self, execucao: _Execucao, params: dict) -> str:
+        execucao.iniciada = time.monotonic()
+        _local.cancelamento = execucao.cancelamento
+        if self._ao_progresso is not None:
+            _local.progresso = lambda mensagem: self._ao_progresso(f"⏳ {execucao.nome}: {mensagem}")
+        try:
+            verificar_cancelamento()
+            return self._executar(execucao.nome, params)
+        finally:
+            _local.cancelamento = None
+            _local.progresso = None
+            self._registrar(execucao, "execucoes")
+
+    def _registrar(self, execucao: _Execucao, evento: str):
+        agora = time.monotonic()
+        with self._lock:
+            s = self._stats.setdefault(execucao.nome, {
+                "execucoes": 0, "canceladas": 0, "timeouts": 0, "erros": 0,
+                "espera_total": 0.0, "execucao_total": 0.0, "execucao_max": 0.0,
+            })
+            s[evento] += 1
+            if evento == "execucoes":
+                duracao = agora - execucao.iniciada
+                s["espera_total"] += execucao.iniciada - execucao.submetida
+                s["execucao_total"] += duracao
+                s["execucao_max"] = max(s["execucao_max"], duracao)
+
+    async def executar(self, nome: str, params: dict, timeout: float = None, chave=None) -> str:
+        """
+        Executa a skill no pool do seu tipo e devolve o JSON do resultado.
+        Timeout e cancelamento também viram JSON ({"sucesso": False, ...}).
+        """
+        execucao = _Execucao(nome, POOL_SKILLS.get(nome, "io"), chave)
+        execucao.future = self._pools[execucao.pool].submit(self._rodar, execucao, params)
+        with self._lock:
+            self._ativas.add(execucao)
+        try:
+            resultado = await asyncio.wait_for(asyncio.wrap_future(execucao.future), timeout=timeout)
+            if execucao.cancelamento.is_set():
+                # A skill atendeu o cancelamento e devolveu o próprio resultado
+                self._registrar(execucao, "canceladas")
+            return resultado
+        except asyncio.TimeoutError:
+            execucao.cancelar()
+            self._registrar(execucao, "timeouts")
+            return json.dumps({"sucesso": False, "mensagem": f"Timeout: '{nome}' passou de {timeout}s"})
+        except (SkillCancelada, CancelledError, asyncio.CancelledError):
+            if not execucao.cancelamento.is_set():
+                # Cancelamento da própria task (sessão encerrando): propaga
+                execucao.cancelar()
+                raise
+            execucao.cancelar()
+            self._registrar(execucao, "canceladas")
+            return json.dumps({"sucesso": False, "mensagem": f"'{nome}' cancelada"})
+        except Exception:
+            self._registrar(execucao, "erros")
+            raise
+        finally:
+            with self._lock:
+                self._ativas.discard(execucao)
+
+    def cancelar(self, chaves=None) -> int:
+        """Cancela as execuções em andamento (todas, ou só as dos ids informados)."""
+        with self._lock:
+            alvo = [e for e in self._ativas if chaves is None or e.chave in chaves]
+        for execucao in alvo:
+            execucao.cancelar()
+        return len(alvo)
+
+    def estatisticas(self) -> Dict:
+        """Por skill: execuções, canceladas, timeouts, erros e tempos médios de fila/execução (ms)."""
+        with self._lock:
+            stats = {}
+            for nome, s in self._stats.items():
+                n = max(1, s["execucoes"])
+                stats[nome] = {
+                    "execucoes": s["execucoes"], "canceladas": s["canceladas"],
+                    "timeouts": s["timeouts"], "erros": s["erros"],
+                    "espera_media_ms": round(s["espera_total"] / n * 1000, 1),
+                    "execucao_media_ms": round(s["execucao_total"] / n * 1000, 1),
+                    "execucao_max_ms": round(s["execucao_max"] * 1000, 1),
+                }
+            stats["_ativas"] = {pool: sum(1 for e in self._ativas if e.pool == pool) for pool in self.POOLS}
+            return stats
+
+    def encerrar(self):
+        self.cancelar()
+        for pool in self._pools.values():
+            pool.shutdown(wait=False, cancel_futures=True)
@@ -5,7 +5,7 @@ Inclui: terminal, arquivos, internet, código, memória, PC control, mouse/tecla
 """
 
 import os
-import subprocess
+import re
 import shutil
 import glob
 import psutil
@@ -14,11 +14,15 @@ import time
 import tempfile
 from datetime import datetime
 
+from skill_executor import cancelamento_atual, reportar_progresso, verificar_cancelamento
+from process_runner import gerenciador_processos
+
 # Import memória
 from memory import (
     salvar_nota, buscar_notas, listar_notas, deletar_nota,
     salvar_tarefa, concluir_tarefa, listar_tarefas,
-    salvar_aprendizado, buscar_aprendizados, obter_historico
+    salvar_aprendizado, buscar_aprendizados, buscar_conversas,
+    buscar_memoria, paginar_historico, resumo_do_dia
 )
 
 
@@ -26,28 +30,107 @@ from memory import (
 #  SKILL 1: Executar comandos no terminal
 # ═══════════════════════════════════════════════════════════════════
 
-def executar_comando(comando: str, diretorio: str = None) -> dict:
-    """Executa um comando no terminal (PowerShell/CMD)."""
+ESPERA_COMANDO = 110   # depois disso o comando segue em segundo plano (abaixo do timeout da skill)
+PASTA_CODIGO = os.path.join(tempfile.gettempdir(), "adk_codigo")   # arquivos de escrever_e_executar_codigo
+MAX_IDADE_CODIGO = 24 * 3600   # arquivos que sobraram (execuções em segundo plano) são apagados depois disso
+
+
+def executar_comando(comando: str, diretorio: str = None, segundo_plano: bool = False,
+                     espera: float = ESPERA_COMANDO) -> dict:
+    """
+    Executa um comando no terminal (PowerShell/CMD).
+    A saída vai para o log de skills enquanto o comando roda. Em segundo plano
+    (ou quando passa do tempo de espera) o comando continua rodando e o
+    resultado traz o id para acompanhar com status_comando.
+    """
     try:
-        result = subprocess.run(
-            comando,
-            shell=True,
-            capture_output=True,
-            text=True,
-            cwd=diretorio,
-            timeout=120
-        )
-        return {
-            "sucesso": result.returncode == 0,
-            "saida": result.stdout[:5000] if result.stdout else "",
-            "erro": result.stderr[:2000] if result.stderr else "",
-            "codigo": result.returncode
-        }
-    except subprocess.TimeoutExpired:
-        return {"sucesso": False, "saida": "", "erro": "Timeout (120s)", "codigo": -1}
+        gerenciador = gerenciador_processos()
+        processo = gerenciador.iniciar(comando, diretorio)
     except Exception as e:
         return {"sucesso": False, "saida": "", "erro": str(e), "codigo": -1}
 
+    if segundo_plano:
+        # Um instante para pegar erro imediato (comando inexistente etc.)
+        if processo.esperar(timeout=1):
+            gerenciador.remover(processo.id)
+            return processo.resultado()
+        return {"sucesso": True, "id": processo.id, "em_segundo_plano": True,
+                "mensagem": f"Rodando em segundo plano (id {processo.id}); acompanhe com status_comando"}
+
+    return _acompanhar(processo, espera)
+
+
+def _acompanhar(processo, espera: float) -> dict:
+    """Espera o processo repassando a saída ao log; passado o tempo, deixa em segundo plano."""
+    gerenciador = gerenciador_processos()
+    prazo = time.monotonic() + espera
+    reportadas = 0
+    while not processo.esperar(timeout=0.5):
+        reportadas = _reportar_saida(processo, reportadas)
+        cancelamento = cancelamento_atual()
+        if cancelamento is not None and cancelamento.is_set():
+            processo.cancelar()
+            gerenciador.remover(processo.id)
+            return {**processo.resultado(), "sucesso": False, "erro": "Cancelado", "codigo": -1}
+        if time.monotonic() > prazo:
+            # status_comando continua daqui, sem repetir a saída já devolvida
+            processo.cursor = processo.saida.total
+            return {**processo.resultado(), "sucesso": True, "codigo": None, "id": processo.id,
+                    "em_segundo_plano": True,
+                    "mensagem": f"Ainda rodando após {int(espera)}s; segue em segundo plano "
+                                f"(id {processo.id}, acompanhe com status_comando)"}
+    _reportar_saida(processo, reportadas)
+    gerenciador.remover(processo.id)
+    return processo.resultado()
+
+
+def _reportar_saida(processo, reportadas: int, max_linhas: int = 5) -> int:
+    """Manda as linhas novas da saída para o log de skills; devolve quantas já foram."""
+    novas = processo.saida.desde(reportadas)
+    if len(novas) > max_linhas:
+        reportar_progresso(f"... (+{len(novas) - max_linhas} linhas)")
+        novas = novas[-max_linhas:]
+    for _, fluxo, linha in novas:
+        if linha.strip():
+            reportar_progresso(("⚠ " if fluxo == "stderr" else "") + linha[:200])
+    return processo.saida.total
+
+
+def status_comando(id: int, aguardar: float = 0) -> dict:
+    """
+    Estado de um comando em segundo plano e a saída nova desde a última consulta.
+
+    Args:
+        aguardar: segundos para esperar o comando terminar antes de responder (máx. 50)
+    """
+    gerenciador = gerenciador_processos()
+    processo = gerenciador.obter(int(id))
+    if processo is None:
+        return {"sucesso": False, "mensagem": f"Comando {id} não encontrado"}
+    prazo = time.monotonic() + min(max(aguardar or 0, 0), 50)
+    reportadas = processo.cursor
+    while time.monotonic() < prazo and not processo.esperar(timeout=0.5):
+        reportadas = _reportar_saida(processo, reportadas)
+        verificar_cancelamento()
+    return gerenciador.consultar(processo.id)
+
+
+def cancelar_comando(id: int) -> dict:
+    """Mata um comando em segundo plano (e os processos filhos)."""
+    processo = gerenciador_processos().obter(int(id))
+    if processo is None:
+        return {"sucesso": False, "mensagem": f"Comando {id} não encontrado"}
+    if not processo.rodando:
+        return {"sucesso": False, "mensagem": f"Comando {id} já terminou (código {processo.codigo})"}
+    processo.cancelar()
+    return {**processo.resultado(), "sucesso": True, "mensagem": f"Comando {id} cancelado"}
+
+
+def listar_comandos() -> dict:
+    """Comandos em segundo plano (rodando e os terminados recentemente)."""
+    comandos = gerenciador_processos().listar()
+    return {"sucesso": True, "comandos": comandos, "rodando": sum(1 for c in comandos if c["rodando"])}
+
 
 # ═══════════════════════════════════════════════════════════════════
 #  SKILL 2-8: Gerenciamento de arquivos
@@ -161,56 +244,47 @@ def criar_pasta(caminho: str) -> dict:
 
 def instalar_pacote_pip(pacote: str) -> dict:
     """Instala pacote Python via pip."""
-    return executar_comando(f"pip install {pacote}")
+    return executar_comando(f"pip install {pacote}", espera=570)
 
 
 def instalar_programa(comando_instalacao: str) -> dict:
     """Instala programa usando qualquer comando."""
-    return executar_comando(comando_instalacao)
+    return executar_comando(comando_instalacao, espera=870)
 
 
 # ═══════════════════════════════════════════════════════════════════
 #  SKILL 11-13: Sistema e processos
 # ═══════════════════════════════════════════════════════════════════
 
-def info_sistema() -> dict:
-    """Informações do sistema."""
+def info_sistema(historico_minutos: float = 0) -> dict:
+    """Informações do sistema (última amostra do amostrador de fundo; tendência opcional)."""
+    from system_metrics import amostrador_sistema
     try:
-        return {
-            "sucesso": True,
-            "cpu_percent": psutil.cpu_percent(interval=1),
-            "ram_total_gb": round(psutil.virtual_memory().total / (1024**3), 1),
-            "ram_usada_gb": round(psutil.virtual_memory().used / (1024**3), 1),
-            "ram_percent": psutil.virtual_memory().percent,
-            "disco_total_gb": round(psutil.disk_usage('C:\\').total / (1024**3), 1),
-            "disco_usado_gb": round(psutil.disk_usage('C:\\').used / (1024**3), 1),
-            "disco_percent": psutil.disk_usage('C:\\').percent,
-            "processos_ativos": len(psutil.pids()),
-            "usuario": os.getlogin(),
-            "diretorio_atual": os.getcwd()
-        }
+        amostrador = amostrador_sistema()
+        resultado = {"sucesso": True, **amostrador.atual()}
+        resultado.pop("instante", None)
+        try:
+            resultado["usuario"] = os.getlogin()
+        except OSError:
+            resultado["usuario"] = os.environ.get("USERNAME") or os.environ.get("USER", "")
+        resultado["diretorio_atual"] = os.getcwd()
+        if historico_minutos:
+            resultado["tendencia"] = amostrador.tendencia(historico_minutos)
+        try:
+            from frame_service import servico_captura
+            resultado["captura_tela"] = servico_captura().estatisticas()   # inclui ms por etapa do stream
+        except ImportError:
+            pass
+        return resultado
     except Exception as e:
         return {"sucesso": False, "mensagem": str(e)}
 
 
 def listar_processos(filtro: str = None) -> dict:
-    """Lista processos em execução."""
+    """Lista processos em execução (da última varredura do amostrador, a cada poucos segundos)."""
+    from system_metrics import amostrador_sistema
     try:
-        processos = []
-        for proc in psutil.process_iter(['pid', 'name', 'cpu_percent', 'memory_percent']):
-            try:
-                info = proc.info
-                if filtro and filtro.lower() not in info['name'].lower():
-                    continue
-                processos.append({
-                    "pid": info['pid'],
-                    "nome": info['name'],
-                    "cpu": info['cpu_percent'],
-                    "memoria": round(info['memory_percent'], 1)
-                })
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                pass
-        processos.sort(key=lambda x: x.get('cpu', 0), reverse=True)
+        processos = amostrador_sistema().processos(filtro)
         return {"sucesso": True, "processos": processos[:50], "total": len(processos)}
     except Exception as e:
         return {"sucesso": False, "processos": [], "mensagem": str(e)}
@@ -262,15 +336,23 @@ def abrir_url(url: str) -> dict:
 #  SKILL 16-17: Pesquisa de arquivos
 # ═══════════════════════════════════════════════════════════════════
 
-def pesquisar_arquivos(diretorio: str, termo: str, extensoes: str = None) -> dict:
-    """Pesquisa arquivos por nome."""
+def pesquisar_arquivos(diretorio: str, termo: str, extensoes: str = None, regex: bool = False) -> dict:
+    """Pesquisa arquivos por nome (pelo índice da pasta; varre o disco enquanto ele é montado)."""
+    from file_index import indice_arquivos, pasta_ignorada
     try:
-        resultados = []
         ext_list = extensoes.split(",") if extensoes else None
+        indice = indice_arquivos(diretorio)
+        if indice.pronto.is_set():
+            resultados = indice.buscar_nomes(termo, ext_list, 50, regex, diretorio)
+            return {"sucesso": True, "resultados": resultados, "total": len(resultados), "indexado": True}
+
+        casa = re.compile(termo, re.IGNORECASE).search if regex else (lambda nome: termo.lower() in nome.lower())
+        resultados = []
         for root, dirs, files in os.walk(diretorio):
-            dirs[:] = [d for d in dirs if not d.startswith('.') and d != 'node_modules']
+            verificar_cancelamento()
+            dirs[:] = [d for d in dirs if not pasta_ignorada(d)]
             for name in files:
-                if termo.lower() in name.lower():
+                if casa(name):
                     if ext_list and not any(name.endswith(e.strip()) for e in ext_list):
                         continue
                     caminho = os.path.join(root, name)
@@ -283,39 +365,30 @@ def pesquisar_arquivos(diretorio: str, termo: str, extensoes: str = None) -> dic
                         break
             if len(resultados) >= 50:
                 break
-        return {"sucesso": True, "resultados": resultados, "total": len(resultados)}
+        return {"sucesso": True, "resultados": resultados, "total": len(resultados), "indexado": False}
     except Exception as e:
         return {"sucesso": False, "resultados": [], "mensagem": str(e)}
 
 
-def pesquisar_conteudo(diretorio: str, texto: str, extensao: str = ".py") -> dict:
-    """Pesquisa texto dentro de arquivos."""
+def pesquisar_conteudo(diretorio: str, texto: str, extensao: str = ".py", regex: bool = False) -> dict:
+    """Pesquisa texto dentro de arquivos (pelo índice da pasta; varre o disco enquanto ele é montado)."""
+    from file_index import indice_arquivos, pasta_ignorada
     try:
+        indice = indice_arquivos(diretorio)
+        if indice.pronto.is_set():
+            resultados = indice.buscar_conteudo(texto, extensao, 30, regex, diretorio)
+            return {"sucesso": True, "resultados": resultados, "total": len(resultados), "indexado": True}
+
+        # Sem índice ainda: varredura paralela com mmap, resultados saem conforme aparecem
+        from content_scan import varrer_conteudo
+        cancelamento = cancelamento_atual()
         resultados = []
-        for root, dirs, files in os.walk(diretorio):
-            dirs[:] = [d for d in dirs if not d.startswith('.') and d != 'node_modules']
-            for name in files:
-                if not name.endswith(extensao):
-                    continue
-                caminho = os.path.join(root, name)
-                try:
-                    with open(caminho, "r", encoding="utf-8", errors="ignore") as f:
-                        for i, linha in enumerate(f, 1):
-                            if texto.lower() in linha.lower():
-                                resultados.append({
-                                    "arquivo": caminho,
-                                    "linha": i,
-                                    "conteudo": linha.strip()[:200]
-                                })
-                                if len(resultados) >= 30:
-                                    break
-                except Exception:
-                    pass
-                if len(resultados) >= 30:
-                    break
-            if len(resultados) >= 30:
-                break
-        return {"sucesso": True, "resultados": resultados, "total": len(resultados)}
+        for r in varrer_conteudo(diretorio, texto, extensao, regex, 30, pasta_ignorada,
+                                 cancelado=lambda: cancelamento is not None and cancelamento.is_set()):
+            resultados.append(r)
+            reportar_progresso(f"{r['arquivo']}:{r['linha']}")
+        verificar_cancelamento()
+        return {"sucesso": True, "resultados": resultados, "total": len(resultados), "indexado": False}
     except Exception as e:
         return {"sucesso": False, "resultados": [], "mensagem": str(e)}
 
@@ -328,16 +401,13 @@ def pesquisar_internet(query: str, num_resultados: int = 5) -> dict:
     """Pesquisa na internet usando Google. Retorna títulos, URLs e descrições."""
     try:
         import requests
-        from bs4 import BeautifulSoup
+        from http_client import obter, analisar_html
 
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-        }
         url = f"https://www.google.com/search?q={requests.utils.quote(query)}&num={num_resultados}&hl=pt-BR"
-        resp = requests.get(url, headers=headers, timeout=10)
+        resp = obter(url, timeout=10)
         resp.raise_for_status()
 
-        soup = BeautifulSoup(resp.text, "html.parser")
+        soup = analisar_html(resp.text)
         resultados = []
 
         for g in soup.select("div.g"):
@@ -366,26 +436,32 @@ def pesquisar_internet(query: str, num_resultados: int = 5) -> dict:
 #  SKILL 19: Baixar arquivo da internet
 # ═══════════════════════════════════════════════════════════════════
 
-def baixar_arquivo(url: str, destino: str = None) -> dict:
-    """Baixa um arquivo de uma URL para o disco."""
+def baixar_arquivo(url: str, destino: str = None, sha256: str = None) -> dict:
+    """
+    Baixa um arquivo de uma URL para o disco.
+    Em segmentos paralelos quando o servidor aceita Range; um download
+    interrompido é retomado na próxima chamada com o mesmo destino.
+    """
     try:
-        import requests
+        from download_manager import baixar, DownloadInterrompido
 
         if not destino:
             nome = url.split("/")[-1].split("?")[0] or "download"
             destino = os.path.join(os.path.expanduser("~"), "Downloads", nome)
 
-        os.makedirs(os.path.dirname(destino), exist_ok=True)
-
-        resp = requests.get(url, timeout=60, stream=True)
-        resp.raise_for_status()
-
-        with open(destino, "wb") as f:
-            for chunk in resp.iter_content(chunk_size=8192):
-                f.write(chunk)
-
-        tamanho_kb = round(os.path.getsize(destino) / 1024, 1)
-        return {"sucesso": True, "mensagem": f"Baixado: {destino} ({tamanho_kb}KB)", "caminho": destino}
+        evento = cancelamento_atual()
+        try:
+            info = baixar(url, destino, sha256=sha256, ao_progresso=reportar_progresso,
+                          cancelado=evento.is_set if evento is not None else None)
+        except DownloadInterrompido:
+            return {"sucesso": False, "mensagem": "Download interrompido; chame de novo com o mesmo destino para retomar",
+                    "caminho": destino}
+
+        tamanho_kb = round(info["tamanho"] / 1024, 1)
+        mensagem = f"Baixado: {destino} ({tamanho_kb}KB, {info['taxa_mb_s']}MB/s)"
+        if info["retomado_de"]:
+            mensagem += f" — retomado de {round(info['retomado_de'] / 1024, 1)}KB"
+        return {"sucesso": True, "mensagem": mensagem, **info}
     except Exception as e:
         return {"sucesso": False, "mensagem": str(e)}
 
@@ -395,29 +471,17 @@ def baixar_arquivo(url: str, destino: str = None) -> dict:
 # ═══════════════════════════════════════════════════════════════════
 
 def ler_pagina_web(url: str) -> dict:
-    """Lê e extrai o conteúdo texto de uma página web."""
+    """Lê e extrai o conteúdo texto de uma página web (sessão compartilhada + cache por ETag)."""
     try:
-        import requests
-        from bs4 import BeautifulSoup
+        from http_client import obter, extrair_texto
 
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-        }
-        resp = requests.get(url, headers=headers, timeout=15)
+        resp = obter(url, timeout=15)
         resp.raise_for_status()
 
-        soup = BeautifulSoup(resp.text, "html.parser")
-
-        # Remover scripts e estilos
-        for tag in soup(["script", "style", "nav", "footer", "header"]):
-            tag.decompose()
-
-        texto = soup.get_text(separator="\n", strip=True)
-        # Limpar linhas vazias
-        linhas = [l.strip() for l in texto.split("\n") if l.strip()]
-        texto_limpo = "\n".join(linhas)
+        # Página igual à última visita (304 ou mesmo corpo) não é analisada de novo
+        extraido = extrair_texto(resp.content, resp.encoding)
 
-        return {"sucesso": True, "conteudo": texto_limpo[:8000], "titulo": soup.title.string if soup.title else "", "url": url}
+        return {"sucesso": True, "conteudo": extraido["conteudo"][:8000], "titulo": extraido["titulo"], "url": url}
     except Exception as e:
         return {"sucesso": False, "mensagem": str(e)}
 
@@ -426,6 +490,21 @@ def ler_pagina_web(url: str) -> dict:
 #  SKILL 21: Escrever e executar código
 # ═══════════════════════════════════════════════════════════════════
 
+def _podar_codigo():
+    """Cria PASTA_CODIGO e apaga os arquivos mais antigos que MAX_IDADE_CODIGO."""
+    os.makedirs(PASTA_CODIGO, exist_ok=True)
+    limite = time.time() - MAX_IDADE_CODIGO
+    try:
+        for entrada in os.scandir(PASTA_CODIGO):
+            try:
+                if entrada.is_file() and entrada.stat().st_mtime < limite:
+                    os.remove(entrada.path)
+            except OSError:
+                pass
+    except OSError:
+        pass
+
+
 def escrever_e_executar_codigo(linguagem: str, codigo: str, salvar_em: str = None) -> dict:
     """
     Escreve código em qualquer linguagem e opcionalmente executa.
@@ -454,12 +533,15 @@ def escrever_e_executar_codigo(linguagem: str, codigo: str, salvar_em: str = Non
 
         if salvar_em:
             caminho = salvar_em
+            os.makedirs(os.path.dirname(caminho), exist_ok=True)
+            with open(caminho, "w", encoding="utf-8") as f:
+                f.write(codigo)
         else:
-            caminho = os.path.join(tempfile.gettempdir(), f"adk_temp{ext}")
-
-        os.makedirs(os.path.dirname(caminho), exist_ok=True)
-        with open(caminho, "w", encoding="utf-8") as f:
-            f.write(codigo)
+            # Arquivo próprio por execução (chamadas simultâneas não se sobrescrevem)
+            _podar_codigo()
+            fd, caminho = tempfile.mkstemp(prefix="adk_", suffix=ext, dir=PASTA_CODIGO)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(codigo)
 
         resultado = {"sucesso": True, "arquivo": caminho, "mensagem": f"Código {linguagem} salvo em: {caminho}"}
 
@@ -471,11 +553,28 @@ def escrever_e_executar_codigo(linguagem: str, codigo: str, salvar_em: str = Non
             ".ps1": f"powershell -ExecutionPolicy Bypass -File \"{caminho}\"",
         }
 
-        if ext in executaveis and not salvar_em:
+        if ext == ".py" and not salvar_em:
+            # Interpretador já aquecido (numpy/pandas/requests importados)
+            from python_workers import pool_python
+            proc = pool_python().executar(caminho)
+            processo = gerenciador_processos().iniciar(f"python \"{caminho}\"", proc=proc)
+            resultado["execucao"] = _acompanhar(processo, ESPERA_COMANDO)
+            resultado["mensagem"] += f" | Executado!"
+        elif ext in executaveis and not salvar_em:
             exec_result = executar_comando(executaveis[ext])
             resultado["execucao"] = exec_result
             resultado["mensagem"] += f" | Executado!"
 
+        # Terminou de rodar: o arquivo temporário não serve mais
+        # (em segundo plano o processo ainda usa; _podar_codigo apaga depois)
+        execucao = resultado.get("execucao")
+        if execucao and not execucao.get("em_segundo_plano"):
+            try:
+                os.remove(caminho)
+                resultado["mensagem"] += " (arquivo temporário removido)"
+            except OSError:
+                pass
+
         return resultado
     except Exception as e:
         return {"sucesso": False, "mensagem": str(e)}
@@ -485,11 +584,11 @@ def escrever_e_executar_codigo(linguagem: str, codigo: str, salvar_em: str = Non
 #  SKILL 22: Screenshot da tela
 # ═══════════════════════════════════════════════════════════════════
 
-def capturar_screenshot(destino: str = None) -> dict:
-    """Captura print da tela e salva como imagem."""
+def capturar_screenshot(destino: str = None, roi: str = None) -> dict:
+    """Captura print da tela (ou só de um preset de ROI) e salva como imagem."""
     try:
-        import mss
-        from PIL import Image
+        from frame_service import servico_captura
+        from roi_presets import resolver_regiao
 
         if not destino:
             destino = os.path.join(
@@ -499,10 +598,7 @@ def capturar_screenshot(destino: str = None) -> dict:
 
         os.makedirs(os.path.dirname(destino), exist_ok=True)
 
-        with mss.mss() as sct:
-            screenshot = sct.grab(sct.monitors[0])
-            img = Image.frombytes("RGB", screenshot.size, screenshot.bgra, "raw", "BGRX")
-            img.save(destino)
+        servico_captura().frame(regiao=resolver_regiao(roi)).pil().save(destino)
 
         return {"sucesso": True, "mensagem": f"Screenshot salvo: {destino}", "caminho": destino}
     except Exception as e:
@@ -552,8 +648,11 @@ def controlar_mouse_teclado(acao: str, x: int = None, y: int = None, texto: str
     """
     try:
         import pyautogui
+        from frame_service import servico_captura
         pyautogui.FAILSAFE = False
         pyautogui.PAUSE = 0.1
+        if acao != "posicao":
+            servico_captura().sinalizar_interacao()
 
         if acao == "clicar" and x is not None and y is not None:
             pyautogui.click(x, y)
@@ -645,35 +744,100 @@ def skill_buscar_aprendizados(termo: str) -> dict:
     return buscar_aprendizados(termo)
 
 
-def skill_historico_conversa(quantidade: int = 20) -> dict:
-    """Recupera histórico de conversas anteriores."""
-    historico = obter_historico(quantidade)
-    return {"sucesso": True, "mensagens": historico, "total": len(historico)}
+def skill_historico_conversa(quantidade: int = 20, pagina: int = 0, dia: str = None) -> dict:
+    """Recupera histórico de conversas anteriores (paginado) ou o resumo de um dia."""
+    if dia:
+        return resumo_do_dia(dia)
+    resultado = paginar_historico(pagina, quantidade)
+    resultado["total"] = len(resultado["mensagens"])
+    return resultado
+
+
+def skill_buscar_conversas(termo: str, limite: int = 20) -> dict:
+    """Busca mensagens antigas por termo (ranqueadas por relevância)."""
+    return buscar_conversas(termo, limite)
+
+
+def skill_buscar_memoria(consulta: str, quantidade: int = 5) -> dict:
+    """Busca semântica em notas e aprendizados."""
+    return buscar_memoria(consulta, quantidade)
 
 
 # ═══════════════════════════════════════════════════════════════════
 #  SKILL 31-35: Visão Computacional (usam vision_utils.py)
 # ═══════════════════════════════════════════════════════════════════
 
-def skill_detectar_texto_tela(regiao: list = None, idiomas: list = None) -> dict:
+def skill_detectar_texto_tela(regiao: list = None, idiomas: list = None, roi: str = None) -> dict:
     """Detecta todo o texto visível na tela usando OCR."""
     from vision_utils import detectar_texto_tela
-    regiao_tuple = tuple(regiao) if regiao else None
+    regiao_tuple = roi or (tuple(regiao) if regiao else None)
     return detectar_texto_tela(regiao_tuple, idiomas)
 
 
-def skill_localizar_texto(texto: str, regiao: list = None, idiomas: list = None, case_sensitive: bool = False) -> dict:
+def skill_localizar_texto(texto: str, regiao: list = None, idiomas: list = None, case_sensitive: bool = False,
+                          max_erros: int = None, roi: str = None) -> dict:
     """Procura texto específico na tela e retorna coordenadas precisas."""
     from vision_utils import encontrar_texto
-    regiao_tuple = tuple(regiao) if regiao else None
-    return encontrar_texto(texto, regiao_tuple, idiomas, case_sensitive)
+    regiao_tuple = roi or (tuple(regiao) if regiao else None)
+    return encontrar_texto(texto, regiao_tuple, idiomas, case_sensitive, max_erros)
+
 
+def skill_localizar_textos(textos: list, regiao: list = None, idiomas: list = None, max_erros: int = None,
+                           roi: str = None) -> dict:
+    """Procura vários textos na tela com uma única leitura de OCR."""
+    from vision_utils import encontrar_textos
+    regiao_tuple = roi or (tuple(regiao) if regiao else None)
+    return encontrar_textos(textos, regiao_tuple, idiomas, False, max_erros)
 
-def skill_localizar_elemento(imagem_template: str, confianca: float = 0.8, regiao: list = None) -> dict:
+
+def skill_localizar_elemento(imagem_template: str, confianca: float = 0.8, regiao: list = None,
+                             escalas: list = None, roi: str = None) -> dict:
     """Localiza elemento visual (ícone, botão) usando template matching."""
     from vision_utils import localizar_elemento_visual
-    regiao_tuple = tuple(regiao) if regiao else None
-    return localizar_elemento_visual(imagem_template, confianca, regiao_tuple)
+    regiao_tuple = roi or (tuple(regiao) if regiao else None)
+    return localizar_elemento_visual(imagem_template, confianca, regiao_tuple, escalas)
+
+
+def skill_localizar_elementos(imagens_template: list, confianca: float = 0.8, regiao: list = None,
+                              roi: str = None) -> dict:
+    """Localiza vários elementos visuais numa única captura de tela."""
+    from vision_utils import localizar_elementos_visuais
+    regiao_tuple = roi or (tuple(regiao) if regiao else None)
+    return localizar_elementos_visuais(imagens_template, confianca, regiao_tuple)
+
+
+def skill_listar_rois() -> dict:
+    """Lista os presets de ROI (regiões nomeadas) e onde estão agora na tela."""
+    from roi_presets import presets_roi
+    presets = presets_roi()
+    rois = []
+    for nome, preset in sorted(presets.presets().items()):
+        try:
+            regiao = list(presets.resolver(nome))
+        except ValueError:
+            regiao = None
+        rois.append({"nome": nome, "regiao": regiao, **preset})
+    return {"sucesso": True, "rois": rois}
+
+
+def skill_definir_roi(nome: str, regiao: list = None, janela: str = None, relativo: list = None) -> dict:
+    """Cria/atualiza um preset de ROI: retângulo fixo ou janela + retângulo relativo (frações)."""
+    from roi_presets import presets_roi
+    try:
+        preset = presets_roi().definir(nome, regiao, janela, relativo)
+        return {"sucesso": True, "mensagem": f"ROI '{nome}' salva", "preset": preset}
+    except Exception as e:
+        return {"sucesso": False, "mensagem": str(e)}
+
+
+def skill_ler_grafico(roi: str = "tradingview_grafico", max_barras: int = 50, calibrar: bool = True) -> dict:
+    """Lê os candles do gráfico na tela (sem API de dados) e roda a detecção CRT nas últimas barras."""
+    from chart_reader import ler_grafico
+    from strategy.crt_validator import CRTValidator
+    resultado = ler_grafico(roi, calibrar=calibrar, max_barras=max_barras)
+    if resultado.get("sucesso"):
+        resultado["crt"] = CRTValidator().detect_from_bars(resultado["barras"])
+    return resultado
 
 
 def skill_clicar_em_texto(texto: str, tipo_clique: str = "clicar", idiomas: list = None) -> dict:
@@ -682,7 +846,8 @@ def skill_clicar_em_texto(texto: str, tipo_clique: str = "clicar", idiomas: list
     import pyautogui
     
     # Encontrar texto
-    resultado = encontrar_texto(texto, None, idiomas, False)
+    # Sem tolerância a erros de OCR: clicar no texto parecido errado é pior que não achar
+    resultado = encontrar_texto(texto, None, idiomas, False, max_erros=0)
     
     if not resultado.get("sucesso"):
         return resultado
@@ -696,6 +861,8 @@ def skill_clicar_em_texto(texto: str, tipo_clique: str = "clicar", idiomas: list
     
     # Executar clique
     try:
+        from frame_service import servico_captura
+        servico_captura().sinalizar_interacao()
         pyautogui.FAILSAFE = False
         if tipo_clique == "clicar":
             pyautogui.click(x, y)
@@ -757,6 +924,9 @@ def skill_salvar_screenshot_debug(caminho: str = None, mostrar_texto: bool = Tru
 SKILLS_MAP = {
     # Arquivos e terminal
     "executar_comando": executar_comando,
+    "status_comando": status_comando,
+    "cancelar_comando": cancelar_comando,
+    "listar_comandos": listar_comandos,
     "criar_arquivo": criar_arquivo,
     "ler_arquivo": ler_arquivo,
     "editar_arquivo": editar_arquivo,
@@ -797,24 +967,191 @@ SKILLS_MAP = {
     "salvar_aprendizado": skill_salvar_aprendizado,
     "buscar_aprendizados": skill_buscar_aprendizados,
     "historico_conversa": skill_historico_conversa,
+    "buscar_conversas": skill_buscar_conversas,
+    "buscar_memoria": skill_buscar_memoria,
     # Visão Computacional
     "detectar_texto_tela": skill_detectar_texto_tela,
     "localizar_texto": skill_localizar_texto,
+    "localizar_textos": skill_localizar_textos,
     "localizar_elemento": skill_localizar_elemento,
+    "localizar_elementos": skill_localizar_elementos,
+    "listar_rois": skill_listar_rois,
+    "definir_roi": skill_definir_roi,
+    "ler_grafico": skill_ler_grafico,
     "clicar_em_texto": skill_clicar_em_texto,
     "salvar_screenshot_debug": skill_salvar_screenshot_debug,
 }
 
 
 def executar_skill(nome: str, params: dict) -> str:
-    """Executa uma skill pelo nome e retorna JSON."""
+    """Executa uma skill pelo nome e retorna JSON (skills idempotentes passam pelo cache)."""
     if nome in SKILLS_MAP:
+        cache = cache_skills()
+        em_cache = cache.obter(nome, params)
+        if em_cache is not None:
+            return em_cache
+        geracao = cache.geracao()
         func = SKILLS_MAP[nome]
         resultado = func(**params)
-        return json.dumps(resultado, ensure_ascii=False, default=str)
+        texto = json.dumps(resultado, ensure_ascii=False, default=str)
+        cache.registrar(nome, params, resultado, texto, geracao)
+        return texto
     return json.dumps({"sucesso": False, "mensagem": f"Skill '{nome}' não encontrada"})
 
 
+# ═══════════════════════════════════════════════════════════════════
+#  POLÍTICA DE EXECUÇÃO (chamadas paralelas no mesmo turno)
+# ═══════════════════════════════════════════════════════════════════
+
+# Recursos que cada skill lê ("r") ou altera ("w"). Duas chamadas conflitam se
+# disputam um recurso e ao menos uma altera; as conflitantes rodam na ordem em
+# que o modelo pediu, o resto roda em paralelo. "arquivos" é o disco todo;
+# skills com caminho usam "arquivos:<caminho>" (ver recursos_skill).
+# Skills fora da tabela são tratadas como exclusivas ("*").
+RECURSOS_SKILLS = {
+    "executar_comando": {"arquivos": "w", "sistema": "w", "comandos": "w"},
+    "status_comando": {"comandos": "r"},
+    "cancelar_comando": {"comandos": "w", "sistema": "w"},
+    "listar_comandos": {"comandos": "r"},
+    "criar_arquivo": {"arquivos:caminho": "w"},
+    "ler_arquivo": {"arquivos:caminho": "r"},
+    "editar_arquivo": {"arquivos:caminho": "w"},
+    "deletar_arquivo": {"arquivos:caminho": "w"},
+    "listar_arquivos": {"arquivos:diretorio": "r"},
+    "mover_arquivo": {"arquivos:origem": "w", "arquivos:destino": "w"},
+    "copiar_arquivo": {"arquivos:origem": "r", "arquivos:destino": "w"},
+    "criar_pasta": {"arquivos:caminho": "w"},
+    "instalar_pacote_pip": {"sistema": "w"},
+    "instalar_programa": {"sistema": "w", "arquivos": "w"},
+    "info_sistema": {"sistema": "r"},
+    "listar_processos": {"sistema": "r"},
+    "finalizar_processo": {"sistema": "w", "tela": "w"},
+    "abrir_aplicativo": {"sistema": "w", "tela": "w"},
+    "abrir_url": {"tela": "w"},
+    "pesquisar_arquivos": {"arquivos:diretorio": "r"},
+    "pesquisar_conteudo": {"arquivos:diretorio": "r"},
+    "pesquisar_internet": {},
+    "baixar_arquivo": {"arquivos:destino": "w"},
+    "ler_pagina_web": {},
+    "escrever_e_executar_codigo": {"arquivos": "w", "sistema": "w"},
+    "capturar_screenshot": {"tela": "r", "arquivos:destino": "w"},
+    "controlar_mouse_teclado": {"tela": "w"},
+    "salvar_nota": {"memoria": "w"},
+    "buscar_notas": {"memoria": "r"},
+    "listar_notas": {"memoria": "r"},
+    "salvar_tarefa": {"memoria": "w"},
+    "concluir_tarefa": {"memoria": "w"},
+    "listar_tarefas": {"memoria": "r"},
+    "salvar_aprendizado": {"memoria": "w"},
+    "buscar_aprendizados": {"memoria": "r"},
+    "historico_conversa": {"memoria": "r"},
+    "buscar_conversas": {"memoria": "r"},
+    "buscar_memoria": {"memoria": "r"},
+    "detectar_texto_tela": {"tela": "r"},
+    "localizar_texto": {"tela": "r"},
+    "localizar_textos": {"tela": "r"},
+    "localizar_elemento": {"tela": "r"},
+    "localizar_elementos": {"tela": "r"},
+    "listar_rois": {"tela": "r", "rois": "r"},
+    "definir_roi": {"rois": "w"},
+    "ler_grafico": {"tela": "r", "rois": "r"},
+    "clicar_em_texto": {"tela": "w"},
+    "salvar_screenshot_debug": {"tela": "r", "arquivos:caminho": "w"},
+}
+
+# Tempo máximo (s) de espera por skill; o resultado vira erro de timeout
+TIMEOUT_SKILL_PADRAO = 60
+TIMEOUTS_SKILLS = {
+    "executar_comando": 130,            # aos 110s o comando passa para segundo plano
+    "status_comando": 70,               # pode aguardar até 50s
+    "escrever_e_executar_codigo": 130,
+    "instalar_pacote_pip": 600,
+    "instalar_programa": 900,
+    "baixar_arquivo": 600,
+    "pesquisar_arquivos": 120,
+    "pesquisar_conteudo": 120,
+    # OCR: a primeira chamada pode carregar o modelo
+    "detectar_texto_tela": 150,
+    "localizar_texto": 150,
+    "localizar_textos": 150,
+    "clicar_em_texto": 150,
+    "ler_grafico": 150,
+    "salvar_screenshot_debug": 150,
+}
+
+
+def recursos_skill(nome: str, params: dict) -> dict:
+    """Recursos {recurso: "r"|"w"} que uma chamada usa, com os caminhos já resolvidos."""
+    if nome not in RECURSOS_SKILLS:
+        return {"*": "w"}
+    recursos = {}
+    for recurso, modo in RECURSOS_SKILLS[nome].items():
+        if recurso.startswith("arquivos:"):
+            caminho = params.get(recurso.split(":", 1)[1])
+            # Sem caminho (ex.: destino padrão) → não dá para isolar, vale o disco todo
+            recurso = f"arquivos:{os.path.normcase(os.path.abspath(caminho))}" if caminho else "arquivos"
+        if recursos.get(recurso) != "w":
+            recursos[recurso] = modo
+    return recursos
+
+
+def _mesmo_recurso(a: str, b: str) -> bool:
+    if a == b:
+        return True
+    if a.startswith("arquivos") and b.startswith("arquivos"):
+        if a == "arquivos" or b == "arquivos":
+            return True
+        # Um caminho dentro do outro (pasta e arquivo dela)
+        a, b = a[len("arquivos:"):], b[len("arquivos:"):]
+        return a.startswith(b.rstrip(os.sep) + os.sep) or b.startswith(a.rstrip(os.sep) + os.sep)
+    return False
+
+
+def skills_conflitam(recursos_a: dict, recursos_b: dict) -> bool:
+    """True se as duas chamadas não podem rodar ao mesmo tempo."""
+    if "*" in recursos_a or "*" in recursos_b:
+        return True
+    return any(
+        _mesmo_recurso(ra, rb) and "w" in (ma, mb)
+        for ra, ma in recursos_a.items()
+        for rb, mb in recursos_b.items()
+    )
+
+
+def timeout_skill(nome: str) -> float:
+    return TIMEOUTS_SKILLS.get(nome, TIMEOUT_SKILL_PADRAO)
+
+
+# Skills idempotentes e por quanto tempo (s) o resultado vale. Skills que
+# alteram um recurso invalidam o que leu esse recurso (ver RECURSOS_SKILLS).
+CACHE_SKILLS = {
+    "info_sistema": 5,
+    "listar_processos": 5,
+    "ler_arquivo": 60,
+    "listar_arquivos": 30,
+    "pesquisar_arquivos": 30,
+    "pesquisar_conteudo": 30,
+    "pesquisar_internet": 600,
+    "ler_pagina_web": 300,
+    "listar_notas": 60,
+    "buscar_notas": 60,
+    "listar_tarefas": 60,
+    "buscar_aprendizados": 60,
+    "listar_rois": 5,
+}
+
+_cache_skills = None
+
+
+def cache_skills():
+    """Instância única do cache de resultados das skills."""
+    global _cache_skills
+    if _cache_skills is None:
+        from skill_cache import CacheSkills
+        _cache_skills = CacheSkills(CACHE_SKILLS, recursos_skill, skills_conflitam)
+    return _cache_skills
+
+
 # ═══════════════════════════════════════════════════════════════════
 #  DECLARAÇÕES DAS TOOLS (function calling do Gemini)
 # ═══════════════════════════════════════════════════════════════════
@@ -822,16 +1159,45 @@ def executar_skill(nome: str, params: dict) -> str:
 TOOL_DECLARATIONS = [
     {
         "name": "executar_comando",
-        "description": "Executa comando no terminal Windows (PowerShell/CMD). Use para rodar scripts, compilar, instalar, etc.",
+        "description": "Executa comando no terminal Windows (PowerShell/CMD). Use para rodar scripts, compilar, instalar, etc. Se passar de ~110s, continua em segundo plano e devolve um id.",
         "parameters": {
             "type": "object",
             "properties": {
                 "comando": {"type": "string", "description": "O comando a executar"},
-                "diretorio": {"type": "string", "description": "Diretório de trabalho (opcional)"}
+                "diretorio": {"type": "string", "description": "Diretório de trabalho (opcional)"},
+                "segundo_plano": {"type": "boolean", "description": "Não esperar terminar: devolve um id para acompanhar com status_comando (para servidores, builds longos, etc.)"}
             },
             "required": ["comando"]
         }
     },
+    {
+        "name": "status_comando",
+        "description": "Consulta um comando em segundo plano: se ainda roda, código de saída e a saída nova desde a última consulta.",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "id": {"type": "integer", "description": "Id devolvido por executar_comando"},
+                "aguardar": {"type": "number", "description": "Segundos para esperar o comando terminar antes de responder (máx. 50, padrão: 0)"}
+            },
+            "required": ["id"]
+        }
+    },
+    {
+        "name": "cancelar_comando",
+        "description": "Mata um comando que está rodando em segundo plano.",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "id": {"type": "integer", "description": "Id do comando"}
+            },
+            "required": ["id"]
+        }
+    },
+    {
+        "name": "listar_comandos",
+        "description": "Lista os comandos em segundo plano (rodando e terminados recentemente).",
+        "parameters": {"type": "object", "properties": {}}
+    },
     {
         "name": "criar_arquivo",
         "description": "Cria ou sobrescreve um arquivo com conteúdo. Códigos, scripts, configs, HTML, qualquer coisa.",
@@ -920,8 +1286,13 @@ TOOL_DECLARATIONS = [
     },
     {
         "name": "info_sistema",
-        "description": "Informações do sistema: CPU, RAM, disco, processos.",
-        "parameters": {"type": "object", "properties": {}}
+        "description": "Informações do sistema: CPU, RAM, disco, processos. Com historico_minutos, inclui a tendência de CPU/RAM desse período.",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "historico_minutos": {"type": "number", "description": "Minutos de histórico de CPU/RAM (opcional, até 10)"}
+            }
+        }
     },
     {
         "name": "listar_processos",
@@ -957,7 +1328,8 @@ TOOL_DECLARATIONS = [
             "properties": {
                 "diretorio": {"type": "string", "description": "Diretório raiz"},
                 "termo": {"type": "string", "description": "Termo de busca"},
-                "extensoes": {"type": "string", "description": "Extensões (.py,.txt)"}
+                "extensoes": {"type": "string", "description": "Extensões (.py,.txt)"},
+                "regex": {"type": "boolean", "description": "Termo é uma expressão regular (padrão: false)"}
             },
             "required": ["diretorio", "termo"]
         }
@@ -970,7 +1342,8 @@ TOOL_DECLARATIONS = [
             "properties": {
                 "diretorio": {"type": "string", "description": "Diretório raiz"},
                 "texto": {"type": "string", "description": "Texto a buscar"},
-                "extensao": {"type": "string", "description": "Extensão (.py)"}
+                "extensao": {"type": "string", "description": "Extensão (.py)"},
+                "regex": {"type": "boolean", "description": "Texto é uma expressão regular (padrão: false)"}
             },
             "required": ["diretorio", "texto"]
         }
@@ -990,12 +1363,13 @@ TOOL_DECLARATIONS = [
     },
     {
         "name": "baixar_arquivo",
-        "description": "Baixa arquivo de qualquer URL para o disco local.",
+        "description": "Baixa arquivo de qualquer URL para o disco local (em partes paralelas; se for interrompido, chamar de novo com o mesmo destino retoma).",
         "parameters": {
             "type": "object",
             "properties": {
                 "url": {"type": "string", "description": "URL do arquivo"},
-                "destino": {"type": "string", "description": "Caminho local para salvar (opcional)"}
+                "destino": {"type": "string", "description": "Caminho local para salvar (opcional)"},
+                "sha256": {"type": "string", "description": "Hash SHA-256 esperado, para verificar o arquivo (opcional)"}
             },
             "required": ["url"]
         }
@@ -1030,7 +1404,8 @@ TOOL_DECLARATIONS = [
         "parameters": {
             "type": "object",
             "properties": {
-                "destino": {"type": "string", "description": "Caminho para salvar (opcional)"}
+                "destino": {"type": "string", "description": "Caminho para salvar (opcional)"},
+                "roi": {"type": "string", "description": "Nome de preset de ROI para capturar só essa área (ex: 'tradingview_grafico', 'mt5_ordens')"}
             }
         }
     },
@@ -1142,10 +1517,38 @@ TOOL_DECLARATIONS = [
     },
     {
         "name": "historico_conversa",
-        "description": "Recupera mensagens de conversas anteriores. Use quando o usuário pedir para continuar ou revisar algo que falaram antes.",
+        "description": "Recupera mensagens de conversas anteriores, página por página (pagina=0 são as mais recentes, 1 as anteriores, etc). Com 'dia' retorna o resumo daquele dia. Use quando o usuário pedir para continuar ou revisar algo que falaram antes.",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "quantidade": {"type": "integer", "description": "Mensagens por página (padrão: 20)"},
+                "pagina": {"type": "integer", "description": "Página, 0 = mais recentes (padrão: 0)"},
+                "dia": {"type": "string", "description": "Data AAAA-MM-DD para ver o resumo do dia (opcional)"}
+            }
+        }
+    },
+    {
+        "name": "buscar_conversas",
+        "description": "Busca mensagens antigas da conversa por palavra-chave (ignora acentos, mais relevantes primeiro). Use quando o usuário mencionar algo que já foi conversado.",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "termo": {"type": "string", "description": "Termo de busca"},
+                "limite": {"type": "integer", "description": "Máximo de mensagens (padrão: 20)"}
+            },
+            "required": ["termo"]
+        }
+    },
+    {
+        "name": "buscar_memoria",
+        "description": "Busca por SIGNIFICADO nas notas e aprendizados salvos (não precisa das palavras exatas). Use para lembrar algo relacionado ao assunto atual.",
         "parameters": {
             "type": "object",
-            "properties": {"quantidade": {"type": "integer", "description": "Número de mensagens (padrão: 20)"}}
+            "properties": {
+                "consulta": {"type": "string", "description": "Assunto ou pergunta"},
+                "quantidade": {"type": "integer", "description": "Número de resultados (padrão: 5)"}
+            },
+            "required": ["consulta"]
         }
     },
     # ═══ VISÃO COMPUTACIONAL ═══
@@ -1156,7 +1559,8 @@ TOOL_DECLARATIONS = [
             "type": "object",
             "properties": {
                 "regiao": {"type": "array", "description": "[x, y, largura, altura] para região específica (opcional)", "items": {"type": "integer"}},
-                "idiomas": {"type": "array", "description": "Idiomas: ['pt', 'en', 'es'] (padrão: ['pt', 'en'])", "items": {"type": "string"}}
+                "idiomas": {"type": "array", "description": "Idiomas: ['pt', 'en', 'es'] (padrão: ['pt', 'en'])", "items": {"type": "string"}},
+                "roi": {"type": "string", "description": "Nome de preset de ROI no lugar de regiao (ex: 'tradingview_grafico', 'mt5_ordens')"}
             }
         }
     },
@@ -1169,24 +1573,88 @@ TOOL_DECLARATIONS = [
                 "texto": {"type": "string", "description": "Texto a procurar (ex: 'Enviar', 'Login', 'Campo de mensagem')"},
                 "regiao": {"type": "array", "description": "[x, y, largura, altura] (opcional)", "items": {"type": "integer"}},
                 "idiomas": {"type": "array", "description": "Idiomas para OCR (opcional)", "items": {"type": "string"}},
-                "case_sensitive": {"type": "boolean", "description": "Diferenciar maiúsculas (padrão: false)"}
+                "case_sensitive": {"type": "boolean", "description": "Diferenciar maiúsculas (padrão: false)"},
+                "max_erros": {"type": "integer", "description": "Letras erradas toleradas pelo OCR (padrão: automático pelo tamanho)"},
+                "roi": {"type": "string", "description": "Nome de preset de ROI no lugar de regiao (ex: 'tradingview_grafico', 'mt5_ordens')"}
             },
             "required": ["texto"]
         }
     },
+    {
+        "name": "localizar_textos",
+        "description": "LOCALIZA vários textos de uma vez com uma única leitura da tela. Retorna coordenadas de cada um (ignora acentos, tolera erros de OCR).",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "textos": {"type": "array", "description": "Textos a procurar", "items": {"type": "string"}},
+                "regiao": {"type": "array", "description": "[x, y, largura, altura] (opcional)", "items": {"type": "integer"}},
+                "idiomas": {"type": "array", "description": "Idiomas para OCR (opcional)", "items": {"type": "string"}},
+                "max_erros": {"type": "integer", "description": "Letras erradas toleradas pelo OCR (padrão: automático pelo tamanho)"},
+                "roi": {"type": "string", "description": "Nome de preset de ROI no lugar de regiao (ex: 'tradingview_grafico', 'mt5_ordens')"}
+            },
+            "required": ["textos"]
+        }
+    },
     {
         "name": "localizar_elemento",
-        "description": "Localiza elemento VISUAL (ícone, botão, imagem) usando template matching. Requer imagem do elemento como referência.",
+        "description": "Localiza elemento VISUAL (ícone, botão, imagem) usando template matching. Requer imagem do elemento como referência. Funciona com zoom/HiDPI (busca em várias escalas).",
         "parameters": {
             "type": "object",
             "properties": {
                 "imagem_template": {"type": "string", "description": "Caminho da imagem template (PNG/JPG)"},
                 "confianca": {"type": "number", "description": "Confiança mínima 0.0-1.0 (padrão: 0.8)"},
-                "regiao": {"type": "array", "description": "[x, y, largura, altura] (opcional)", "items": {"type": "integer"}}
+                "regiao": {"type": "array", "description": "[x, y, largura, altura] (opcional)", "items": {"type": "integer"}},
+                "escalas": {"type": "array", "description": "Escalas do template a testar (padrão: 0.5 a 2.0)", "items": {"type": "number"}},
+                "roi": {"type": "string", "description": "Nome de preset de ROI no lugar de regiao (ex: 'tradingview_grafico', 'mt5_ordens')"}
             },
             "required": ["imagem_template"]
         }
     },
+    {
+        "name": "localizar_elementos",
+        "description": "Localiza VÁRIOS elementos visuais (ícones, botões) de uma vez, com uma única captura de tela.",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "imagens_template": {"type": "array", "description": "Caminhos das imagens template (PNG/JPG)", "items": {"type": "string"}},
+                "confianca": {"type": "number", "description": "Confiança mínima 0.0-1.0 (padrão: 0.8)"},
+                "regiao": {"type": "array", "description": "[x, y, largura, altura] (opcional)", "items": {"type": "integer"}},
+                "roi": {"type": "string", "description": "Nome de preset de ROI no lugar de regiao (ex: 'tradingview_grafico', 'mt5_ordens')"}
+            },
+            "required": ["imagens_template"]
+        }
+    },
+    {
+        "name": "listar_rois",
+        "description": "Lista as regiões nomeadas (ROI) da tela, como o gráfico do TradingView ou o painel de ordens do MT5, com as coordenadas atuais.",
+        "parameters": {"type": "object", "properties": {}}
+    },
+    {
+        "name": "definir_roi",
+        "description": "Cria ou ajusta uma região nomeada (ROI): um retângulo fixo da tela, ou uma janela (trecho do título) + retângulo relativo a ela.",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "nome": {"type": "string", "description": "Nome da ROI"},
+                "regiao": {"type": "array", "description": "[x, y, largura, altura] fixo (opcional)", "items": {"type": "integer"}},
+                "janela": {"type": "string", "description": "Trecho do título da janela (opcional)"},
+                "relativo": {"type": "array", "description": "[x, y, largura, altura] em frações da janela, 0.0-1.0 (padrão: janela inteira)", "items": {"type": "number"}}
+            },
+            "required": ["nome"]
+        }
+    },
+    {
+        "name": "ler_grafico",
+        "description": "Lê os candles (OHLC) direto da imagem do gráfico na tela e faz a detecção CRT nas últimas barras. Use quando não houver feed de dados. Valores em preço se o eixo for legível, senão em pixels.",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "roi": {"type": "string", "description": "ROI da área dos candles (padrão: 'tradingview_grafico')"},
+                "max_barras": {"type": "integer", "description": "Quantas barras recentes devolver (padrão: 50)"},
+                "calibrar": {"type": "boolean", "description": "Ler o eixo de preço com OCR para converter em preço (padrão: true)"}
+            }
+        }
+    },
     {
         "name": "clicar_em_texto",
         "description": "COMBO PODEROSO: Localiza texto via OCR e CLICA AUTOMATICAMENTE! Use para clicar em botões, links, campos. Exemplo: clicar_em_texto('Enviar') ou clicar_em_texto('Campo de mensagem')",
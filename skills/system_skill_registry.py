@@ -40,12 +40,33 @@ def get_trading_session(**kwargs):
 
 
 def check_health(**kwargs):
-    """Check system health"""
-    print("✅ System: Health check OK")
+    """Check system health (from the background metrics sampler)"""
+    import time
+    import psutil
+    from system_metrics import amostrador_sistema
+
+    sampler = amostrador_sistema()
+    current = sampler.atual()
+    trend = sampler.tendencia(5)
+    high = [
+        name for name, value in (
+            ("cpu", trend.get("cpu_percent", {}).get("media", current["cpu_percent"])),
+            ("ram", current["ram_percent"]),
+            ("disk", current["disco_percent"]),
+        ) if value >= 90
+    ]
+    health = "OK" if not high else "HIGH_" + "_".join(high).upper()
+    print(f"✅ System: Health check {health}")
     return {
         "status": "success",
-        "health": "OK",
-        "uptime": "N/A"  # TODO: Track actual uptime
+        "health": health,
+        "uptime": int(time.time() - psutil.boot_time()),
+        "agent_uptime": int(time.time() - psutil.Process().create_time()),
+        "cpu_percent": current["cpu_percent"],
+        "ram_percent": current["ram_percent"],
+        "disk_percent": current["disco_percent"],
+        "cpu_5min": trend.get("cpu_percent"),
+        "ram_5min": trend.get("ram_percent")
     }
 
 
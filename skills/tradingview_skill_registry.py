@@ -59,6 +59,16 @@ def draw_horizontal_line(price=None, color="blue", **kwargs):
     return {"status": "success", "price": price}
 
 
+def read_chart(roi="tradingview_grafico", max_bars=50, **kwargs):
+    """Read candle geometry from the chart on screen"""
+    from chart_reader import ler_grafico
+    result = ler_grafico(roi, max_barras=max_bars)
+    if not result.get("sucesso"):
+        return {"status": "error", "message": result.get("mensagem")}
+    print(f"🕯️ TradingView: Read {result['total']} bars ({result['unidade']})")
+    return {"status": "success", "bars": result["barras"], "unit": result["unidade"]}
+
+
 # Export skill registry
 SKILLS = {
     "change_timeframe": change_timeframe,
@@ -67,5 +77,6 @@ SKILLS = {
     "open_trade_panel": open_trade_panel,
     "execute_market_order": execute_market_order,
     "set_alert": set_alert,
-    "draw_horizontal_line": draw_horizontal_line
+    "draw_horizontal_line": draw_horizontal_line,
+    "read_chart": read_chart
 }
@@ -156,6 +156,55 @@ class CRTValidator:
             "layer": 11
         }
     
+    def detect_from_bars(self, bars: list, includes_forming: bool = True) -> dict:
+        """
+        Detecção CRT a partir de uma série de barras (ex.: lida do gráfico)
+
+        Candle 1 (penúltima barra fechada) define o range; candle 2 (última
+        barra fechada) varre a máxima ou a mínima e fecha de volta dentro do range.
+
+        Args:
+            bars: [{"open", "high", "low", "close"}] em ordem cronológica
+            includes_forming: a última barra ainda está se formando (caso do
+                              gráfico ao vivo) e é ignorada
+
+        Returns:
+            dict: campos de trade_data (liquidity_identified, liquidity_swept)
+                  + "direction" ("BUY" / "SELL" / None) e o range do candle 1
+        """
+
+        if includes_forming:
+            bars = bars[:-1]
+
+        if len(bars) < 2:
+            return {
+                "liquidity_identified": False,
+                "liquidity_swept": False,
+                "direction": None,
+                "reason": "Barras insuficientes"
+            }
+
+        c1, c2 = bars[-2], bars[-1]
+        range_high, range_low = c1['high'], c1['low']
+        inside = range_low < c2['close'] < range_high
+
+        # Varreu a mínima e fechou dentro → compra; varreu a máxima → venda
+        direction = None
+        if c2['low'] < range_low and inside:
+            direction = "BUY"
+        elif c2['high'] > range_high and inside:
+            direction = "SELL"
+
+        return {
+            "liquidity_identified": range_high > range_low,
+            "liquidity_swept": direction is not None,
+            "direction": direction,
+            "range_high": range_high,
+            "range_low": range_low,
+            "reason": f"CRT {direction}: candle 2 varreu o range do candle 1" if direction
+                      else "Sem varredura de liquidez no último candle fechado"
+        }
+
     def validate_complete(self, trade_data: dict, trade_history: dict = None) -> dict:
         """
         Validação completa através de todas as camadas CRT
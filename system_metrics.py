@@ -0,0 +1,150 @@
+"""
+System Metrics — Amostragem contínua de CPU, RAM, disco e processos.
+Uma thread de fundo coleta as métricas em intervalos fixos e guarda as
+últimas amostras num buffer circular, então info_sistema, listar_processos
+e check_health respondem na hora (sem o cpu_percent(interval=1) bloqueando)
+e ainda têm a tendência dos últimos minutos.
+"""
+
+import os
+import time
+import threading
+from collections import deque
+from typing import Dict, List
+
+import psutil
+
+DISCO = "C:\\" if os.name == "nt" else "/"
+
+
+class AmostradorSistema:
+    """Amostras periódicas do sistema num buffer circular."""
+
+    INTERVALO = 2.0              # CPU/RAM
+    INTERVALO_PROCESSOS = 5.0    # varrer todos os processos é mais caro
+    INTERVALO_DISCO = 30.0
+    MAX_AMOSTRAS = 300           # 10 minutos a cada 2s
+
+    def __init__(self):
+        self.amostras = deque(maxlen=self.MAX_AMOSTRAS)
+        self._processos = []
+        self._disco = None
+        self._ultimo_processos = 0.0
+        self._ultimo_disco = 0.0
+        self._lock = threading.Lock()
+        self._parar = threading.Event()
+        self._thread = None
+        self.iniciado = time.time()
+
+    def iniciar(self):
+        if self._thread is not None:
+            return
+        # Primeira amostra síncrona (curta) para já ter o que responder
+        psutil.cpu_percent(interval=0.1)
+        self._amostrar(time.monotonic(), cpu=psutil.cpu_percent(interval=0.1))
+        self._thread = threading.Thread(target=self._loop, name="metricas-sistema", daemon=True)
+        self._thread.start()
+
+    def parar(self):
+        self._parar.set()
+
+    def _loop(self):
+        while not self._parar.wait(self.INTERVALO):
+            try:
+                self._amostrar(time.monotonic())
+            except Exception as e:
+                print(f"[Metricas] Erro na amostragem: {e}")
+
+    def _amostrar(self, agora: float, cpu: float = None):
+        # cpu_percent(None) mede desde a chamada anterior — não bloqueia
+        cpu = psutil.cpu_percent(interval=None) if cpu is None else cpu
+        memoria = psutil.virtual_memory()
+        if self._disco is None or agora - self._ultimo_disco >= self.INTERVALO_DISCO:
+            self._disco = psutil.disk_usage(DISCO)
+            self._ultimo_disco = agora
+        if not self._processos or agora - self._ultimo_processos >= self.INTERVALO_PROCESSOS:
+            processos = self._coletar_processos()
+            self._ultimo_processos = agora
+        else:
+            processos = None
+
+        amostra = {
+            "instante": time.time(),
+            "cpu_percent": cpu,
+            "ram_total_gb": round(memoria.total / (1024**3), 1),
+            "ram_usada_gb": round(memoria.used / (1024**3), 1),
+            "ram_percent": memoria.percent,
+            "disco_total_gb": round(self._disco.total / (1024**3), 1),
+            "disco_usado_gb": round(self._disco.used / (1024**3), 1),
+            "disco_percent": self._disco.percent,
+            "processos_ativos": len(processos) if processos is not None else len(self._processos),
+        }
+        with self._lock:
+            self.amostras.append(amostra)
+            if processos is not None:
+                self._processos = processos
+
+    @staticmethod
+    def _coletar_processos() -> List[Dict]:
+        # process_iter reaproveita os objetos Process entre chamadas, então o
+        # cpu_percent de cada um é o uso desde a varredura anterior
+        processos = []
+        for proc in psutil.process_iter(['pid', 'name', 'cpu_percent', 'memory_percent']):
+            try:
+                info = proc.info
+                processos.append({
+                    "pid": info['pid'],
+                    "nome": info['name'] or "",
+                    "cpu": info['cpu_percent'] or 0.0,
+                    "memoria": round(info['memory_percent'] or 0.0, 1)
+                })
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                pass
+        processos.sort(key=lambda x: x['cpu'], reverse=True)
+        return processos
+
+    def atual(self) -> Dict:
+        """Última amostra."""
+        with self._lock:
+            return dict(self.amostras[-1])
+
+    def processos(self, filtro: str = None) -> List[Dict]:
+        """Processos da última varredura (ordenados por CPU), opcionalmente filtrados por nome."""
+        with self._lock:
+            processos = self._processos
+        if filtro:
+            filtro = filtro.lower()
+            processos = [p for p in processos if filtro in p['nome'].lower()]
+        return list(processos)
+
+    def tendencia(self, minutos: float = 5) -> Dict:
+        """Mín/média/máx de CPU e RAM nos últimos minutos, com a série de amostras."""
+        limite = time.time() - minutos * 60
+        with self._lock:
+            janela = [a for a in self.amostras if a["instante"] >= limite]
+        resumo = {"amostras": len(janela), "minutos": minutos}
+        for campo in ("cpu_percent", "ram_percent"):
+            valores = [a[campo] for a in janela]
+            if valores:
+                resumo[campo] = {
+                    "min": min(valores), "media": round(sum(valores) / len(valores), 1), "max": max(valores)
+                }
+        resumo["serie"] = [
+            {"instante": round(a["instante"], 1), "cpu": a["cpu_percent"], "ram": a["ram_percent"]}
+            for a in janela
+        ]
+        return resumo
+
+
+_amostrador = None
+_amostrador_lock = threading.Lock()
+
+
+def amostrador_sistema() -> AmostradorSistema:
+    """Instância única do amostrador (inicia na primeira chamada)."""
+    global _amostrador
+    with _amostrador_lock:
+        if _amostrador is None:
+            _amostrador = AmostradorSistema()
+            _amostrador.iniciar()
+        return _amostrador
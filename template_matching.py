@@ -0,0 +1,145 @@
+"""
+Template Matching — Motor de localização de elementos por imagem.
+Templates ficam em cache já em tons de cinza (e redimensionados por escala),
+a busca é multi-escala (HiDPI, zoom do TradingView) e usa pirâmide de
+imagens: casa primeiro numa versão reduzida do frame e só refina em
+resolução cheia em volta dos melhores candidatos. Vários templates são
+procurados no mesmo frame, reaproveitando a pirâmide.
+"""
+
+import os
+import threading
+import cv2
+import numpy as np
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+class CacheTemplates:
+    """Templates pré-processados, invalidados quando o arquivo muda."""
+
+    def __init__(self, max_itens: int = 64):
+        self.max_itens = max_itens
+        self._itens = OrderedDict()   # caminho -> (mtime, tamanho, {escala: cinza})
+        self._lock = threading.Lock()
+
+    def obter(self, caminho: str, escala: float = 1.0) -> Optional[np.ndarray]:
+        """Template em cinza na escala pedida (None se não puder ser lido)."""
+        try:
+            info = os.stat(caminho)
+        except OSError:
+            return None
+        with self._lock:
+            item = self._itens.get(caminho)
+            if item is None or item[0] != info.st_mtime or item[1] != info.st_size:
+                original = cv2.imread(caminho, cv2.IMREAD_GRAYSCALE)
+                if original is None:
+                    return None
+                item = (info.st_mtime, info.st_size, {1.0: original})
+                self._itens[caminho] = item
+            self._itens.move_to_end(caminho)
+            while len(self._itens) > self.max_itens:
+                self._itens.popitem(last=False)
+            versoes = item[2]
+            if escala not in versoes:
+                h, w = versoes[1.0].shape
+                tamanho = (max(1, round(w * escala)), max(1, round(h * escala)))
+                interp = cv2.INTER_AREA if escala < 1.0 else cv2.INTER_LINEAR
+                versoes[escala] = cv2.resize(versoes[1.0], tamanho, interpolation=interp)
+            return versoes[escala]
+
+    def limpar(self):
+        with self._lock:
+            self._itens.clear()
+
+
+class MotorTemplates:
+    """Busca multi-escala e multi-template com refinamento coarse-to-fine."""
+
+    ESCALAS = (1.0, 1.25, 0.8, 1.5, 0.67, 1.75, 2.0, 0.5)   # mais prováveis primeiro
+    NIVEIS_PIRAMIDE = 2      # reduções pela metade usadas na busca grossa
+    MIN_LADO_GROSSO = 12     # template menor que isso no nível reduzido → busca direta
+    CANDIDATOS = 5           # picos da busca grossa refinados em resolução cheia
+    CONFIANCA_SUFICIENTE = 0.95   # para de testar escalas ao achar algo assim
+
+    def __init__(self, cache: CacheTemplates = None):
+        self.cache = cache or CacheTemplates()
+
+    def piramide(self, cinza: np.ndarray) -> List[np.ndarray]:
+        niveis = [cinza]
+        for _ in range(self.NIVEIS_PIRAMIDE):
+            if min(niveis[-1].shape[:2]) < 2 * self.MIN_LADO_GROSSO:
+                break
+            niveis.append(cv2.pyrDown(niveis[-1]))
+        return niveis
+
+    def _casar(self, piramide: List[np.ndarray], tpl: np.ndarray) -> Tuple[float, Tuple[int, int]]:
+        """Melhor (confiança, (x, y)) do template no frame, usando a pirâmide."""
+        frame = piramide[0]
+        h, w = tpl.shape
+        if h > frame.shape[0] or w > frame.shape[1]:
+            return -1.0, (0, 0)
+
+        nivel = 0
+        for n in range(len(piramide) - 1, 0, -1):
+            if min(h, w) >> n >= self.MIN_LADO_GROSSO:
+                nivel = n
+                break
+        if nivel == 0:
+            _, valor, _, loc = cv2.minMaxLoc(cv2.matchTemplate(frame, tpl, cv2.TM_CCOEFF_NORMED))
+            return valor, loc
+
+        # Busca grossa no nível reduzido
+        fator = 1 << nivel
+        tpl_grosso = cv2.resize(tpl, (w // fator, h // fator), interpolation=cv2.INTER_AREA)
+        mapa = cv2.matchTemplate(piramide[nivel], tpl_grosso, cv2.TM_CCOEFF_NORMED)
+        candidatos = []
+        for _ in range(self.CANDIDATOS):
+            _, valor, _, (cx, cy) = cv2.minMaxLoc(mapa)
+            if valor <= -1.0:
+                break
+            candidatos.append((cx, cy))
+            # Suprime a vizinhança do pico para achar o próximo
+            mapa[max(0, cy - tpl_grosso.shape[0] // 2):cy + tpl_grosso.shape[0] // 2 + 1,
+                 max(0, cx - tpl_grosso.shape[1] // 2):cx + tpl_grosso.shape[1] // 2 + 1] = -1.0
+
+        # Refinamento em resolução cheia em volta de cada candidato
+        melhor = (-1.0, (0, 0))
+        folga = 2 * fator
+        fh, fw = frame.shape
+        for cx, cy in candidatos:
+            x0, y0 = max(0, cx * fator - folga), max(0, cy * fator - folga)
+            x1, y1 = min(fw, cx * fator + w + folga), min(fh, cy * fator + h + folga)
+            if x1 - x0 < w or y1 - y0 < h:
+                continue
+            _, valor, _, loc = cv2.minMaxLoc(cv2.matchTemplate(frame[y0:y1, x0:x1], tpl, cv2.TM_CCOEFF_NORMED))
+            if valor > melhor[0]:
+                melhor = (valor, (loc[0] + x0, loc[1] + y0))
+        return melhor
+
+    def localizar(self, frame_cinza: np.ndarray, templates: Sequence[str],
+                  escalas: Sequence[float] = None) -> Dict[str, Dict]:
+        """
+        Procura cada template no frame (em cinza), em várias escalas.
+
+        Returns:
+            {caminho: {"confianca", "bbox": [x1, y1, x2, y2], "escala"}} — ou
+            {caminho: {"erro": str}} se o template não puder ser lido
+        """
+        piramide = self.piramide(frame_cinza)
+        resultados = {}
+        for caminho in templates:
+            if self.cache.obter(caminho) is None:
+                resultados[caminho] = {"erro": f"Template não encontrado ou inválido: {caminho}"}
+                continue
+            melhor = {"confianca": -1.0, "bbox": None, "escala": None}
+            for escala in escalas or self.ESCALAS:
+                tpl = self.cache.obter(caminho, escala)
+                valor, (x, y) = self._casar(piramide, tpl)
+                if valor > melhor["confianca"]:
+                    h, w = tpl.shape
+                    melhor = {"confianca": float(valor), "bbox": [x, y, x + w, y + h], "escala": escala}
+                if melhor["confianca"] >= self.CONFIANCA_SUFICIENTE:
+                    break
+            resultados[caminho] = melhor
+        return resultados
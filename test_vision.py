@@ -58,6 +58,22 @@ def test_localizar_texto(texto_procurar):
     return resultado
 
 
+def test_busca_exata_indice():
+    """Teste 0: busca exata no índice do OCR (sem tela) — consultas com trigramas repetidos"""
+    from ocr_index import IndiceOCR
+    
+    textos = [
+        {"texto": t, "confianca": 0.9, "bbox": [0, 0, 10, 10], "centro": [5, 5]}
+        for t in ("10000", "Banana", "Saldo 10000", "Configurações")
+    ]
+    indice = IndiceOCR(textos)
+    for consulta, esperados in (("10000", 2), ("banana", 1), ("saldo 10000", 1), ("configuracoes", 1)):
+        achados = indice.buscar(consulta, max_erros=0)
+        assert len(achados) == esperados, f"'{consulta}': {len(achados)} ocorrências (esperado {esperados})"
+    assert indice.buscar("Confguracoes", max_erros=0) == []
+    print("✅ Busca exata no índice OK")
+
+
 def test_screenshot_debug():
     """Teste 3: Salvar screenshot com anotações"""
     print("=" * 60)
@@ -103,6 +119,9 @@ def test_screenshot_debug():
 if __name__ == "__main__":
     print("\n🎯 ADK AGENT — Teste de Visão Computacional\n")
     
+    # Teste 0: índice do OCR (não usa a tela)
+    test_busca_exata_indice()
+    
     # Teste 1: OCR básico
     test_ocr_basico()
     
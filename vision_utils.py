@@ -6,51 +6,78 @@ OCR, detecção de elementos, template matching e localização precisa.
 import os
 import cv2
 import numpy as np
-import mss
 from PIL import Image
 from typing import Dict, List, Tuple, Optional, Any
 import io
 import base64
 
+from ocr_cache import CacheOCR
+from ocr_incremental import OCRIncremental
+from ocr_index import IndiceOCR
+from ocr_worker import ServicoOCR
+from template_matching import MotorTemplates
+from frame_service import servico_captura
+from roi_presets import resolver_regiao
+
 
 # ═══════════════════════════════════════════════════════════════════
 #  OCR Engine — Detecção de Texto na Tela
 # ═══════════════════════════════════════════════════════════════════
 
-_easyocr_reader = None
+OCR_EM_PROCESSO = True      # False roda o EasyOCR dentro do processo do agente
+
+_easyocr_readers = {}       # tuple(idiomas) -> easyocr.Reader
+_servico_ocr = ServicoOCR()
+_cache_ocr = CacheOCR(max_itens=32, ttl=10.0)
+_ocr_incremental = OCRIncremental()
+_ultimo_indice_ocr = None   # (textos, IndiceOCR) da última busca
 
 
 def _get_easyocr_reader(languages=['pt', 'en']):
-    """Singleton do EasyOCR Reader (carrega apenas uma vez)."""
-    global _easyocr_reader
-    if _easyocr_reader is None:
+    """EasyOCR Reader no próprio processo (carrega uma vez por conjunto de idiomas)."""
+    chave = tuple(languages)
+    if chave not in _easyocr_readers:
         try:
             import easyocr
-            _easyocr_reader = easyocr.Reader(languages, gpu=False, verbose=False)
+            _easyocr_readers[chave] = easyocr.Reader(list(languages), gpu=False, verbose=False)
         except Exception as e:
             print(f"[VisionUtils] Erro ao inicializar EasyOCR: {e}")
-            _easyocr_reader = None
-    return _easyocr_reader
+            return None
+    return _easyocr_readers[chave]
+
+
+def _leitor_ocr(idiomas: List[str]):
+    """Função OCR (img -> resultados do EasyOCR): processo dedicado ou reader local."""
+    if OCR_EM_PROCESSO:
+        return _servico_ocr.leitor(idiomas)
+    reader = _get_easyocr_reader(idiomas)
+    return reader.readtext if reader is not None else None
 
 
-def capturar_tela_cv() -> np.ndarray:
-    """Captura a tela inteira e retorna como array numpy (BGR)."""
-    with mss.mss() as sct:
-        monitor = sct.monitors[0]  # Tela inteira
-        screenshot = sct.grab(monitor)
-        # Converter para numpy array (BGR para OpenCV)
-        img = np.array(screenshot)
-        img = cv2.cvtColor(img, cv2.COLOR_BGRA2BGR)
-        return img
+def capturar_tela_cv(max_idade: float = None, regiao=None) -> np.ndarray:
+    """
+    Tela (ou só a região) como array numpy (BGR), vinda do serviço de captura compartilhado.
+    O array é somente-leitura (outros consumidores usam o mesmo frame) — copie antes de desenhar.
+    
+    Args:
+        max_idade: idade máxima do frame reaproveitado, em segundos
+        regiao: (x, y, largura, altura) ou nome de preset de ROI — o mss captura só esse retângulo
+    """
+    return servico_captura().frame(0, max_idade, resolver_regiao(regiao)).bgr()
 
 
-def detectar_texto_tela(regiao: Tuple[int, int, int, int] = None, idiomas: List[str] = None) -> Dict[str, Any]:
+def detectar_texto_tela(regiao: Tuple[int, int, int, int] = None, idiomas: List[str] = None,
+                        usar_cache: bool = True) -> Dict[str, Any]:
     """
     Detecta todo o texto visível na tela usando OCR.
+    Se os pixels da região não mudaram (e o TTL não expirou), devolve o
+    resultado anterior do cache sem rodar o OCR de novo; se mudaram, o OCR
+    roda só nos retângulos alterados (ver ocr_incremental).
     
     Args:
-        regiao: (x, y, largura, altura) para região específica. Se None, usa tela inteira.
+        regiao: (x, y, largura, altura) ou nome de preset de ROI ('tradingview_grafico'). Se None, usa tela inteira.
         idiomas: Lista de idiomas ['pt', 'en', 'es']. Padrão: ['pt', 'en']
+        usar_cache: False força um OCR novo
     
     Returns:
         {
@@ -60,32 +87,34 @@ def detectar_texto_tela(regiao: Tuple[int, int, int, int] = None, idiomas: List[
         }
     """
     try:
-        # Capturar tela
-        img = capturar_tela_cv()
-        
-        # Aplicar região se especificada
+        # Capturar só a região (ou a tela inteira)
+        regiao = resolver_regiao(regiao)
+        img = capturar_tela_cv(regiao=regiao)
         if regiao:
-            x, y, w, h = regiao
-            img = img[y:y+h, x:x+w]
+            regiao = (max(0, regiao[0]), max(0, regiao[1])) + regiao[2:]
         
-        # Usar EasyOCR
         idiomas = idiomas or ['pt', 'en']
-        reader = _get_easyocr_reader(idiomas)
+        chave = _cache_ocr.chave(img, regiao, idiomas)
+        if usar_cache:
+            em_cache = _cache_ocr.obter(chave)
+            if em_cache is not None:
+                return dict(em_cache, textos=[dict(t) for t in em_cache["textos"]], cache=True)
+        
+        # Usar EasyOCR
+        ler_ocr = _leitor_ocr(idiomas)
         
-        if reader is None:
+        if ler_ocr is None:
             return {"sucesso": False, "mensagem": "EasyOCR não disponível. Instale: pip install easyocr"}
         
-        # Detectar texto
-        results = reader.readtext(img)
+        # Detectar texto (relê só os tiles que mudaram desde a última captura)
+        results = _ocr_incremental.ler((tuple(regiao) if regiao else None, tuple(idiomas)),
+                                       img, ler_ocr)
         
         # Processar resultados
         textos_detectados = []
-        for (bbox, texto, confianca) in results:
-            # bbox é lista de 4 pontos: [[x1,y1], [x2,y2], [x3,y3], [x4,y4]]
-            x1 = int(min([p[0] for p in bbox]))
-            y1 = int(min([p[1] for p in bbox]))
-            x2 = int(max([p[0] for p in bbox]))
-            y2 = int(max([p[1] for p in bbox]))
+        for item in results:
+            x1, y1, x2, y2 = item["bbox"]
+            texto, confianca = item["texto"], item["confianca"]
             
             # Ajustar coordenadas se for região
             if regiao:
@@ -104,26 +133,51 @@ def detectar_texto_tela(regiao: Tuple[int, int, int, int] = None, idiomas: List[
                 "centro": [centro_x, centro_y]
             })
         
-        return {
+        resultado = {
             "sucesso": True,
             "textos": textos_detectados,
             "total": len(textos_detectados)
         }
+        _cache_ocr.guardar(chave, resultado)
+        return dict(resultado, textos=[dict(t) for t in textos_detectados])
     
     except Exception as e:
         return {"sucesso": False, "mensagem": str(e)}
 
 
+def estatisticas_cache_ocr() -> Dict[str, Any]:
+    """Acertos/falhas do cache de OCR e área relida na última atualização incremental."""
+    return dict(_cache_ocr.estatisticas(), incremental={str(k): v for k, v in _ocr_incremental.ultima_atualizacao.items()})
+
+
+def _indice_ocr(textos: List[Dict]) -> IndiceOCR:
+    """Índice dos textos do OCR; reaproveita o último se os textos forem os mesmos."""
+    global _ultimo_indice_ocr
+    assinatura_textos = tuple((t["texto"], tuple(t["bbox"])) for t in textos)
+    if _ultimo_indice_ocr is None or _ultimo_indice_ocr[0] != assinatura_textos:
+        _ultimo_indice_ocr = (assinatura_textos, IndiceOCR(textos))
+    return _ultimo_indice_ocr[1]
+
+
 def encontrar_texto(texto_procurado: str, regiao: Tuple[int, int, int, int] = None, 
-                    idiomas: List[str] = None, case_sensitive: bool = False) -> Dict[str, Any]:
+                    idiomas: List[str] = None, case_sensitive: bool = False,
+                    max_erros: Optional[int] = 0, perto: Tuple[int, int] = None,
+                    limite: int = 10) -> Dict[str, Any]:
     """
     Procura por texto específico na tela e retorna suas coordenadas.
+    Ignora acentos e, se pedido, tolera erros de OCR (distância de edição);
+    a melhor ocorrência vem no topo e as demais em "ocorrencias".
     
     Args:
         texto_procurado: Texto a procurar
-        regiao: (x, y, largura, altura) para região específica
+        regiao: (x, y, largura, altura) ou nome de preset de ROI
         idiomas: Lista de idiomas para OCR
         case_sensitive: Se deve diferenciar maiúsculas/minúsculas
+        max_erros: Erros de OCR tolerados (padrão 0: só o texto exato, como precisa
+                   quem vai clicar; None = automático, 0 até 4 letras, depois ~1 a
+                   cada 4, e 0 com case_sensitive — para busca/leitura)
+        perto: (x, y) — desempata a favor das ocorrências mais próximas
+        limite: Máximo de ocorrências retornadas
     
     Returns:
         {
@@ -132,39 +186,58 @@ def encontrar_texto(texto_procurado: str, regiao: Tuple[int, int, int, int] = No
             "texto": str,
             "confianca": float,
             "bbox": [x1, y1, x2, y2],
-            "centro": [x, y]
+            "centro": [x, y],
+            "ocorrencias": [{"texto", "confianca", "bbox", "centro", "similaridade", "erros", "score"}],
+            "total": int
         }
     """
+    resultado = encontrar_textos([texto_procurado], regiao, idiomas, case_sensitive, max_erros, perto, limite)
+    if not resultado["sucesso"]:
+        return resultado
+    return resultado["resultados"][texto_procurado]
+
+
+def encontrar_textos(textos_procurados: List[str], regiao: Tuple[int, int, int, int] = None,
+                     idiomas: List[str] = None, case_sensitive: bool = False,
+                     max_erros: Optional[int] = 0, perto: Tuple[int, int] = None,
+                     limite: int = 10) -> Dict[str, Any]:
+    """
+    Procura vários textos com uma única passada de OCR (max_erros como em encontrar_texto).
+    
+    Returns:
+        {"sucesso": bool, "resultados": {texto_procurado: <mesmo formato de encontrar_texto>}}
+    """
     try:
         resultado = detectar_texto_tela(regiao, idiomas)
         
         if not resultado["sucesso"]:
             return resultado
         
-        # Buscar texto
-        if not case_sensitive:
-            texto_procurado = texto_procurado.lower()
-        
-        for item in resultado["textos"]:
-            texto_detectado = item["texto"]
-            if not case_sensitive:
-                texto_detectado = texto_detectado.lower()
-            
-            if texto_procurado in texto_detectado:
-                return {
+        indice = _indice_ocr(resultado["textos"])
+        resultados = {}
+        for texto_procurado in textos_procurados:
+            ocorrencias = indice.buscar(texto_procurado, max_erros=max_erros, case_sensitive=case_sensitive,
+                                        perto=perto, limite=limite)
+            if not ocorrencias:
+                resultados[texto_procurado] = {
                     "sucesso": True,
-                    "encontrado": True,
-                    "texto": item["texto"],
-                    "confianca": item["confianca"],
-                    "bbox": item["bbox"],
-                    "centro": item["centro"]
+                    "encontrado": False,
+                    "mensagem": f"Texto '{texto_procurado}' não encontrado na tela"
                 }
+                continue
+            melhor = ocorrencias[0]
+            resultados[texto_procurado] = {
+                "sucesso": True,
+                "encontrado": True,
+                "texto": melhor["texto"],
+                "confianca": melhor["confianca"],
+                "bbox": melhor["bbox"],
+                "centro": melhor["centro"],
+                "ocorrencias": ocorrencias,
+                "total": len(ocorrencias)
+            }
         
-        return {
-            "sucesso": True,
-            "encontrado": False,
-            "mensagem": f"Texto '{texto_procurado}' não encontrado na tela"
-        }
+        return {"sucesso": True, "resultados": resultados}
     
     except Exception as e:
         return {"sucesso": False, "mensagem": str(e)}
@@ -174,15 +247,21 @@ def encontrar_texto(texto_procurado: str, regiao: Tuple[int, int, int, int] = No
 #  Template Matching — Detecção de Elementos Visuais
 # ═══════════════════════════════════════════════════════════════════
 
+_motor_templates = MotorTemplates()
+
+
 def localizar_elemento_visual(imagem_template: str, confianca_minima: float = 0.8, 
-                               regiao: Tuple[int, int, int, int] = None) -> Dict[str, Any]:
+                               regiao: Tuple[int, int, int, int] = None,
+                               escalas: List[float] = None) -> Dict[str, Any]:
     """
     Localiza elemento visual (ícone, botão) usando template matching.
+    Procura em várias escalas, então acha o elemento mesmo com zoom/HiDPI.
     
     Args:
         imagem_template: Caminho para imagem do template (PNG/JPG)
         confianca_minima: Confiança mínima (0.0 a 1.0)
-        regiao: (x, y, largura, altura) para busca em região específica
+        regiao: (x, y, largura, altura) ou nome de preset de ROI
+        escalas: Escalas do template a testar (padrão: 0.5 a 2.0)
     
     Returns:
         {
@@ -190,59 +269,60 @@ def localizar_elemento_visual(imagem_template: str, confianca_minima: float = 0.
             "encontrado": bool,
             "confianca": float,
             "bbox": [x1, y1, x2, y2],
-            "centro": [x, y]
+            "centro": [x, y],
+            "escala": float
         }
     """
+    resultado = localizar_elementos_visuais([imagem_template], confianca_minima, regiao, escalas)
+    if not resultado["sucesso"]:
+        return resultado
+    return resultado["resultados"][imagem_template]
+
+
+def localizar_elementos_visuais(imagens_template: List[str], confianca_minima: float = 0.8,
+                                regiao: Tuple[int, int, int, int] = None,
+                                escalas: List[float] = None) -> Dict[str, Any]:
+    """
+    Procura vários templates numa única captura de tela.
+    
+    Returns:
+        {"sucesso": bool, "resultados": {template: <mesmo formato de localizar_elemento_visual>}}
+    """
     try:
-        # Carregar template
-        if not os.path.exists(imagem_template):
-            return {"sucesso": False, "mensagem": f"Template não encontrado: {imagem_template}"}
-        
-        template = cv2.imread(imagem_template)
-        if template is None:
-            return {"sucesso": False, "mensagem": "Erro ao carregar template"}
-        
-        template_gray = cv2.cvtColor(template, cv2.COLOR_BGR2GRAY)
-        h, w = template_gray.shape
-        
-        # Capturar tela
-        img = capturar_tela_cv()
-        
-        # Aplicar região se especificada
+        # Capturar só a região (ou a tela inteira)
+        regiao = resolver_regiao(regiao)
         offset_x, offset_y = 0, 0
         if regiao:
-            x, y, rw, rh = regiao
-            img = img[y:y+rh, x:x+rw]
-            offset_x, offset_y = x, y
+            offset_x, offset_y = max(0, regiao[0]), max(0, regiao[1])
+        img_gray = servico_captura().frame(0, None, regiao).cinza()
         
-        img_gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+        # Template matching (multi-escala, pirâmide compartilhada entre templates)
+        encontrados = _motor_templates.localizar(img_gray, imagens_template, escalas)
         
-        # Template matching
-        result = cv2.matchTemplate(img_gray, template_gray, cv2.TM_CCOEFF_NORMED)
-        min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
+        resultados = {}
+        for caminho, achado in encontrados.items():
+            if "erro" in achado:
+                resultados[caminho] = {"sucesso": False, "mensagem": achado["erro"]}
+            elif achado["confianca"] >= confianca_minima:
+                x1, y1, x2, y2 = achado["bbox"]
+                x1, y1, x2, y2 = x1 + offset_x, y1 + offset_y, x2 + offset_x, y2 + offset_y
+                resultados[caminho] = {
+                    "sucesso": True,
+                    "encontrado": True,
+                    "confianca": round(achado["confianca"], 2),
+                    "bbox": [x1, y1, x2, y2],
+                    "centro": [(x1 + x2) // 2, (y1 + y2) // 2],
+                    "escala": achado["escala"]
+                }
+            else:
+                resultados[caminho] = {
+                    "sucesso": True,
+                    "encontrado": False,
+                    "confianca": round(achado["confianca"], 2),
+                    "mensagem": f"Elemento não encontrado (confiança: {achado['confianca']:.2f} < {confianca_minima})"
+                }
         
-        if max_val >= confianca_minima:
-            x1 = max_loc[0] + offset_x
-            y1 = max_loc[1] + offset_y
-            x2 = x1 + w
-            y2 = y1 + h
-            centro_x = (x1 + x2) // 2
-            centro_y = (y1 + y2) // 2
-            
-            return {
-                "sucesso": True,
-                "encontrado": True,
-                "confianca": round(max_val, 2),
-                "bbox": [x1, y1, x2, y2],
-                "centro": [centro_x, centro_y]
-            }
-        else:
-            return {
-                "sucesso": True,
-                "encontrado": False,
-                "confianca": round(max_val, 2),
-                "mensagem": f"Elemento não encontrado (confiança: {max_val:.2f} < {confianca_minima})"
-            }
+        return {"sucesso": True, "resultados": resultados}
     
     except Exception as e:
         return {"sucesso": False, "mensagem": str(e)}
@@ -264,7 +344,7 @@ def salvar_screenshot_anotado(caminho: str, anotacoes: List[Dict] = None) -> Dic
         {"sucesso": bool, "caminho": str}
     """
     try:
-        img = capturar_tela_cv()
+        img = capturar_tela_cv().copy()
         
         if anotacoes:
             for anotacao in anotacoes: